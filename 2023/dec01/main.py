@@ -2,11 +2,14 @@
 
 import re
 from pathlib import Path
+from typing import Iterable
 
+from aoc import streaming
+from aoc.inputs import Source, read_lines
 
-def read_key() -> list[str]:
-    with open(Path(__file__).parent / "key.txt") as file:
-        return file.read().strip().split("\n")
+
+def read_key(source: Source = Path(__file__).parent / "key.txt") -> list[str]:
+    return list(read_lines(source))
 
 
 def part_one(lines: list[str]) -> int:
@@ -70,6 +73,13 @@ def part_two(lines: list[str]) -> int:
     return sum
 
 
+def stream(lines: Iterable[str]) -> dict[str, int]:
+    return streaming.sum_parts(
+        streaming.parse_blocks(lines, read_key),
+        {"part_one": part_one, "part_two": part_two},
+    )
+
+
 def main():
     lines = read_key()
     print(part_one(lines))
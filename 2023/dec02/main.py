@@ -2,23 +2,25 @@
 
 import re
 from pathlib import Path
-from typing import Literal 
+from typing import Iterable, Literal 
+
+from aoc import streaming
+from aoc.inputs import Source, read_lines
 
 
 BallColor = Literal["red"] | Literal["green"] | Literal["blue"]
 Match = dict[BallColor, int]
 
 
-def load_games() -> dict[int, list[Match]]:
-    with open(Path(__file__).parent / "key.txt") as file:
-        games_raw = file.read().strip().split("\n")
-
+def load_games(
+    source: Source = Path(__file__).parent / "key.txt",
+) -> dict[int, list[Match]]:
     games = {}
     red_regex = re.compile(r"(\d+) red")
     green_regex = re.compile(r"(\d+) green")
     blue_regex = re.compile(r"(\d+) blue")
 
-    for game in games_raw:
+    for game in read_lines(source):
         raw_id, raw_matches = game.split(": ", 1)
 
         id = int(raw_id.replace("Game ", ""))
@@ -85,6 +87,13 @@ def part_two(games: dict[int, list[Match]]) -> int:
     return total_power
 
 
+def stream(lines: Iterable[str]) -> dict[str, int]:
+    return streaming.sum_parts(
+        streaming.parse_blocks(lines, load_games),
+        {"part_one": part_one, "part_two": part_two},
+    )
+
+
 def main():
     games = load_games()
     print(part_one(games))
@@ -4,6 +4,8 @@ import re
 from typing import NamedTuple
 from pathlib import Path
 
+from aoc.inputs import Source, read_text
+
 
 class Number(NamedTuple):
     val: int
@@ -16,9 +18,10 @@ class Symbol(NamedTuple):
     x: int
 
 
-def decode_numbers_and_symbols() -> tuple[list[list[Number]], list[list[Symbol]]]:
-    with open(Path(__file__).parent / "key.txt") as f:
-        engine_str = f.read().strip()
+def decode_numbers_and_symbols(
+    source: Source = Path(__file__).parent / "key.txt",
+) -> tuple[list[list[Number]], list[list[Symbol]]]:
+    engine_str = read_text(source)
 
     number_re = re.compile(r"\d+")
     symbol_re = re.compile(r"[^\.0-9]")
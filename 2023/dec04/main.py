@@ -1,21 +1,22 @@
 # https://adventofcode.com/2023/day/4
 
 import re
-from typing import NamedTuple
+from collections import deque
+from typing import Iterable, NamedTuple
 from pathlib import Path
 
+from aoc import streaming
+from aoc.inputs import Source, read_lines
+
 
 class Card(NamedTuple):
     sampled_numbers: list[int]
     my_numbers: list[int]
 
 
-def read_cards() -> list[Card]:
-    with open(Path(__file__).parent / "key.txt") as f:
-        raw_cards = f.read().strip().split("\n")
-
+def read_cards(source: Source = Path(__file__).parent / "key.txt") -> list[Card]:
     cards = []
-    for raw_card in raw_cards:
+    for raw_card in read_lines(source):
         deheaded = raw_card.split(":", 1)[1]
         raw_sampled, raw_mine = deheaded.split(" | ", 1)
 
@@ -46,15 +47,34 @@ def part_two(cards: list[Card]):
     for idx, card in enumerate(cards, 1):
         common_numbers = set(card.sampled_numbers).intersection(card.my_numbers)
 
-        for i in range(idx, idx + len(common_numbers)):
-            try:
-                n_copies[i] += n_copies[idx - 1]
-            except Exception:
-                print(i, idx)
+        # Copies are never won past the end of the table
+        for i in range(idx, min(idx + len(common_numbers), len(cards))):
+            n_copies[i] += n_copies[idx - 1]
 
     return sum(n_copies)
 
 
+def stream(lines: Iterable[str]) -> dict[str, int]:
+    points = 0
+    n_cards = 0
+    # Copies won for the cards still to come, never more than one card's matches
+    won_copies: deque[int] = deque()
+
+    for cards in streaming.parse_blocks(lines, read_cards):
+        points += part_one(cards)
+
+        for card in cards:
+            n_copies = 1 + (won_copies.popleft() if won_copies else 0)
+            n_cards += n_copies
+
+            common_numbers = set(card.sampled_numbers).intersection(card.my_numbers)
+            won_copies.extend([0] * (len(common_numbers) - len(won_copies)))
+            for i in range(len(common_numbers)):
+                won_copies[i] += n_copies
+
+    return {"part_one": points, "part_two": n_cards}
+
+
 def main():
     cards = read_cards()
     print(part_one(cards))
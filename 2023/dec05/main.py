@@ -3,6 +3,8 @@
 from pathlib import Path
 from typing import NamedTuple
 
+from aoc.inputs import Source, read_blocks
+
 
 class MapRange(NamedTuple):
     start_dest: int
@@ -20,9 +22,10 @@ class SeedRange(NamedTuple):
     length: int
 
 
-def read_maps() -> tuple[list[int], list[Map]]:
-    with open(Path(__file__).parent / "key.txt") as f:
-        raw_maps = f.read().strip().split("\n\n")
+def read_maps(
+    source: Source = Path(__file__).parent / "key.txt",
+) -> tuple[list[int], list[Map]]:
+    raw_maps = list(read_blocks(source))
 
     seeds = [int(val) for val in raw_maps[0].split(": ")[1].strip().split(" ")]
 
@@ -5,15 +5,16 @@ from math import sqrt, floor
 from typing import NamedTuple
 from pathlib import Path
 
+from aoc.inputs import Source, read_lines
+
 
 class Race(NamedTuple):
     time: int
     distance: int
 
 
-def read_races() -> list[Race]:
-    with open(Path(__file__).parent / "key.txt") as file:
-        raw_races = file.read().strip().split("\n")
+def read_races(source: Source = Path(__file__).parent / "key.txt") -> list[Race]:
+    raw_races = list(read_lines(source))
 
     times = [int(val) for val in re.split(r"\s+", raw_races[0].split(":")[1].strip())]
     distances = [
@@ -23,12 +24,10 @@ def read_races() -> list[Race]:
     return [Race(time, distance) for time, distance in zip(times, distances)]
 
 
-def read_corrected_race() -> Race:
-    with open(Path(__file__).parent / "key.txt") as file:
-        raw_races = file.read().strip().split("\n")
-
-    time = int(raw_races[0].split(":")[1].strip().replace(" ", ""))
-    distance = int(raw_races[1].split(":")[1].strip().replace(" ", ""))
+def correct_races(races: list[Race]) -> Race:
+    # The kerning was wrong: all the numbers on a line are actually a single one
+    time = int("".join(str(race.time) for race in races))
+    distance = int("".join(str(race.distance) for race in races))
     return Race(time, distance)
 
 
@@ -44,7 +43,8 @@ def part_one(races: list[Race]) -> int:
     return prod
 
 
-def part_two(race: Race) -> int:
+def part_two(races: list[Race]) -> int:
+    race = correct_races(races)
     n_wins = floor(
         (race.time + sqrt(race.time**2 - 4 * race.distance) - 1e-4) / 2
     ) - floor((race.time - sqrt(race.time**2 - 4 * race.distance) + 1e-4) / 2)
@@ -55,9 +55,7 @@ def part_two(race: Race) -> int:
 def main():
     races = read_races()
     print(part_one(races))
-
-    race = read_corrected_race()
-    print(part_two(race))
+    print(part_two(races))
 
 
 if __name__ == "__main__":
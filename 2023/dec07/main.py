@@ -1,7 +1,10 @@
 from pathlib import Path
 from collections import Counter
 from enum import IntEnum
-from typing import NamedTuple
+from typing import Iterable, NamedTuple
+
+from aoc import render, streaming
+from aoc.inputs import Source, read_lines
 
 
 class Hand(NamedTuple):
@@ -19,12 +22,9 @@ class HandType(IntEnum):
     high_card = 1
 
 
-def read_hands() -> list[Hand]:
-    with open(Path(__file__).parent / "key.txt") as file:
-        raw_hands = file.read().strip().split("\n")
-
+def read_hands(source: Source = Path(__file__).parent / "key.txt") -> list[Hand]:
     hands = []
-    for raw_hand in raw_hands:
+    for raw_hand in read_lines(source):
         cards, raw_bid = raw_hand.split(" ")
         hands.append(Hand(cards, int(raw_bid)))
 
@@ -48,23 +48,22 @@ def determine_type(cards: str) -> HandType:
     return HandType.high_card
 
 
-def part_one(hands: list[Hand]) -> int:
-    sorted_hands = []
-    for hand in hands:
-        sorted_hands.append(
-            (
-                determine_type(hand.cards),
-                hand.cards.replace("A", "Z")
-                .replace("K", "Y")
-                .replace("Q", "X")
-                .replace("J", "W")
-                .replace("T", "V"),
-                hand.bid,
-            )
-        )
+RankedHand = tuple[HandType, str, int]
 
-    sorted_hands.sort()
 
+def rank_hand(hand: Hand) -> RankedHand:
+    return (
+        determine_type(hand.cards),
+        hand.cards.replace("A", "Z")
+        .replace("K", "Y")
+        .replace("Q", "X")
+        .replace("J", "W")
+        .replace("T", "V"),
+        hand.bid,
+    )
+
+
+def total_winnings(sorted_hands: Iterable[RankedHand]) -> int:
     sum = 0
     for rank, (_, _, bid) in enumerate(sorted_hands, 1):
         sum += rank * bid
@@ -72,6 +71,13 @@ def part_one(hands: list[Hand]) -> int:
     return sum
 
 
+def part_one(hands: list[Hand]) -> int:
+    sorted_hands = [rank_hand(hand) for hand in hands]
+    sorted_hands.sort()
+
+    return total_winnings(sorted_hands)
+
+
 def determine_type_joker_rule(cards: str) -> HandType:
     hand_counter = Counter(cards)
 
@@ -99,29 +105,36 @@ def determine_type_joker_rule(cards: str) -> HandType:
     return HandType.high_card
 
 
-def part_two(hands: list[Hand]) -> int:
-    sorted_hands = []
-    for hand in hands:
-        sorted_hands.append(
-            (
-                determine_type_joker_rule(hand.cards),
-                hand.cards.replace("A", "Z")
-                .replace("K", "Y")
-                .replace("Q", "X")
-                .replace("J", "0")
-                .replace("T", "V"),
-                hand.bid,
-            )
-        )
+def rank_hand_joker_rule(hand: Hand) -> RankedHand:
+    return (
+        determine_type_joker_rule(hand.cards),
+        hand.cards.replace("A", "Z")
+        .replace("K", "Y")
+        .replace("Q", "X")
+        .replace("J", "0")
+        .replace("T", "V"),
+        hand.bid,
+    )
+
 
+def part_two(hands: list[Hand]) -> int:
+    sorted_hands = [rank_hand_joker_rule(hand) for hand in hands]
     sorted_hands.sort()
 
-    print(sorted_hands)
-    sum = 0
-    for rank, (_, _, bid) in enumerate(sorted_hands, 1):
-        sum += rank * bid
+    render.frame("hands ranked by the joker rule", lambda: map(repr, sorted_hands))
+    return total_winnings(sorted_hands)
 
-    return sum
+
+def stream(lines: Iterable[str]) -> dict[str, int]:
+    # Ranks are only known once every hand was seen: both rankings are sorted
+    # on disk, spilling sorted runs whenever the buffered hands fill a run
+    with streaming.ExternalSorter() as ranked, streaming.ExternalSorter() as jokers:
+        for hands in streaming.parse_blocks(lines, read_hands):
+            for hand in hands:
+                ranked.add(rank_hand(hand))
+                jokers.add(rank_hand_joker_rule(hand))
+
+        return {"part_one": total_winnings(ranked), "part_two": total_winnings(jokers)}
 
 
 def main():
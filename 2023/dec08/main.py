@@ -6,6 +6,8 @@ from pathlib import Path
 from enum import Enum
 from typing import TypedDict
 
+from aoc.inputs import Source, read_blocks
+
 
 class Direction(str, Enum):
     left = "left"
@@ -17,11 +19,10 @@ class MapNode(TypedDict):
     right: str
 
 
-def read_instructions_and_map() -> tuple[list[Direction], dict[str, MapNode]]:
-    with open(Path(__file__).parent / "key.txt") as file:
-        raw_instructions_and_map = file.read().strip()
-
-    raw_instructions, raw_map = raw_instructions_and_map.split("\n\n")
+def read_instructions_and_map(
+    source: Source = Path(__file__).parent / "key.txt",
+) -> tuple[list[Direction], dict[str, MapNode]]:
+    raw_instructions, raw_map = read_blocks(source)
 
     instructions = []
     for instruction in raw_instructions:
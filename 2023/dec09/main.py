@@ -1,51 +1,62 @@
 # https://adventofcode.com/2023/day/9
 
 from pathlib import Path
+from typing import Iterable
 
+from aoc import mapreduce, streaming
+from aoc.inputs import Source, read_lines
 
-def read_sequences() -> list[list[int]]:
-    with open(Path(__file__).parent / "key.txt") as f:
-        raw_sequences = f.read().strip().split("\n")
 
+def read_sequences(
+    source: Source = Path(__file__).parent / "key.txt",
+) -> list[list[int]]:
     return [
-        [int(val) for val in raw_sequence.split(" ")] for raw_sequence in raw_sequences
+        [int(val) for val in raw_sequence.split(" ")]
+        for raw_sequence in read_lines(source)
     ]
 
 
 def predict_next(sequence: list[int]):
-    if len(sequence) == 0:
-        return 0
+    # The last value of every row of differences, added up
+    prediction = 0
+    while sequence:
+        if all(val == sequence[0] for val in sequence):
+            return prediction + sequence[0]
 
-    if all(val == sequence[0] for val in sequence):
-        return sequence[0]
+        prediction += sequence[-1]
+        sequence = [b - a for a, b in zip(sequence[:-1], sequence[1:])]
 
-    diff = [b - a for a, b in zip(sequence[:-1], sequence[1:])]
-    return sequence[-1] + predict_next(diff)
+    return prediction
 
 
 def part_one(sequences: list[list[int]]) -> int:
-    next_vals = []
-    for sequence in sequences:
-        next_vals.append(predict_next(sequence))
-    return sum(next_vals)
+    return mapreduce.map_reduce(predict_next, sequences, cost=len)
 
 
 def predict_previous(sequence: list[int]):
-    if len(sequence) == 0:
-        return 0
+    # The first value of every row of differences, with alternating signs
+    prediction = 0
+    sign = 1
+    while sequence:
+        if all(val == sequence[0] for val in sequence):
+            return prediction + sign * sequence[0]
 
-    if all(val == sequence[0] for val in sequence):
-        return sequence[0]
+        prediction += sign * sequence[0]
+        sign = -sign
+        sequence = [b - a for a, b in zip(sequence[:-1], sequence[1:])]
 
-    diff = [b - a for a, b in zip(sequence[:-1], sequence[1:])]
-    return sequence[0] - predict_previous(diff)
+    return prediction
 
 
 def part_two(sequences: list[list[int]]) -> int:
-    next_vals = []
-    for sequence in sequences:
-        next_vals.append(predict_previous(sequence))
-    return sum(next_vals)
+    return mapreduce.map_reduce(predict_previous, sequences, cost=len)
+
+
+def stream(lines: Iterable[str]) -> dict[str, int]:
+    return streaming.sum_parts(
+        streaming.parse_blocks(lines, read_sequences),
+        {"part_one": part_one, "part_two": part_two},
+    )
 
 
 def main():
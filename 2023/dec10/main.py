@@ -3,13 +3,10 @@
 from enum import Enum, auto
 import re
 from pathlib import Path
-from dataclasses import dataclass
 
-
-@dataclass
-class Position:
-    x: int
-    y: int
+from aoc import render
+from aoc.coords import Point
+from aoc.inputs import Source, read_text
 
 
 class Direction(int, Enum):
@@ -30,9 +27,9 @@ class Direction(int, Enum):
             return Direction.left
 
 
-def read_pipes() -> list[str]:
-    with open(Path(__file__).parent / "key.txt") as f:
-        raw_pipes = f.read()
+def read_pipes(source: Source = Path(__file__).parent / "key.txt") -> list[str]:
+    # The map keeps its trailing empty row, it is read past at the bottom edge
+    raw_pipes = read_text(source) + "\n"
 
     pipes = (
         raw_pipes.replace("|", "║")
@@ -46,7 +43,7 @@ def read_pipes() -> list[str]:
 
 
 def valid_directions(
-    position: Position, pipes: list[str]
+    position: Point, pipes: list[str]
 ) -> tuple[Direction, Direction]:
     valid_directions = []
     if pipes[position.y][position.x - 1] in ["═", "╔", "╚"]:
@@ -60,16 +57,16 @@ def valid_directions(
     return tuple(sorted(valid_directions))
 
 
-def next_step(position: Position, direction: Direction):
+def next_step(position: Point, direction: Direction) -> Point:
     match direction:
         case Direction.top:
-            return Position(position.x, position.y - 1)
+            return Point(position.x, position.y - 1)
         case Direction.bottom:
-            return Position(position.x, position.y + 1)
+            return Point(position.x, position.y + 1)
         case Direction.left:
-            return Position(position.x - 1, position.y)
+            return Point(position.x - 1, position.y)
         case Direction.right:
-            return Position(position.x + 1, position.y)
+            return Point(position.x + 1, position.y)
 
 
 PIPE_DIRECTIONS = {
@@ -82,14 +79,14 @@ PIPE_DIRECTIONS = {
 }
 
 
-def part_one(pipes: list[str]) -> tuple[int, list[list[str]]]:
+def find_pipe_path(pipes: list[str]) -> tuple[int, list[list[str]]]:
     animal_re = re.compile(r"S")
-    start_pos = Position(0, 0)
+    start_pos = Point(0, 0)
 
     for i, line in enumerate(pipes):
         match = animal_re.search(line)
         if match is not None:
-            start_pos = Position(match.span(0)[0], i)
+            start_pos = Point(match.span(0)[0], i)
 
     animal_directions = valid_directions(start_pos, pipes)
     animal_pipe = {value: key for key, value in PIPE_DIRECTIONS.items()}[
@@ -117,8 +114,13 @@ def part_one(pipes: list[str]) -> tuple[int, list[list[str]]]:
     return steps // 2, pipe_path
 
 
+def part_one(pipes: list[str]) -> int:
+    steps, _ = find_pipe_path(pipes)
+    return steps
+
+
 def mark_inside_out(
-    cur_pos: Position, pipe_path: list[list[str]], next_direction: Direction
+    cur_pos: Point, pipe_path: list[list[str]], next_direction: Direction
 ) -> None:
     match next_direction:
         case Direction.right:
@@ -146,7 +148,9 @@ def mark_inside_out(
                 pipe_path[cur_pos.y][cur_pos.x + 1] = " "
 
 
-def part_two(pipe_path: list[list[str]]) -> int:
+def part_two(pipes: list[str]) -> int:
+    _, pipe_path = find_pipe_path(pipes)
+
     N = len(pipe_path)
     LL = len(pipe_path[0])
 
@@ -160,12 +164,9 @@ def part_two(pipe_path: list[list[str]]) -> int:
                     break
             break
 
-    start_pos = Position(x, y)
-    print(start_pos)
-    print(pipe_path[start_pos.y][start_pos.x])
+    start_pos = Point(x, y)
     next_direction = Direction.right
     cur_pos = next_step(start_pos, next_direction)
-    print(pipe_path[cur_pos.y][cur_pos.x])
 
     while cur_pos != start_pos:
         mark_inside_out(cur_pos, pipe_path, next_direction)
@@ -215,17 +216,15 @@ def part_two(pipe_path: list[list[str]]) -> int:
                 if pipe_path[i - 1][j] == " ":
                     pipe_path[i][j] = " "
 
-    print("\n".join("".join(line) for line in pipe_path))
+    render.frame("tiles enclosed by the loop, as ☄", lambda: map("".join, pipe_path))
     return sum(sum(char == "☄" for char in line) for line in pipe_path)
 
 
 def main():
     pipes = read_pipes()
 
-    result, pipe_path = part_one(pipes)
-    print(result)
-
-    print(part_two(pipe_path))
+    print(part_one(pipes))
+    print(part_two(pipes))
 
 
 if __name__ == "__main__":
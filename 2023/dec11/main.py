@@ -2,18 +2,15 @@
 
 from pathlib import Path
 from itertools import combinations
-from dataclasses import dataclass
 
+from aoc.coords import Point
+from aoc.inputs import Source, read_lines
 
-@dataclass
-class Position:
-    x: int
-    y: int
 
-
-def read_galaxies() -> tuple[list[Position], list[int], list[int]]:
-    with open(Path(__file__).parent / "key.txt") as file:
-        galaxy = [[char for char in line] for line in file.read().strip().split("\n")]
+def read_galaxies(
+    source: Source = Path(__file__).parent / "key.txt",
+) -> tuple[list[Point], list[int], list[int]]:
+    galaxy = [[char for char in line] for line in read_lines(source)]
 
     N = len(galaxy)
     M = len(galaxy[0])
@@ -32,14 +29,14 @@ def read_galaxies() -> tuple[list[Position], list[int], list[int]]:
     for i in range(N):
         for j in range(M):
             if galaxy[i][j] == "#":
-                positions.append(Position(j, i))
+                positions.append(Point(j, i))
 
     return positions, expansion_rows, expansion_cols
 
 
 def compute_distance(
-    pos1: Position,
-    pos2: Position,
+    pos1: Point,
+    pos2: Point,
     expansion_rows: list[int],
     expansion_cols: list[int],
     multiplier: int = 1,
@@ -67,7 +64,7 @@ def compute_distance(
 
 
 def part_one(
-    positions: list[Position], expansion_rows: list[int], expansion_cols: list[int]
+    positions: list[Point], expansion_rows: list[int], expansion_cols: list[int]
 ) -> int:
     sum = 0
 
@@ -79,7 +76,7 @@ def part_one(
 
 
 def part_two(
-    positions: list[Position], expansion_rows: list[int], expansion_cols: list[int]
+    positions: list[Point], expansion_rows: list[int], expansion_cols: list[int]
 ) -> int:
     sum = 0
     for pos1, pos2 in combinations(positions, 2):
@@ -1,16 +1,22 @@
 # https://adventofcode.com/2023/day/12
 
-from functools import cache
+from collections import defaultdict
 from pathlib import Path
 
+from aoc import mapreduce, metrics
+from aoc.inputs import Source, read_lines
 
-def read_arrangements() -> list[tuple[str, list[int]]]:
-    with open(Path(__file__).parent / "key.txt") as f:
-        raw_arrangements = f.read().strip().split("\n")
+DP_STATES = metrics.counter(
+    "aoc_dp_states_total", "States a bottom-up count went through"
+)
 
+
+def read_arrangements(
+    source: Source = Path(__file__).parent / "key.txt",
+) -> list[tuple[str, list[int]]]:
     arrangement_keys = []
 
-    for raw_arrangement in raw_arrangements:
+    for raw_arrangement in read_lines(source):
         arrangement, raw_key = raw_arrangement.split(" ")
         key = [int(val) for val in raw_key.split(",")]
         arrangement_keys.append((arrangement, key))
@@ -18,110 +24,64 @@ def read_arrangements() -> list[tuple[str, list[int]]]:
     return arrangement_keys
 
 
-def compute_all_arrangements(key: list[int], length: int) -> list[str]:
-    if sum(key) + len(key) - 1 > length or length < 0:
-        return []
-
-    if length == 0:
-        return [""]
-
-    if len(key) == 0:
-        return ["." * length]
-
-    return [
-        *[
-            "#" * key[0] + "." * (1 if len(key) > 1 else 0) + arrangement
-            for arrangement in compute_all_arrangements(
-                key[1:], length - (key[0] + (1 if len(key) > 1 else 0))
-            )
-        ],
-        *[
-            "." + arrangement
-            for arrangement in compute_all_arrangements(key, length - 1)
-            if arrangement != ""
-        ],
-    ]
-
-
-def test_possibility(possibility: str, arrangement: str):
-    for char, key_char in zip(possibility, arrangement):
-        if (char == "#" and key_char == ".") or (char == "." and key_char == "#"):
-            return False
-    return True
-
-
-def count_arrangements(arrangement: str, key: list[int]) -> int:
-    possible_arrangements = compute_all_arrangements(key, len(arrangement))
-
-    arrangement_count = 0
-    for possibility in possible_arrangements:
-        arrangement_count += test_possibility(possibility, arrangement)
-    return arrangement_count
+def count_arrangements_by_state(arrangement: str, key: tuple[int, ...]) -> int:
+    # One character at a time, counting the ways to reach every state: how many
+    # groups of the key are done and how long the current run of "#" is. Each
+    # "?" splits every state into a "#" and a "." reality, equal states merge
+    # again, so there are never more than a few hundred of them.
+    #
+    # The arrangement must end with a ".", to close the last run
+    states = {(0, 0): 1}
+    n_states = 0
+    for char in arrangement:
+        n_states += len(states)
+        next_states: dict[tuple[int, int], int] = defaultdict(int)
+        for (done, current_count), ways in states.items():
+            if char != ".":
+                # A run can only grow up to the size of its group
+                if done < len(key) and current_count < key[done]:
+                    next_states[done, current_count + 1] += ways
+            if char != "#":
+                if current_count == 0:
+                    next_states[done, 0] += ways
+                elif current_count == key[done]:
+                    # A run stops, and it is exactly its group's size
+                    next_states[done + 1, 0] += ways
+        states = next_states
+    DP_STATES.inc(n_states)
+
+    # At the end, every group must be done and no run left open
+    return states.get((len(key), 0), 0)
+
+
+def count_row(arrangement_key: tuple[str, list[int]]) -> int:
+    arrangement, key = arrangement_key
+    return count_arrangements_by_state(arrangement + ".", tuple(key))
 
 
 def part_one(arrangement_keys: list[tuple[str, list[int]]]) -> int:
-    sum = 0
-    for arrangement, key in arrangement_keys:
-        sum += count_arrangements(arrangement, key)
-
-    return sum
+    return mapreduce.map_reduce(
+        count_row,
+        arrangement_keys,
+        cost=lambda row: len(row[0]) * len(row[1]),
+    )
 
 
 def unfold(arrangement: str, key: list[int]) -> tuple[str, list[int]]:
     return ("?".join([arrangement for _ in range(5)]), sum([key for _ in range(5)], []))
 
 
-@cache
-def recursive_count_arrangements(
-    arrangement: str, key: tuple[int, ...], current_count: int = 0
-) -> int:
-    if len(arrangement) == 0:
-        # When you get to the end of the string, you need to have exhausted the key
-        # and not be counting. This is why all strings must be terminated by a "."
-        return not key and not current_count
-
-    # This point is where you create a split-reality: When ? is found, you
-    # recursively advance both with "#" and ".", effectively creating 2 parallel realities
-    next_possible_chars = arrangement[0] if arrangement[0] != "?" else "#."
-
-    results = 0
-    for next_char in next_possible_chars:
-        # Recursion advances characters in the list
-
-        if next_char == "#":
-            # When currently inspected character is #, advance arrangement
-            # keep the key being inspected, and add +1 to the current count
-            results += recursive_count_arrangements(
-                arrangement[1:], key, current_count + 1
-            )
-        elif next_char == ".":
-            # When currently inspected char is ".", there are 2 cases to inspect
-            if current_count > 0:
-                # If we had started a count, this is a count-stop. THis is where we
-                # check that the count satisfied the key.
-                #
-                # If not, we won't don't keep looking in this possibility
-                if len(key) > 0 and current_count == key[0]:
-                    # If the count satisfied the key, we move to the next char
-                    results += recursive_count_arrangements(arrangement[1:], key[1:], 0)
-
-            elif current_count == 0:
-                # If no count has yet started, simply move to next character
-                results += recursive_count_arrangements(arrangement[1:], key, 0)
-
-    return results
+def count_unfolded_row(arrangement_key: tuple[str, list[int]]) -> int:
+    unfold_arrangement, unfold_key = unfold(*arrangement_key)
+    return count_arrangements_by_state(unfold_arrangement + ".", tuple(unfold_key))
 
 
 def part_two(arrangement_keys: list[tuple[str, list[int]]]):
-    sum = 0
-    for arrangement, key in arrangement_keys:
-        unfold_arrangement, unfold_key = unfold(arrangement, key)
-        count = recursive_count_arrangements(
-            unfold_arrangement + ".", tuple(unfold_key)
-        )
-        sum += count
-
-    return sum
+    return mapreduce.map_reduce(
+        count_unfolded_row,
+        arrangement_keys,
+        cost=lambda row: len(row[0]) * len(row[1]),
+    )
 
 
 def main():
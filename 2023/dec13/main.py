@@ -1,13 +1,14 @@
 # https://adventofcode.com/2023/day/13
 
+from functools import partial
 from pathlib import Path
 
+from aoc import mapreduce, render
+from aoc.inputs import Source, read_blocks
 
-def read_patterns():
-    with open(Path(__file__).parent / "key.txt") as f:
-        patterns = f.read().strip().split("\n\n")
 
-    return patterns
+def read_patterns(source: Source = Path(__file__).parent / "key.txt"):
+    return list(read_blocks(source))
 
 
 def as_rows(pattern: str) -> list[str]:
@@ -37,28 +38,26 @@ def test_mirror(list_pattern: list[str], idx: int, size: int) -> bool:
     return True
 
 
-def part_one(patterns: list[str]) -> int:
-    patterns = read_patterns()
+def reflection_score(pattern: str, test=test_mirror) -> int:
+    pattern_sum = 0
+    columns = as_columns(pattern)
+    for i in range(len(columns) - 1):
+        if test(columns, i, len(columns)):
+            pattern_sum += i + 1
 
-    summary = 0
-    for pattern in patterns:
+    rows = as_rows(pattern)
+    for i in range(len(rows) - 1):
+        if test(rows, i, len(rows)):
+            pattern_sum += 100 * (i + 1)
 
-        pattern_sum = 0
-        columns = as_columns(pattern)
-        for i in range(len(columns) - 1):
-            if test_mirror(columns, i, len(columns)):
-                pattern_sum += i + 1
+    if pattern_sum == 0:
+        render.frame("pattern without a mirror", lambda: pattern)
 
-        rows = as_rows(pattern)
-        for i in range(len(rows) - 1):
-            if test_mirror(rows, i, len(rows)):
-                pattern_sum += 100 * (i + 1)
+    return pattern_sum
 
-        if pattern_sum == 0:
-            breakpoint()
 
-        summary += pattern_sum
-    return summary
+def part_one(patterns: list[str]) -> int:
+    return mapreduce.map_reduce(reflection_score, patterns, cost=len)
 
 
 def test_smudged_mirror(list_pattern: list[str], idx: int, size: int) -> bool:
@@ -82,27 +81,9 @@ def test_smudged_mirror(list_pattern: list[str], idx: int, size: int) -> bool:
 
 
 def part_two(patterns: list[str]) -> int:
-    patterns = read_patterns()
-
-    summary = 0
-    for pattern in patterns:
-
-        pattern_sum = 0
-        columns = as_columns(pattern)
-        for i in range(len(columns) - 1):
-            if test_smudged_mirror(columns, i, len(columns)):
-                pattern_sum += i + 1
-
-        rows = as_rows(pattern)
-        for i in range(len(rows) - 1):
-            if test_smudged_mirror(rows, i, len(rows)):
-                pattern_sum += 100 * (i + 1)
-
-        if pattern_sum == 0:
-            breakpoint()
-
-        summary += pattern_sum
-    return summary
+    return mapreduce.map_reduce(
+        partial(reflection_score, test=test_smudged_mirror), patterns, cost=len
+    )
 
 
 def main():
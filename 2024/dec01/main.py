@@ -1,13 +1,19 @@
 # https://adventofcode.com/2024/day/1
 
 from collections import defaultdict
+from itertools import groupby
 from pathlib import Path
+from typing import Iterable, Iterator
 
+from aoc import streaming
+from aoc.inputs import Source, read_lines
 
-def read_lists() -> tuple[list[int], list[int]]:
 
-    with open(Path(__file__).parent / "key.txt") as file:
-        lists = [line.split("   ") for line in file.read().split("\n") if line.strip()]
+def read_lists(
+    source: Source = Path(__file__).parent / "key.txt",
+) -> tuple[list[int], list[int]]:
+
+    lists = [line.split("   ") for line in read_lines(source) if line.strip()]
 
     list_1 = [int(line[0]) for line in lists]
     list_2 = [int(line[1]) for line in lists]
@@ -30,6 +36,35 @@ def part_2(list_1: list[int], list_2: list[int]) -> int:
     return sum([el * processed_list_2[el] for el in list_1])
 
 
+def count_runs(sorted_list: Iterable[int]) -> Iterator[tuple[int, int]]:
+    for el, run in groupby(sorted_list):
+        yield el, sum(1 for _ in run)
+
+
+def stream(lines: Iterable[str]) -> dict[str, int]:
+    # Both lists are sorted on disk. The distance pairs them up in order, the
+    # similarity walks them a second time joining equal locations, so no
+    # count per distinct location is ever held in memory
+    with streaming.ExternalSorter() as sorted_1, streaming.ExternalSorter() as sorted_2:
+        for list_1, list_2 in streaming.parse_blocks(lines, read_lists):
+            for el1, el2 in zip(list_1, list_2):
+                sorted_1.add(el1)
+                sorted_2.add(el2)
+
+        distance = sum(abs(el1 - el2) for el1, el2 in zip(sorted_1, sorted_2))
+
+        similarity = 0
+        counts_2 = count_runs(sorted_2)
+        el2, count_2 = next(counts_2, (None, 0))
+        for el1, count_1 in count_runs(sorted_1):
+            while el2 is not None and el2 < el1:
+                el2, count_2 = next(counts_2, (None, 0))
+            if el2 == el1:
+                similarity += el1 * count_1 * count_2
+
+    return {"part_one": distance, "part_two": similarity}
+
+
 def main():
     list_1, list_2 = read_lists()
     print(part_1(list_1, list_2))
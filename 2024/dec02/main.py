@@ -1,15 +1,14 @@
 # https://adventofcode.com/2024/day/2
 
 from pathlib import Path
+from typing import Iterable
 
+from aoc import mapreduce, streaming
+from aoc.inputs import Source, read_lines
 
-def get_reports() -> list[list[int]]:
-    with open(Path(__file__).parent / "key.txt") as file:
-        file_str = file.read()
 
-    return [
-        [int(el) for el in line.split(" ")] for line in file_str.strip().split("\n")
-    ]
+def get_reports(source: Source = Path(__file__).parent / "key.txt") -> list[list[int]]:
+    return [[int(el) for el in line.split(" ")] for line in read_lines(source)]
 
 
 def is_safe(report: list[int]) -> bool:
@@ -25,24 +24,32 @@ def is_safe(report: list[int]) -> bool:
     return False
 
 
+def is_saveable(report: list[int]) -> bool:
+    saved = False
+    if is_safe(report):
+        saved = True
+    for i in range(len(report)):
+        if is_safe(report[:i] + report[i + 1 :]):
+            saved = True
+
+    return saved
+
+
 def part_one(reports: list[list[int]]) -> int:
-    return sum(is_safe(report) for report in reports)
+    return mapreduce.map_reduce(is_safe, reports, cost=len)
 
 
 def part_two(reports: list[list[int]]) -> int:
-    n_saveable_reports = 0
-    for report in reports:
-        saved = False
-        if is_safe(report):
-            saved = True
-        for i in range(len(report)):
-            if is_safe(report[:i] + report[i + 1 :]):
-                saved = True
+    return mapreduce.map_reduce(
+        is_saveable, reports, cost=lambda report: len(report) ** 2
+    )
 
-        if saved:
-            n_saveable_reports += 1
 
-    return n_saveable_reports
+def stream(lines: Iterable[str]) -> dict[str, int]:
+    return streaming.sum_parts(
+        streaming.parse_blocks(lines, get_reports),
+        {"part_one": part_one, "part_two": part_two},
+    )
 
 
 def main():
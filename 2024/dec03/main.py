@@ -3,11 +3,11 @@
 import re
 from pathlib import Path
 
+from aoc.inputs import Source, read_lines
 
-def read_instructions():
-    with open(Path(__file__).parent / "key.txt") as f:
-        instructions = f.read().strip().replace("\n", "")
-    return instructions
+
+def read_instructions(source: Source = Path(__file__).parent / "key.txt"):
+    return "".join(read_lines(source))
 
 
 def part_1(instructions: str) -> int:
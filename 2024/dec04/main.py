@@ -1,117 +1,45 @@
 # https://adventofcode.com/2024/day/4
 
-import re
 from pathlib import Path
 
+from aoc.grid import Grid
+from aoc.inputs import Source, read_lines
 
-def read_wordsearch() -> list[str]:
-    with open(Path(__file__).parent / "key.txt") as f:
-        wordsearch = f.read().strip().split("\n")
-    return wordsearch
+X, M, A, S = b"XMAS"
 
 
-def part_one(wordsearch):
+def read_wordsearch(source: Source = Path(__file__).parent / "key.txt") -> Grid:
+    # Three cells of padding, so "XMAS" can be read in any direction from any X
+    return Grid.from_lines(read_lines(source), padding=3, border=".")
 
-    N = len(wordsearch)
-    LL = len(wordsearch[0])
+
+def part_one(wordsearch: Grid) -> int:
+    cells = wordsearch.cells
+    directions = wordsearch.neighbors + wordsearch.diagonals
 
     sum = 0
-    x_re = re.compile("X")
-
-    for y, line in enumerate(wordsearch):
-        x = -1
-        while True:
-            match = x_re.search(line, x + 1)
-            if match is None:
-                break
-            x = match.span()[0]
-
-            directions = [
-                line[x : x + 4],
-                line[max(x - 3, 0) : x + 1][::-1],
-            ]
-
-            if y >= 3:
-                directions.append(
-                    line[x]
-                    + wordsearch[y - 1][x]
-                    + wordsearch[y - 2][x]
-                    + wordsearch[y - 3][x]
-                )
-                if x >= 3:
-                    directions.append(
-                        line[x]
-                        + wordsearch[y - 1][x - 1]
-                        + wordsearch[y - 2][x - 2]
-                        + wordsearch[y - 3][x - 3]
-                    )
-                if x < LL - 3:
-                    directions.append(
-                        line[x]
-                        + wordsearch[y - 1][x + 1]
-                        + wordsearch[y - 2][x + 2]
-                        + wordsearch[y - 3][x + 3]
-                    )
-            if y < N - 3:
-                directions.append(
-                    line[x]
-                    + wordsearch[y + 1][x]
-                    + wordsearch[y + 2][x]
-                    + wordsearch[y + 3][x]
-                )
-                if x >= 3:
-                    directions.append(
-                        line[x]
-                        + wordsearch[y + 1][x - 1]
-                        + wordsearch[y + 2][x - 2]
-                        + wordsearch[y + 3][x - 3]
-                    )
-                if x < LL - 3:
-                    directions.append(
-                        line[x]
-                        + wordsearch[y + 1][x + 1]
-                        + wordsearch[y + 2][x + 2]
-                        + wordsearch[y + 3][x + 3]
-                    )
-
-            sum += len([word for word in directions if word == "XMAS"])
+    for x in wordsearch.find_all("X"):
+        for step in directions:
+            sum += (
+                cells[x + step] == M
+                and cells[x + 2 * step] == A
+                and cells[x + 3 * step] == S
+            )
 
     return sum
 
 
-def part_two(wordsearch: list[str]) -> int:
-    a_re = re.compile("A")
-
-    N = len(wordsearch)
-    LL = len(wordsearch[0])
+def part_two(wordsearch: Grid) -> int:
+    cells = wordsearch.cells
+    up_right, down_right, down_left, up_left = wordsearch.diagonals
+    ends = {M, S}
 
     sum = 0
+    for a in wordsearch.find_all("A"):
+        forward_slash = {cells[a + down_left], cells[a + up_right]} == ends
+        backward_slash = {cells[a + up_left], cells[a + down_right]} == ends
 
-    for y, line in enumerate(wordsearch[1 : N - 1], 1):
-        x = -1
-        while True:
-            match = a_re.search(line, x + 1)
-
-            if match is None:
-                break
-
-            x = match.span()[0]
-
-            if x == LL - 1:
-                break
-
-            forward_slash = (
-                (wordsearch[y - 1][x - 1] == "M") and (wordsearch[y + 1][x + 1] == "S")
-            ) or (
-                (wordsearch[y - 1][x - 1] == "S") and (wordsearch[y + 1][x + 1] == "M")
-            )
-            backward_slash = (
-                (wordsearch[y - 1][x + 1] == "M") and (wordsearch[y + 1][x - 1] == "S")
-            ) or (
-                (wordsearch[y - 1][x + 1] == "S") and (wordsearch[y + 1][x - 1] == "M")
-            )
-
-            sum += forward_slash and backward_slash
+        sum += forward_slash and backward_slash
 
     return sum
 
@@ -3,17 +3,18 @@
 from typing import NamedTuple
 from pathlib import Path
 
+from aoc.inputs import Source, read_blocks
+
 
 class Rule(NamedTuple):
     before: int
     after: int
 
 
-def read_rules_and_manuals() -> tuple[list[Rule], list[list[int]]]:
-    with open(Path(__file__).parent / "key.txt") as f:
-        raw_rules_and_manuals = f.read().strip()
-
-    raw_rules, raw_manuals = raw_rules_and_manuals.split("\n\n")
+def read_rules_and_manuals(
+    source: Source = Path(__file__).parent / "key.txt",
+) -> tuple[list[Rule], list[list[int]]]:
+    raw_rules, raw_manuals = read_blocks(source)
 
     rules = []
     for raw_rule in raw_rules.strip().split("\n"):
@@ -45,24 +46,26 @@ def part_one(rules: list[Rule], manuals: list[list[int]]) -> int:
 
 
 def order_pages(manual: list[int], rules: list[Rule]) -> list[int]:
-    relevant_rules = [
-        rule for rule in rules if (rule.before in manual and rule.after in manual)
-    ]
-
-    if len(manual) <= 1:
-        return manual
-
-    first_page = manual[0]
-
-    for page in manual:
-        if page in [rule.after for rule in relevant_rules]:
-            continue
-        first_page = page
-        break
-
-    manual.remove(first_page)
-
-    return [first_page, *order_pages(manual, relevant_rules)]
+    # Takes out pages no rule puts after any page that is left, one at a time
+    remaining = list(manual)
+    relevant_rules = rules
+    ordered = []
+
+    while len(remaining) > 1:
+        relevant_rules = [
+            rule
+            for rule in relevant_rules
+            if (rule.before in remaining and rule.after in remaining)
+        ]
+        after_pages = {rule.after for rule in relevant_rules}
+
+        first_page = next(
+            (page for page in remaining if page not in after_pages), remaining[0]
+        )
+        remaining.remove(first_page)
+        ordered.append(first_page)
+
+    return ordered + remaining
 
 
 def part_two(rules, manuals) -> int:
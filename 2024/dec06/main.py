@@ -1,150 +1,126 @@
 # https://adventofcode.com/2024/day/6
 
-import re
+from functools import partial
 from pathlib import Path
-from typing import NamedTuple
-from enum import Enum, auto
-from tqdm import tqdm
 
+from aoc import bitboard, mapreduce, metrics, shared
+from aoc.grid import Grid
+from aoc.shared import SharedGrid
+from aoc.inputs import Source, read_lines
 
-class Position(NamedTuple):
-    x: int
-    y: int
 
+GUARD_STEPS = metrics.counter(
+    "aoc_guard_steps_total", "Guard moves simulated while looking for loops"
+)
 
-class Direction(Enum):
-    up = auto()
-    down = auto()
-    left = auto()
-    right = auto()
+OBSTACLE, OUTSIDE = b"# "
 
+# Indices into Grid.neighbors, turning right is the next one
+UP = 0
+N_DIRECTIONS = 4
 
-def read_map() -> tuple[Position, list[Position], Position]:
-    with open(Path(__file__).parent / "key.txt") as f:
-        raw_map_lines = f.read().strip().split("\n")
 
-    obstacles: list[Position] = []
-    guard = Position(0, 0)
-    guard_re = re.compile(r"\^")
-    obstacle_re = re.compile(r"#")
+def read_map(source: Source = Path(__file__).parent / "key.txt") -> tuple[int, Grid]:
+    # Walking off the map lands on its blank border
+    map = Grid.from_lines(read_lines(source))
+    return map.find("^"), map
 
-    max_y = len(raw_map_lines)
-    max_x = len(raw_map_lines[0])
-    map_dimensions = Position(max_x, max_y)
 
-    for y, raw_map_line in enumerate(raw_map_lines):
-        x = -1
-        guard_match = guard_re.search(raw_map_line)
+def next_position(guard: int, map: Grid, direction: int) -> tuple[int, int]:
+    ahead = guard + map.neighbors[direction]
+    if map.cells[ahead] == OBSTACLE:
+        return guard, (direction + 1) % N_DIRECTIONS
+    return ahead, direction
 
-        if guard_match is not None:
-            guard = Position(guard_match.span()[0], y)
 
-        while True:
-            obstacle_match = obstacle_re.search(raw_map_line, x + 1)
+def walk(guard: int, map: Grid) -> int:
+    # The cells the guard visits, as a bitboard. Collected in a set first, a bit
+    # set per step would copy the whole board every time
+    visited = set()
+    direction = UP
 
-            if obstacle_match is None:
-                break
+    while map.cells[guard] != OUTSIDE:
+        visited.add(guard)
+        guard, direction = next_position(guard, map, direction)
 
-            x = obstacle_match.span()[0]
+    return bitboard.of(visited)
 
-            obstacles.append(Position(x, y))
 
-    return guard, obstacles, map_dimensions
+def part_one(guard: int, map: Grid) -> int:
+    return bitboard.count(walk(guard, map))
 
 
-def next_position(
-    guard: Position, obstacles: list[Position], direction: Direction
-) -> tuple[Position, Direction]:
-    match direction:
-        case Direction.up:
-            if Position(guard.x, guard.y - 1) in obstacles:
-                direction = Direction.right
-            else:
-                guard = Position(guard.x, guard.y - 1)
-        case Direction.down:
-            if Position(guard.x, guard.y + 1) in obstacles:
-                direction = Direction.left
-            else:
-                guard = Position(guard.x, guard.y + 1)
-        case Direction.right:
-            if Position(guard.x + 1, guard.y) in obstacles:
-                direction = Direction.down
-            else:
-                guard = Position(guard.x + 1, guard.y)
-        case Direction.left:
-            if Position(guard.x - 1, guard.y) in obstacles:
-                direction = Direction.up
+def gets_stuck_in_loop(
+    guard: int, map: Grid, added_obstacle: int, direction: int = UP
+) -> bool:
+    # One bit per direction the guard already faced on every cell
+    visited = bytearray(len(map.cells))
+    cells = map.cells
+    neighbors = map.neighbors
+    steps = 0
+
+    cells[added_obstacle] = OBSTACLE
+    try:
+        while True:
+            visited[guard] |= 1 << direction
+            steps += 1
+            # next_position, inlined: this loop is most of part two
+            ahead = guard + neighbors[direction]
+            if cells[ahead] == OBSTACLE:
+                direction = (direction + 1) % N_DIRECTIONS
             else:
-                guard = Position(guard.x - 1, guard.y)
-
-    return guard, direction
-
-
-def is_out_of_bounds(guard: Position, map_dimensions: Position) -> bool:
-    return (
-        (guard.x < 0)
-        or (guard.y < 0)
-        or (guard.x >= map_dimensions.x)
-        or (guard.y >= map_dimensions.y)
+                guard = ahead
+            if visited[guard] & 1 << direction:
+                return True
+            if cells[guard] == OUTSIDE:
+                return False
+    finally:
+        cells[added_obstacle] = ord(".")
+        GUARD_STEPS.inc(steps)
+
+
+def first_entries(guard: int, map: Grid) -> list[tuple[int, int, int]]:
+    # Every cell of the path, but the start, with where the guard stood and
+    # which way it faced when it first walked into it. An obstacle there leaves
+    # the path up to that point as it was
+    seen = {guard}
+    entries = []
+    direction = UP
+
+    while map.cells[guard] != OUTSIDE:
+        ahead, new_direction = next_position(guard, map, direction)
+        if ahead not in seen and map.cells[ahead] != OUTSIDE:
+            seen.add(ahead)
+            entries.append((ahead, guard, direction))
+        guard, direction = ahead, new_direction
+
+    return entries
+
+
+def creates_loop(shared_map: SharedGrid, entry: tuple[int, int, int]) -> bool:
+    # The shared map is read-only, obstacles go on this process' copy of it and
+    # are taken off again
+    added_obstacle, guard, direction = entry
+    return gets_stuck_in_loop(
+        guard, shared_map.attach_copy(), added_obstacle, direction
     )
 
 
-def part_one(
-    guard: Position, obstacles: list[Position], map_dimensions: Position
-) -> set[Position]:
-    visited = set()
-    direction = Direction.up
-
-    while True:
-        visited.add(guard)
-        guard, direction = next_position(guard, obstacles, direction)
-        if is_out_of_bounds(guard, map_dimensions):
-            break
-
-    return visited
-
+def part_two(guard: int, map: Grid) -> int:
+    # Only positions on the original path can change where the guard goes, and
+    # the guard only has to be followed from where it would first meet them
+    entries = first_entries(guard, map)
 
-def gets_stuck_in_loop(
-    guard: Position,
-    obstacles: list[Position],
-    map_dimensions: Position,
-    added_obstacle: Position,
-) -> bool:
-    visited = set()
-    direction = Direction.up
-    new_obstacles = [*obstacles, added_obstacle]
-    while True:
-        visited.add((guard, direction))
-        guard, direction = next_position(guard, new_obstacles, direction)
-        if (guard, direction) in visited:
-            return True
-        if is_out_of_bounds(guard, map_dimensions):
-            return False
-
-
-def part_two(
-    guard: Position,
-    obstacles: list[Position],
-    map_dimensions: Position,
-    visited: set[Position],
-):
-    n_works = 0
-    for added_obstacle in tqdm(visited):
-        if (added_obstacle.x == guard.x) and (added_obstacle.y == guard.y):
-            continue
-
-        if gets_stuck_in_loop(guard, obstacles, map_dimensions, added_obstacle):
-            n_works += 1
-
-    return n_works
+    with shared.share_grid(map) as shared_map:
+        return mapreduce.map_reduce(
+            partial(creates_loop, shared_map), entries, label="obstacles"
+        )
 
 
 def main():
-    guard, obstacles, map_dimensions = read_map()
-    visited = part_one(guard, obstacles, map_dimensions)
-    print(len(visited))
-
-    print(part_two(guard, obstacles, map_dimensions, visited))
+    guard, map = read_map()
+    print(part_one(guard, map))
+    print(part_two(guard, map))
 
 
 if __name__ == "__main__":
@@ -1,23 +1,22 @@
 # https://adventofcode.com/2024/day/7
 
+from functools import partial
 from pathlib import Path
 from itertools import product
-from dataclasses import dataclass
-from typing import Callable
+from typing import Callable, Iterable, NamedTuple
 
+from aoc import mapreduce, streaming
+from aoc.inputs import Source, read_lines
 
-@dataclass
-class Operation:
+
+class Operation(NamedTuple):
     result: int
     operands: list[int]
 
 
-def read_operations():
-    with open(Path(__file__).parent / "key.txt") as f:
-        raw_operations = f.read().strip().split("\n")
-
+def read_operations(source: Source = Path(__file__).parent / "key.txt"):
     operations = []
-    for raw_operation in raw_operations:
+    for raw_operation in read_lines(source):
         raw_result, raw_operands = raw_operation.split(": ")
         operations.append(
             Operation(
@@ -48,6 +47,23 @@ def could_be_true(
     return False
 
 
+def calibration_result(
+    operation: Operation, available_ops: list[Callable[[int, int], int]]
+) -> int:
+    return operation.result if could_be_true(operation, available_ops) else 0
+
+
+def total_calibration_result(
+    operations: list[Operation], available_ops: list[Callable[[int, int], int]]
+) -> int:
+    # Every placement of operators may be tried
+    return mapreduce.map_reduce(
+        partial(calibration_result, available_ops=available_ops),
+        operations,
+        cost=lambda operation: len(available_ops) ** (len(operation.operands) - 1),
+    )
+
+
 def pair_sum(x, y):
     return x + y
 
@@ -60,11 +76,7 @@ def part_one(operations: list[Operation]) -> int:
 
     available_ops = [pair_sum, pair_mul]
 
-    return sum(
-        operation.result
-        for operation in operations
-        if could_be_true(operation, available_ops)
-    )
+    return total_calibration_result(operations, available_ops)
 
 
 def pair_concat(x, y):
@@ -75,10 +87,13 @@ def part_two(operations: list[Operation]) -> int:
 
     available_ops = [pair_sum, pair_mul, pair_concat]
 
-    return sum(
-        operation.result
-        for operation in operations
-        if could_be_true(operation, available_ops)
+    return total_calibration_result(operations, available_ops)
+
+
+def stream(lines: Iterable[str]) -> dict[str, int]:
+    return streaming.sum_parts(
+        streaming.parse_blocks(lines, read_operations),
+        {"part_one": part_one, "part_two": part_two},
     )
 
 
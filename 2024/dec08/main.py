@@ -4,15 +4,20 @@ from pathlib import Path
 from itertools import combinations
 from typing import NamedTuple
 
+from aoc import bitboard
+from aoc.grid import Grid
+from aoc.inputs import Source, read_lines
+
 
 class Position(NamedTuple):
     x: int
     y: int
 
 
-def read_antennae() -> tuple[dict[str, list[Position]], Position]:
-    with open(Path(__file__).parent / "key.txt") as file:
-        raw_map = file.read().strip().split("\n")
+def read_antennae(
+    source: Source = Path(__file__).parent / "key.txt",
+) -> tuple[dict[str, list[Position]], Grid]:
+    raw_map = list(read_lines(source))
 
     antennae = {}
     for y, line in enumerate(raw_map):
@@ -22,7 +27,7 @@ def read_antennae() -> tuple[dict[str, list[Position]], Position]:
                     antennae[char].append(Position(x=x, y=y))
                 else:
                     antennae[char] = [Position(x=x, y=y)]
-    return antennae, Position(len(raw_map[0]), len(raw_map))
+    return antennae, Grid.from_lines(raw_map)
 
 
 def find_antinodes(
@@ -46,14 +51,21 @@ def is_inside_map(antenna: Position, map_bounds: Position):
     return (0 <= antenna.x < map_bounds.x) and (0 <= antenna.y < map_bounds.y)
 
 
-def part_one(antennae: dict[str, list[Position]], map_bounds: Position) -> int:
-    antinodes = set()
+def as_bitboard(positions: list[Position], map: Grid) -> int:
+    return bitboard.of([map.index(position.x, position.y) for position in positions])
+
+
+def part_one(antennae: dict[str, list[Position]], map: Grid) -> int:
+    map_bounds = Position(map.width, map.height)
+    antinodes = 0
 
     for antennas in antennae.values():
         for antenna1, antenna2 in combinations(antennas, 2):
-            antinodes.update(find_antinodes(antenna1, antenna2, map_bounds))
+            antinodes |= as_bitboard(
+                find_antinodes(antenna1, antenna2, map_bounds), map
+            )
 
-    return len(antinodes)
+    return bitboard.count(antinodes)
 
 
 def find_interference_antinodes(
@@ -82,22 +94,24 @@ def find_interference_antinodes(
     return antinodes
 
 
-def part_two(antennae: dict[str, list[Position]], map_bounds: Position) -> int:
-    antinodes = set()
+def part_two(antennae: dict[str, list[Position]], map: Grid) -> int:
+    map_bounds = Position(map.width, map.height)
+    antinodes = 0
 
     for antennas in antennae.values():
         for antenna1, antenna2 in combinations(antennas, 2):
-            antinodes.update(
-                find_interference_antinodes(antenna1, antenna2, map_bounds)
+            antinodes |= as_bitboard(
+                find_interference_antinodes(antenna1, antenna2, map_bounds),
+                map,
             )
 
-    return len(antinodes)
+    return bitboard.count(antinodes)
 
 
 def main():
-    antennae, map_bounds = read_antennae()
-    print(part_one(antennae, map_bounds))
-    print(part_two(antennae, map_bounds))
+    antennae, map = read_antennae()
+    print(part_one(antennae, map))
+    print(part_two(antennae, map))
 
 
 if __name__ == "__main__":
@@ -1,14 +1,17 @@
 # https://adventofcode.com/2024/day/9
 
 from pathlib import Path
-from dataclasses import dataclass
+
+from aoc.inputs import Source, read_text
 
 
-@dataclass
 class File:
-    id: int
-    size: int
-    start_pos: int
+    __slots__ = ("id", "size", "start_pos")
+
+    def __init__(self, id: int, size: int, start_pos: int):
+        self.id = id
+        self.size = size
+        self.start_pos = start_pos
 
     @property
     def checksum(self):
@@ -17,15 +20,16 @@ class File:
         )
 
 
-@dataclass
 class Empty:
-    size: int
-    start_pos: int
+    __slots__ = ("size", "start_pos")
+
+    def __init__(self, size: int, start_pos: int):
+        self.size = size
+        self.start_pos = start_pos
 
 
-def read_memory_map() -> str:
-    with open(Path(__file__).parent / "key.txt") as file:
-        return file.read().strip()
+def read_memory_map(source: Source = Path(__file__).parent / "key.txt") -> str:
+    return read_text(source)
 
 
 def part_one(memory_map: str) -> int:
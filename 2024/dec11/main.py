@@ -1,16 +1,16 @@
 # https://adventofcode.com/2024/day/11
 
 from pathlib import Path
-from functools import cache
 from collections import Counter
-from tqdm import tqdm
 
+from aoc import memo, metrics, progress, tracing
+from aoc.inputs import Source, read_text
 
-def read_stones():
-    with open(Path(__file__).parent / "key.txt") as file:
-        stones = file.read().strip().split(" ")
+MEMO = metrics.cache_counters("aoc_memo", "Memoised calls")
 
-    return stones
+
+def read_stones(source: Source = Path(__file__).parent / "key.txt"):
+    return read_text(source).split(" ")
 
 
 def apply_rules(stone: str) -> list[str]:
@@ -24,42 +24,42 @@ def apply_rules(stone: str) -> list[str]:
     return [f"{int(stone) * 2024}"]
 
 
-@cache
-def apply_5_steps(stone: str, count: int) -> dict[str, int]:
+@memo.cache(maxsize=100_000, pure=True)
+def apply_5_steps(stone: str) -> dict[str, int]:
+    # The same for every input and every count of the stone, so worth keeping
     stones = [stone]
     for _ in range(5):
         stones = sum([apply_rules(stone) for stone in stones], [])
-    counter = Counter(stones)
 
-    for stone in counter:
-        counter[stone] *= count
+    return dict(Counter(stones))
 
-    return counter
 
+def blink_5_times(counter: Counter[str]) -> Counter[str]:
+    new_counter: Counter[str] = Counter()
+    for stone, count in counter.items():
+        for new_stone, new_count in apply_5_steps(stone).items():
+            new_counter[new_stone] += new_count * count
 
-def part_one(stones: list[str]) -> int:
-    counter = Counter(stones)
+    return new_counter
 
-    for _ in tqdm(range(5)):
-        new_counter = Counter()
 
-        for stone, count in counter.items():
-            new_counter += apply_5_steps(stone, count)
+def part_one(stones: list[str]) -> int:
+    counter = Counter(stones)
 
-        counter = new_counter
+    with MEMO.watch(apply_5_steps):
+        for batch in progress.track(range(5), label="blink batches"):
+            with tracing.span("blink batch", batch=batch, stones=len(counter)):
+                counter = blink_5_times(counter)
 
     return sum(counter.values())
 
 
 def part_two(stones: list[str]) -> int:
     counter = Counter(stones)
-    for _ in tqdm(range(15)):
-        new_counter = Counter()
-
-        for stone, count in counter.items():
-            new_counter += apply_5_steps(stone, count)
-
-        counter = new_counter
+    with MEMO.watch(apply_5_steps):
+        for batch in progress.track(range(15), label="blink batches"):
+            with tracing.span("blink batch", batch=batch, stones=len(counter)):
+                counter = blink_5_times(counter)
 
     return sum(counter.values())
 
@@ -1,8 +1,14 @@
 # https://adventofcode.com/2024/day/12
 
+from functools import partial
 from pathlib import Path
 from enum import Enum
-from typing import NamedTuple
+
+from aoc import bitboard, mapreduce, shared
+from aoc.bitboard import BitGrid
+from aoc.grid import Grid
+from aoc.inputs import Source, read_text
+from aoc.shared import SharedGrid
 
 
 class FenceSide(str, Enum):
@@ -12,175 +18,101 @@ class FenceSide(str, Enum):
     right = "R"
 
 
-class Field(NamedTuple):
-    crop: str
-    x: int
-    y: int
-    fence_up: bool
-    fence_down: bool
-    fence_left: bool
-    fence_right: bool
-
-    @property
-    def n_fences(self) -> int:
-        return sum(
-            [
-                self.fence_up,
-                self.fence_down,
-                self.fence_left,
-                self.fence_right
-            ]
-        )
+def read_farm(source: Source = Path(__file__).parent / "key.txt") -> Grid:
+    # Fields on the edge are fenced off from the blank border
+    return Grid.from_lines(read_text(source).split())
 
-    def get_fence(self) -> FenceSide | None:
-        if self.fence_up:
-            return FenceSide.top
-        if self.fence_left:
-            return FenceSide.left
-        if self.fence_right:
-            return FenceSide.right
-        if self.fence_down:
-            return FenceSide.bottom
-        return None
-        
-
-def read_farm() -> list[list[Field]]:
-    with open(Path(__file__).parent / "key.txt") as file:
-        raw_farm = file.read().strip().split()
-
-    N = len(raw_farm)
-    LL = len(raw_farm[0])
-
-    farm = []
-    for y in range(N):
-        farm_line = []
-        for x in range(LL):
-            crop = raw_farm[y][x]
-            farm_line.append(
-                Field(
-                    crop=crop,
-                    x=x,
-                    y=y,
-                    fence_left=(x == 0) or (raw_farm[y][x - 1] != crop),
-                    fence_right=(x == LL - 1) or (raw_farm[y][x + 1] != crop),
-                    fence_up=(y == 0) or (raw_farm[y - 1][x] != crop),
-                    fence_down=(y == N - 1) or (raw_farm[y + 1][x] != crop),
-                )
-            )
-        farm.append(farm_line)
-
-    return farm
-
-
-def find_all_neighbors(x: int, y: int, farm: list[list[Field]]) -> set[Field]:
-    visited = set()
-    queue = [farm[y][x]]
-    while queue:
-        current = queue.pop()
-        visited.add(current)
-        if (
-            (not current.fence_up)
-            and farm[current.y - 1][current.x] not in queue
-            and farm[current.y - 1][current.x] not in visited
-        ):
-            queue.append(farm[current.y - 1][current.x])
-        if (
-            (not current.fence_down)
-            and farm[current.y + 1][current.x] not in queue
-            and farm[current.y + 1][current.x] not in visited
-        ):
-            queue.append(farm[current.y + 1][current.x])
-        if (
-            (not current.fence_left)
-            and farm[current.y][current.x - 1] not in queue
-            and farm[current.y][current.x - 1] not in visited
-        ):
-            queue.append(farm[current.y][current.x - 1])
-        if (
-            (not current.fence_right)
-            and farm[current.y][current.x + 1] not in queue
-            and farm[current.y][current.x + 1] not in visited
-        ):
-            queue.append(farm[current.y][current.x + 1])
-    return visited
-
-
-def get_size_fences(group: set[Field]) -> tuple[int, int]:
-    size = len(group)
-    fences = 0
-    for field in group:
-        fences += field.n_fences
-    return size, fences
+
+def n_fences(field: int, farm: Grid) -> int:
+    crop = farm.cells[field]
+    return sum(farm.cells[field + step] != crop for step in farm.neighbors)
 
 
-def part_one(farm: list[list[Field]]) -> int:
+def get_fence(field: int, farm: Grid) -> FenceSide | None:
+    crop = farm.cells[field]
+    if farm.cells[field - farm.stride] != crop:
+        return FenceSide.top
+    if farm.cells[field - 1] != crop:
+        return FenceSide.left
+    if farm.cells[field + 1] != crop:
+        return FenceSide.right
+    if farm.cells[field + farm.stride] != crop:
+        return FenceSide.bottom
+    return None
 
-    N = len(farm)
-    LL = len(farm[0])
 
-    visited = set()
-    group_info = []
+def find_groups(farm: Grid, board: BitGrid) -> list[int]:
+    # Every group of connected fields growing the same crop, as a bitboard
+    crops = {crop: board.mask(chr(crop)) for crop in set(farm.cells)}
 
-    for y in range(N):
-        for x in range(LL):
-            if farm[y][x] not in visited:
-                group = find_all_neighbors(x, y, farm)
-                group_info.append(get_size_fences(group))
-                visited.update(group)
+    groups = []
+    unvisited = board.inside
+    while unvisited:
+        field = bitboard.first(unvisited)
+        group = board.fill(bitboard.bit(field), crops[farm.cells[field]])
+        groups.append(group)
+        unvisited &= ~group
+
+    return groups
+
+
+def get_size_fences(group: int, board: BitGrid) -> tuple[int, int]:
+    size = bitboard.count(group)
+    fences = sum(bitboard.count(board.edges(group, step)) for step in board.neighbors)
+    return size, fences
+
+
+def part_one(farm: Grid) -> int:
+    board = BitGrid(farm)
+    group_info = [get_size_fences(group, board) for group in find_groups(farm, board)]
 
     return sum(group[0] * group[1] for group in group_info)
 
 
 def walk_fence(
-    position: Field, fence_side: FenceSide, group: set[Field], farm: list[list[Field]]
-):
-    N = len(farm)
-    LL = len(farm[0])
+    position: int, fence_side: FenceSide, group: set[int], farm: Grid
+) -> tuple[int, FenceSide]:
+    # The border is never part of a group, so walking off the map turns a corner
+    up, right, down, left = farm.neighbors
 
     match fence_side:
         case FenceSide.top:
-            if (position.x == LL - 1) or (
-                farm[position.y][position.x + 1] not in group
-            ):
+            if position + right not in group:
                 return position, FenceSide.right
-            if (position.y == 0) or (farm[position.y - 1][position.x + 1] not in group):
-                return farm[position.y][position.x + 1], FenceSide.top
+            if position + up + right not in group:
+                return position + right, FenceSide.top
 
-            return farm[position.y - 1][position.x + 1], FenceSide.left
+            return position + up + right, FenceSide.left
         case FenceSide.bottom:
-            if (position.x == 0) or (farm[position.y][position.x - 1] not in group):
+            if position + left not in group:
                 return position, FenceSide.left
-            if (position.y == N - 1) or (
-                farm[position.y + 1][position.x - 1] not in group
-            ):
-                return farm[position.y][position.x - 1], FenceSide.bottom
+            if position + down + left not in group:
+                return position + left, FenceSide.bottom
 
-            return farm[position.y + 1][position.x - 1], FenceSide.right
+            return position + down + left, FenceSide.right
         case FenceSide.left:
-            if (position.y == 0) or (farm[position.y - 1][position.x] not in group):
+            if position + up not in group:
                 return position, FenceSide.top
-            if (position.x == 0) or (farm[position.y - 1][position.x - 1] not in group):
-                return farm[position.y - 1][position.x], FenceSide.left
+            if position + up + left not in group:
+                return position + up, FenceSide.left
 
-            return farm[position.y - 1][position.x - 1], FenceSide.bottom
+            return position + up + left, FenceSide.bottom
         case FenceSide.right:
-            if (position.y == N - 1) or (farm[position.y + 1][position.x] not in group):
+            if position + down not in group:
                 return position, FenceSide.bottom
-            if (position.x == LL - 1) or (
-                farm[position.y + 1][position.x + 1] not in group
-            ):
-                return farm[position.y + 1][position.x], FenceSide.right
+            if position + down + right not in group:
+                return position + down, FenceSide.right
 
-            return farm[position.y + 1][position.x + 1], FenceSide.top
+            return position + down + right, FenceSide.top
 
 
-def count_nsides(group: set[Field], farm: list[list[Field]]) -> int:
-    has_fences = {field for field in group if field.n_fences > 0}
+def count_nsides(group: set[int], farm: Grid) -> int:
+    has_fences = {field for field in group if n_fences(field, farm) > 0}
 
     side_count = 0
     while has_fences:
         start_pos = has_fences.pop()
-        start_fence = start_pos.get_fence()
+        start_fence = get_fence(start_pos, farm)
 
         current_pos, current_fence = walk_fence(start_pos, start_fence, group, farm)
         side_count += (start_fence != current_fence)
@@ -197,22 +129,19 @@ def count_nsides(group: set[Field], farm: list[list[Field]]) -> int:
     return side_count
 
 
-def part_two(farm: list[list[Field]]) -> int:
+def discounted_price(shared_farm: SharedGrid, bits: int) -> int:
+    # Walking fences looks up single fields, which a set does best
+    group = set(bitboard.cells(bits))
+    return len(group) * count_nsides(group, shared_farm.attach())
 
-    N = len(farm)
-    LL = len(farm[0])
 
-    visited = set()
-    group_info = []
+def part_two(farm: Grid) -> int:
+    groups = find_groups(farm, BitGrid(farm))
 
-    for y in range(N):
-        for x in range(LL):
-            if farm[y][x] not in visited:
-                group = find_all_neighbors(x, y, farm)
-                group_info.append((len(group), count_nsides(group, farm)))
-                visited.update(group)
-
-    return sum(group[0] * group[1] for group in group_info)
+    with shared.share_grid(farm) as shared_farm:
+        return mapreduce.map_reduce(
+            partial(discounted_price, shared_farm), groups, cost=bitboard.count
+        )
 
 
 def main():
@@ -1,11 +1,13 @@
 # https://adventofcode.com/2024/day/13
 
 from pathlib import Path
-from dataclasses import dataclass
+from typing import NamedTuple
 
+from aoc import mapreduce
+from aoc.inputs import Source, read_blocks
 
-@dataclass
-class Machine:
+
+class Machine(NamedTuple):
     ax: int
     ay: int
     bx: int
@@ -47,47 +49,38 @@ def process_machine(raw_machine: str) -> Machine:
     )
 
 
-def read_machines() -> list[Machine]:
-    with open(Path(__file__).parent / "key.txt") as f:
-        raw_machines = f.read().strip().split("\n\n")
-
+def read_machines(source: Source = Path(__file__).parent / "key.txt") -> list[Machine]:
     machines = []
-    for raw_machine in raw_machines:
+    for raw_machine in read_blocks(source):
         machines.append(process_machine(raw_machine))
 
     return machines
 
 
-def part_one(machines: list[Machine]) -> int:
-    total = 0
-    for machine in machines:
-        if (
-            machine.compute_A_presses() is not None
-            and machine.compute_B_presses() is not None
-            and int(machine.compute_A_presses()) == machine.compute_A_presses()
-            and int(machine.compute_B_presses()) == machine.compute_B_presses()
-        ):
-            total += 3 * machine.compute_A_presses() + machine.compute_B_presses()
+def tokens(machine: Machine) -> int:
+    if (
+        machine.compute_A_presses() is not None
+        and machine.compute_B_presses() is not None
+        and int(machine.compute_A_presses()) == machine.compute_A_presses()
+        and int(machine.compute_B_presses()) == machine.compute_B_presses()
+    ):
+        return int(3 * machine.compute_A_presses() + machine.compute_B_presses())
 
-    return int(total)
+    return 0
 
 
-def part_two(machines: list[Machine]) -> int:
-    total = 0
+def part_one(machines: list[Machine]) -> int:
+    return mapreduce.map_reduce(tokens, machines)
 
-    for machine in machines:
-        machine.rx += 10000000000000
-        machine.ry += 10000000000000
 
-        if (
-            machine.compute_A_presses() is not None
-            and machine.compute_B_presses() is not None
-            and int(machine.compute_A_presses()) == machine.compute_A_presses()
-            and int(machine.compute_B_presses()) == machine.compute_B_presses()
-        ):
-            total += 3 * machine.compute_A_presses() + machine.compute_B_presses()
+def part_two(machines: list[Machine]) -> int:
+    # Before they are handed out, workers only get copies of the machines
+    machines = [
+        machine._replace(rx=machine.rx + 10000000000000, ry=machine.ry + 10000000000000)
+        for machine in machines
+    ]
 
-    return int(total)
+    return mapreduce.map_reduce(tokens, machines)
 
 
 def main():
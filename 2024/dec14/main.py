@@ -2,12 +2,13 @@
 
 import re
 import statistics
-from tqdm import tqdm
 from collections import Counter
 from pathlib import Path
-from dataclasses import dataclass
 from enum import Enum, auto
 
+from aoc import render
+from aoc.inputs import Source, read_lines
+
 MAP_WIDTH = 101
 MAP_HEIGHT = 103
 
@@ -20,12 +21,14 @@ class Quadrant(Enum):
     middle_cross = auto()
 
 
-@dataclass
 class Robot:
-    px: int
-    py: int
-    vx: int
-    vy: int
+    __slots__ = ("px", "py", "vx", "vy")
+
+    def __init__(self, px: int, py: int, vx: int, vy: int):
+        self.px = px
+        self.py = py
+        self.vx = vx
+        self.vy = vy
 
     @property
     def quadrant(self) -> Quadrant:
@@ -47,18 +50,14 @@ class Robot:
         return self
 
 
-def read_robots() -> list[Robot]:
-    with open(Path(__file__).parent / "key.txt") as f:
-        raw_robots = f.read().strip().split("\n")
-
+def read_robots(source: Source = Path(__file__).parent / "key.txt") -> list[Robot]:
     robot_re = re.compile(r"^p=(\d+),(\d+) v=(-?\d+),(-?\d+)$")
     robots = []
 
-    for raw_robot in raw_robots:
+    for raw_robot in read_lines(source):
         robot_match = robot_re.match(raw_robot)
 
         if robot_match is None:
-            breakpoint()
             raise ValueError("Unrecognized robot format!")
 
         robots.append(
@@ -73,22 +72,20 @@ def read_robots() -> list[Robot]:
     return robots
 
 
-def main():
-    robots = read_robots()
-
+def part_one(robots: list[Robot]) -> int:
     moved_robots = [robot.move(100) for robot in robots]
     quadrants = [robot.quadrant for robot in moved_robots]
 
     count = Counter(quadrants)
-    print(
+    return (
         count[Quadrant.top_right]
         * count[Quadrant.top_left]
         * count[Quadrant.bottom_right]
         * count[Quadrant.bottom_left]
     )
 
-    robots = read_robots()
 
+def part_two(robots: list[Robot]) -> int:
     for i in range(1, 100000):
         for robot in robots:
             robot.move(1)
@@ -96,13 +93,25 @@ def main():
         if compute_entropy(robots) < 40:
             break
 
+    render.frame(f"robots after {i} seconds", draw_robots, robots)
+    return i
+
+
+def draw_robots(robots: list[Robot]) -> list[str]:
     map = [[" " for _ in range(MAP_WIDTH)] for _ in range(MAP_HEIGHT)]
 
     for robot in robots:
         map[robot.py][robot.px] = "#"
 
-    print("\n".join(["".join(map_line) for map_line in map]))
-    print(i)
+    return ["".join(map_line) for map_line in map]
+
+
+def main():
+    robots = read_robots()
+    print(part_one(robots))
+
+    robots = read_robots()
+    print(part_two(robots))
 
 
 def compute_entropy(robots: list[Robot]) -> float:
@@ -2,9 +2,12 @@
 
 from pathlib import Path
 from enum import Enum, auto
-from dataclasses import dataclass
-from typing import Literal
-from time import sleep
+
+from aoc import render
+from aoc.grid import Grid
+from aoc.inputs import Source, read_blocks
+
+WALL, EMPTY, BOX, ROBOT, BOX_LEFT, BOX_RIGHT = b"#.O@[]"
 
 
 class Instruction(Enum):
@@ -14,23 +17,13 @@ class Instruction(Enum):
     right = auto()
 
 
-@dataclass
-class Position:
-    x: int
-    y: int
-
-
-def read_map_and_instructions() -> tuple[Position, list[list[str]], list[Instruction]]:
-    with open(Path(__file__).parent / "key.txt") as f:
-        raw_map, raw_instructions = f.read().strip().split("\n\n")
+def read_map_and_instructions(
+    source: Source = Path(__file__).parent / "key.txt",
+) -> tuple[int, Grid, list[Instruction]]:
+    raw_map, raw_instructions = read_blocks(source)
 
-    map = [[*line] for line in raw_map.split("\n")]
-
-    robot = Position(0, 0)
-    for y, line in enumerate(map):
-        for x, char in enumerate(line):
-            if char == "@":
-                robot.x, robot.y = x, y
+    map = Grid.from_lines(raw_map.split("\n"), border="#")
+    robot = map.find("@")
 
     instructions: list[Instruction] = []
     raw_instructions = "".join(raw_instructions.split("\n"))
@@ -48,333 +41,110 @@ def read_map_and_instructions() -> tuple[Position, list[list[str]], list[Instruc
     return robot, map, instructions
 
 
-def move(
-    obj: Position,
-    obj_char: str,
-    map: list[list[str]],
-    instruction: Instruction,
-) -> bool:
-    match instruction:
-        case Instruction.up:
-            match map[obj.y - 1][obj.x]:
-                case ".":
-                    map[obj.y][obj.x] = "."
-                    obj.y -= 1
-                    map[obj.y][obj.x] = obj_char
-                    return True
-                case "#":
-                    return False
-                case "O":
-                    if move(Position(obj.x, obj.y - 1), "O", map, Instruction.up):
-                        map[obj.y][obj.x] = "."
-                        obj.y -= 1
-                        map[obj.y][obj.x] = obj_char
-                        return True
-                    return False
-
-        case Instruction.down:
-            match map[obj.y + 1][obj.x]:
-                case ".":
-                    map[obj.y][obj.x] = "."
-                    obj.y += 1
-                    map[obj.y][obj.x] = obj_char
-                    return True
-                case "#":
-                    return False
-                case "O":
-                    if move(Position(obj.x, obj.y + 1), "O", map, Instruction.down):
-                        map[obj.y][obj.x] = "."
-                        obj.y += 1
-                        map[obj.y][obj.x] = obj_char
-                        return True
-                    return False
-
-        case Instruction.right:
-            match map[obj.y][obj.x + 1]:
-                case ".":
-                    map[obj.y][obj.x] = "."
-                    obj.x += 1
-                    map[obj.y][obj.x] = obj_char
-                    return True
-                case "#":
-                    return False
-                case "O":
-                    if move(Position(obj.x + 1, obj.y), "O", map, Instruction.right):
-                        map[obj.y][obj.x] = "."
-                        obj.x += 1
-                        map[obj.y][obj.x] = obj_char
-                        return True
-                    return False
-
-        case Instruction.left:
-            match map[obj.y][obj.x - 1]:
-                case ".":
-                    map[obj.y][obj.x] = "."
-                    obj.x -= 1
-                    map[obj.y][obj.x] = obj_char
-                    return True
-                case "#":
-                    return False
-                case "O":
-                    if move(Position(obj.x - 1, obj.y), "O", map, Instruction.left):
-                        map[obj.y][obj.x] = "."
-                        obj.x -= 1
-                        map[obj.y][obj.x] = obj_char
-                        return True
-                    return False
-    return False
-
-
-def print_map(map: list[list[str]]) -> None:
-    print("\n".join("".join(mapline) for mapline in map))
-
-
-def part_one():
-    robot, map, instructions = read_map_and_instructions()
+def instruction_steps(map: Grid) -> dict[Instruction, int]:
+    up, right, down, left = map.neighbors
+    return {
+        Instruction.up: up,
+        Instruction.down: down,
+        Instruction.left: left,
+        Instruction.right: right,
+    }
 
-    for instruction in instructions:
-        move(robot, "@", map, instruction)
 
-    boxes = []
-    for y, row in enumerate(map):
-        for x, char in enumerate(row):
-            if char == "O":
-                boxes.append(Position(x, y))
+def move(obj: int, map: Grid, step: int) -> bool:
+    # The row of boxes ahead moves when there is room behind its last box
+    end = obj + step
+    while map.cells[end] == BOX:
+        end += step
+    if map.cells[end] == WALL:
+        return False
 
-    sum = 0
-    for box in boxes:
-        sum += box.x + 100 * box.y
+    while end != obj:
+        map.cells[end] = map.cells[end - step]
+        end -= step
+    map.cells[obj] = EMPTY
+    return True
 
-    print(sum)
 
+def part_one(robot: int, map: Grid, instructions: list[Instruction]) -> int:
+    steps = instruction_steps(map)
+    for instruction in instructions:
+        if move(robot, map, steps[instruction]):
+            robot += steps[instruction]
+    render.frame("final warehouse", map.lines)
 
-def read_double_map_and_instructions():
-    with open("key.txt") as f:
-        raw_map, raw_instructions = f.read().strip().split("\n\n")
+    sum = 0
+    for box in map.find_all("O"):
+        x, y = map.position(box)
+        sum += x + 100 * y
 
-    double_map = (
-        raw_map.replace("#", "##")
-        .replace("O", "[]")
-        .replace(".", "..")
-        .replace("@", "@.")
-        .split("\n")
-    )
-    double_map = [[*line] for line in double_map]
+    return sum
 
-    robot = Position(0, 0)
-    for y, line in enumerate(double_map):
-        for x, char in enumerate(line):
-            if char == "@":
-                robot.x, robot.y = x, y
 
-    instructions: list[Instruction] = []
-    raw_instructions = "".join(raw_instructions.split("\n"))
-    for raw_instruction in raw_instructions:
-        match raw_instruction:
-            case "^":
-                instructions.append(Instruction.up)
-            case "v":
-                instructions.append(Instruction.down)
-            case ">":
-                instructions.append(Instruction.right)
-            case "<":
-                instructions.append(Instruction.left)
+def widen_map(robot: int, map: Grid) -> tuple[int, Grid]:
+    doubled_chars = {"#": "##", "O": "[]", ".": "..", "@": "@."}
+    double_map = Grid.from_lines(
+        ["".join(doubled_chars[char] for char in line) for line in map.lines()],
+        border="#",
+    )
 
-    return robot, double_map, instructions
+    x, y = map.position(robot)
+    return double_map.index(2 * x, y), double_map
 
 
-def can_move(
-    pos: Position, obj_char: Literal["[", "]"], delta: int, map: list[list[str]]
-) -> bool:
-    if obj_char == "[":
-        if map[pos.y + delta][pos.x] == "." and map[pos.y + delta][pos.x + 1] == ".":
-            return True
-        if map[pos.y + delta][pos.x] == "#" or map[pos.y + delta][pos.x + 1] == "#":
-            return False
+def other_half(pos: int, map: Grid) -> int:
+    return pos + 1 if map.cells[pos] == BOX_LEFT else pos - 1
 
-        success = True
-
-        if map[pos.y + delta][pos.x] in ["[", "]"]:
-            success = success and can_move(
-                Position(pos.x, pos.y + delta),
-                map[pos.y + delta][pos.x],
-                delta,
-                map,
-            )
-        if map[pos.y + delta][pos.x + 1] in ["[", "]"]:
-            success = success and can_move(
-                Position(pos.x + 1, pos.y + delta),
-                map[pos.y + delta][pos.x + 1],
-                delta,
-                map,
-            )
-
-        return success
-
-    if obj_char == "]":
-        if map[pos.y + delta][pos.x] == "." and map[pos.y + delta][pos.x - 1] == ".":
-            return True
-        if map[pos.y + delta][pos.x] == "#" or map[pos.y + delta][pos.x - 1] == "#":
-            return False
 
-        success = True
-
-        if map[pos.y + delta][pos.x] in ["[", "]"]:
-            success = success and can_move(
-                Position(pos.x, pos.y + delta), map[pos.y + delta][pos.x], delta, map
-            )
-        if map[pos.y + delta][pos.x - 1] in ["[", "]"]:
-            success = success and can_move(
-                Position(pos.x - 1, pos.y + delta),
-                map[pos.y + delta][pos.x - 1],
-                delta,
-                map,
-            )
-
-        return success
-
-
-def wide_move(
-    obj: Position, obj_char: str, map: list[list[str]], instruction: Instruction
-) -> bool:
-    match instruction:
-        case Instruction.up:
-            if obj_char == "@":
-                if map[obj.y - 1][obj.x] == ".":
-                    map[obj.y][obj.x] = "."
-                    obj.y -= 1
-                    map[obj.y][obj.x] = "@"
-                    return True
-
-                if map[obj.y - 1][obj.x] == "#":
-                    return False
-
-                if can_move(Position(obj.x, obj.y - 1), map[obj.y - 1][obj.x], -1, map):
-                    if map[obj.y - 1][obj.x] == "[":
-                        wide_move(Position(obj.x, obj.y - 1), "[", map, instruction)
-                        wide_move(Position(obj.x + 1, obj.y - 1), "]", map, instruction)
-                    if map[obj.y - 1][obj.x] == "]":
-                        wide_move(Position(obj.x - 1, obj.y - 1), "[", map, instruction)
-                        wide_move(Position(obj.x, obj.y - 1), "]", map, instruction)
-                    map[obj.y][obj.x] = "."
-                    obj.y -= 1
-                    map[obj.y][obj.x] = "@"
-                    return True
-
-                else:
-                    return False
-
-            else:
-                if map[obj.y - 1][obj.x] == "[":
-                    wide_move(Position(obj.x, obj.y - 1), "[", map, instruction)
-                    wide_move(Position(obj.x + 1, obj.y - 1), "]", map, instruction)
-                if map[obj.y - 1][obj.x] == "]":
-                    wide_move(Position(obj.x - 1, obj.y - 1), "[", map, instruction)
-                    wide_move(Position(obj.x, obj.y - 1), "]", map, instruction)
-
-                map[obj.y][obj.x] = "."
-                obj.y -= 1
-                map[obj.y][obj.x] = obj_char
-                return True
-
-        case Instruction.down:
-            if obj_char == "@":
-                if map[obj.y + 1][obj.x] == ".":
-                    map[obj.y][obj.x] = "."
-                    obj.y += 1
-                    map[obj.y][obj.x] = "@"
-                    return True
-
-                if map[obj.y + 1][obj.x] == "#":
-                    return False
-
-                if can_move(Position(obj.x, obj.y + 1), map[obj.y + 1][obj.x], 1, map):
-                    if map[obj.y + 1][obj.x] == "[":
-                        wide_move(Position(obj.x, obj.y + 1), "[", map, instruction)
-                        wide_move(Position(obj.x + 1, obj.y + 1), "]", map, instruction)
-                    if map[obj.y + 1][obj.x] == "]":
-                        wide_move(Position(obj.x - 1, obj.y + 1), "[", map, instruction)
-                        wide_move(Position(obj.x, obj.y + 1), "]", map, instruction)
-                    map[obj.y][obj.x] = "."
-                    obj.y += 1
-                    map[obj.y][obj.x] = "@"
-                    return True
-
-                else:
-                    return False
-
-            else:
-                if map[obj.y + 1][obj.x] == "[":
-                    wide_move(Position(obj.x, obj.y + 1), "[", map, instruction)
-                    wide_move(Position(obj.x + 1, obj.y + 1), "]", map, instruction)
-                if map[obj.y + 1][obj.x] == "]":
-                    wide_move(Position(obj.x - 1, obj.y + 1), "[", map, instruction)
-                    wide_move(Position(obj.x, obj.y + 1), "]", map, instruction)
-
-                map[obj.y][obj.x] = "."
-                obj.y += 1
-                map[obj.y][obj.x] = obj_char
-                return True
-
-        case Instruction.left:
-            if map[obj.y][obj.x - 1] == ".":
-                map[obj.y][obj.x] = "."
-                obj.x -= 1
-                map[obj.y][obj.x] = obj_char
-                return True
-            if map[obj.y][obj.x - 1] == "#":
-                return False
-            if wide_move(
-                Position(obj.x - 1, obj.y), map[obj.y][obj.x - 1], map, instruction
-            ):
-                map[obj.y][obj.x] = "."
-                obj.x -= 1
-                map[obj.y][obj.x] = obj_char
-                return True
+def wide_move(obj: int, map: Grid, step: int) -> bool:
+    # Everything obj pushes, one front after the other. Sideways that is a row
+    # of half boxes, up or down a box pushes both boxes above a half of it, so
+    # a push can spread out into a whole pyramid
+    pushed = [obj]
+    seen = {obj}
+    for cell in pushed:
+        ahead = cell + step
+        if ahead in seen or map.cells[ahead] == EMPTY:
+            continue
+        if map.cells[ahead] == WALL:
             return False
 
-        case Instruction.right:
-            if map[obj.y][obj.x + 1] == ".":
-                map[obj.y][obj.x] = "."
-                obj.x += 1
-                map[obj.y][obj.x] = obj_char
-                return True
-
-            if map[obj.y][obj.x + 1] == "#":
-                return False
-
-            if wide_move(
-                Position(obj.x + 1, obj.y), map[obj.y][obj.x + 1], map, instruction
-            ):
-                map[obj.y][obj.x] = "."
-                obj.x += 1
-                map[obj.y][obj.x] = obj_char
-                return True
-            return False
+        halves = [ahead] if step in (-1, 1) else [ahead, other_half(ahead, map)]
+        for half in halves:
+            if half not in seen:
+                seen.add(half)
+                pushed.append(half)
 
+    # Fronts are found in order, the furthest one moves first
+    for cell in reversed(pushed):
+        map.cells[cell + step] = map.cells[cell]
+        map.cells[cell] = EMPTY
+    return True
 
-def part_two():
-    robot, double_map, instructions = read_double_map_and_instructions()
 
-    for instruction in instructions:
-        wide_move(robot, "@", double_map, instruction)
+def part_two(robot: int, map: Grid, instructions: list[Instruction]) -> int:
+    robot, double_map = widen_map(robot, map)
 
-    boxes = []
-    for y, line in enumerate(double_map):
-        for x, char in enumerate(line):
-            if char == "[":
-                boxes.append(Position(x, y))
+    steps = instruction_steps(double_map)
+    for instruction in instructions:
+        if wide_move(robot, double_map, steps[instruction]):
+            robot += steps[instruction]
+    render.frame("final wide warehouse", double_map.lines)
 
     sum = 0
-    for box in boxes:
-        sum += box.y * 100 + box.x
+    for box in double_map.find_all("["):
+        x, y = double_map.position(box)
+        sum += y * 100 + x
 
-    print(sum)
+    return sum
 
 
 def main():
-    part_one()
-    part_two()
+    robot, map, instructions = read_map_and_instructions()
+    print(part_one(robot, map, instructions))
+
+    robot, map, instructions = read_map_and_instructions()
+    print(part_two(robot, map, instructions))
 
 
 if __name__ == "__main__":
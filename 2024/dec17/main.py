@@ -2,10 +2,13 @@
 
 from pathlib import Path
 
+from aoc.inputs import Source, read_blocks
 
-def read_program_and_registers() -> tuple[list[int], dict[str, int]]:
-    with open(Path(__file__).parent / "key.txt") as f:
-        raw_registers, raw_program = f.read().strip().split("\n\n")
+
+def read_program_and_registers(
+    source: Source = Path(__file__).parent / "key.txt",
+) -> tuple[list[int], dict[str, int]]:
+    raw_registers, raw_program = read_blocks(source)
 
     registers = {}
     for raw_register in raw_registers.split("\n"):
@@ -101,10 +104,19 @@ def recursive_find(
                 return output
 
 
+def part_one(program: list[int], registers: dict[str, int]) -> str:
+    return ",".join(str(val) for val in execute_program(program, registers))
+
+
+def part_two(program: list[int], registers: dict[str, int]) -> int | None:
+    # The program has to output itself, the initial registers are irrelevant
+    return recursive_find(program, program)
+
+
 def main():
     program, registers = read_program_and_registers()
-    print(execute_program(program, registers))
-    print(recursive_find(program, program))
+    print(part_one(program, registers))
+    print(part_two(program, registers))
 
 
 if __name__ == "__main__":
@@ -1,103 +1,85 @@
 # https://adventofcode.com/2024/day/18
 
-from collections import defaultdict
 from pathlib import Path
-from dataclasses import dataclass
+from typing import NamedTuple
+
+from aoc import metrics, search, tracing
+from aoc.grid import Grid
+from aoc.inputs import Source, read_lines
 
 
 MAZE_SIZE = 70
 STREAM_SIZE = 1024
 
+NODES_SETTLED = metrics.counter(
+    "aoc_nodes_settled_total", "Nodes whose shortest distance was settled"
+)
+SETTLED_PER_SEARCH = metrics.histogram(
+    "aoc_nodes_settled_per_search", "Nodes settled by a single shortest path search"
+)
+
+
+OPEN = ord(".")
+CORRUPTED = ord("#")
 
-@dataclass(frozen=True)
-class Position:
+
+class Position(NamedTuple):
     x: int
     y: int
 
 
-def read_data_stream() -> list[Position]:
-    with open(Path(__file__).parent / "key.txt") as file:
-        raw_data = file.read().strip().split("\n")
-
+def read_data_stream(
+    source: Source = Path(__file__).parent / "key.txt",
+) -> list[Position]:
     points = []
-    for raw_point in raw_data:
+    for raw_point in read_lines(source):
         raw_x, raw_y = raw_point.split(",")
         points.append(Position(int(raw_x), int(raw_y)))
 
     return points
 
 
-def construct_map(positions: list[Position]) -> list[list[str]]:
-    map = [["." for _ in range(MAZE_SIZE + 1)] for _ in range(MAZE_SIZE + 1)]
+def construct_map(positions: list[Position]) -> Grid:
+    # Walled in, the search never has to check it stays on the map
+    map = Grid.from_lines(["." * (MAZE_SIZE + 1)] * (MAZE_SIZE + 1), border="#")
 
     for point in positions:
-        map[point.y][point.x] = "#"
+        map.cells[map.index(point.x, point.y)] = CORRUPTED
 
     return map
 
 
-def get_next_current(distances, visited):
-    min_val = float("inf")
-    current = None
-    for element, value in distances.items():
-        if element in visited:
-            continue
-        if value <= min_val:
-            min_val = value
-            current = element
-
-    return current
+def get_neighbors(current: int, map: Grid) -> list[int]:
+    return [
+        current + step for step in map.neighbors if map.cells[current + step] == OPEN
+    ]
 
 
-def get_neighbors(current, map):
-
-    neighbors = []
-
-    if current.x > 0 and map[current.y][current.x - 1] == ".":
-        neighbors.append(Position(current.x - 1, current.y))
-    if current.x < MAZE_SIZE and map[current.y][current.x + 1] == ".":
-        neighbors.append(Position(current.x + 1, current.y))
-    if current.y > 0 and map[current.y - 1][current.x] == ".":
-        neighbors.append(Position(current.x, current.y - 1))
-    if current.y < MAZE_SIZE and map[current.y + 1][current.x] == ".":
-        neighbors.append(Position(current.x, current.y + 1))
-
-    return neighbors
+def steps_to_exit(current: int, map: Grid) -> int:
+    # Never more than it really takes, corrupted bytes only make it longer
+    x, y = map.position(current)
+    return 2 * MAZE_SIZE - x - y
 
 
 def find_min_distance(positions):
     map = construct_map(positions)
 
-    visited = set()
-    distances = defaultdict(lambda: float("inf"))
-    current = Position(0, 0)
-    distances[current] = 0
+    exit = map.index(MAZE_SIZE, MAZE_SIZE)
 
-    while True:
-        current = get_next_current(distances, visited)
-        if current is None:
-            break
-        visited.add(current)
-        neighbors = get_neighbors(current, map)
-        for neighbor in neighbors:
-            distances[neighbor] = min(distances[current] + 1, distances[neighbor])
+    result = search.astar(
+        [map.index(0, 0)],
+        lambda current: [(neighbor, 1) for neighbor in get_neighbors(current, map)],
+        lambda current: steps_to_exit(current, map),
+        goal=lambda current: current == exit,
+    )
 
-        if current == Position(MAZE_SIZE, MAZE_SIZE):
-            break
+    NODES_SETTLED.inc(result.stats.settled)
+    SETTLED_PER_SEARCH.observe(result.stats.settled)
 
-    if current is None:
+    if result.found is None:
         return None
 
-    return distances[Position(MAZE_SIZE, MAZE_SIZE)]
-
-
-def main():
-    positions = read_data_stream()
-    min_distance = find_min_distance(positions[:STREAM_SIZE])
-    print(min_distance)
-
-    blocking_byte = find_blocking_byte(positions)
-    print(blocking_byte)
+    return result.distances[exit]
 
 
 def find_blocking_byte(positions):
@@ -108,7 +90,8 @@ def find_blocking_byte(positions):
 
     while left + 1 < right:
         center = (left + right) // 2
-        min_distance = find_min_distance(positions[:center])
+        with tracing.span("probe", bytes=center):
+            min_distance = find_min_distance(positions[:center])
         if min_distance is None:
             right = center
         else:
@@ -117,5 +100,20 @@ def find_blocking_byte(positions):
     return positions[left]
 
 
+def part_one(positions: list[Position]) -> int | None:
+    return find_min_distance(positions[:STREAM_SIZE])
+
+
+def part_two(positions: list[Position]) -> str:
+    blocking_byte = find_blocking_byte(positions)
+    return f"{blocking_byte.x},{blocking_byte.y}"
+
+
+def main():
+    positions = read_data_stream()
+    print(part_one(positions))
+    print(part_two(positions))
+
+
 if __name__ == "__main__":
     main()
@@ -1,89 +1,68 @@
 # https://adventofcode.com/2024/day/19
 
-from tqdm import tqdm
-from functools import cache
+from functools import partial
 from pathlib import Path
 
+from aoc import mapreduce, metrics
+from aoc.inputs import Source, read_blocks
 
-def read_towels_and_patterns() -> tuple[list[str], list[str]]:
-    with open(Path(__file__).parent / "key.txt") as f:
-        raw_towels, raw_patterns = f.read().strip().split("\n\n")
+DP_STATES = metrics.counter(
+    "aoc_dp_states_total", "States a bottom-up count went through"
+)
 
-    towels = raw_towels.split(", ")
+
+def read_towels_and_patterns(
+    source: Source = Path(__file__).parent / "key.txt",
+) -> tuple[tuple[str, ...], list[str]]:
+    raw_towels, raw_patterns = read_blocks(source)
+
+    towels = tuple(raw_towels.split(", "))
     patterns = raw_patterns.split("\n")
 
     return towels, patterns
 
 
-def can_fit(pattern: str, towels: list[str]) -> bool:
-    if len(pattern) == 0:
-        return True
+def count_patterns(pattern, towels) -> int:
+    # counts[start] is the number of ways to make pattern[start:], filled in
+    # from the end. Towels are short, so trying every length beats trying
+    # every towel
+    towel_set = set(towels)
+    lengths = sorted({len(towel) for towel in towels})
 
-    for towel in towels:
-        if pattern.startswith(towel):
-            if can_fit(pattern[len(towel) :], towels):
-                return True
-    return False
+    counts = [0] * len(pattern) + [1]
+    for start in range(len(pattern) - 1, -1, -1):
+        counts[start] = sum(
+            counts[start + length]
+            for length in lengths
+            if start + length <= len(pattern)
+            and pattern[start : start + length] in towel_set
+        )
+    DP_STATES.inc(len(counts))
 
+    return counts[0]
 
-def renew_trie(trie, towels):
-    for towel in towels:
-        current = trie
-        for char in towel:
-            if char not in current:
-                current[char] = {}
-            current = current[char]
 
-        current["*"] = True
+def is_possible(pattern, towels) -> bool:
+    return count_patterns(pattern, towels) > 0
 
 
 def part_one(towels, patterns) -> int:
-
-    found_patterns = 0
-    for pattern in tqdm(patterns):
-        trie = {}
-        renew_trie(trie, towels)
-        current = trie
-
-        found_pattern = True
-        for char in pattern:
-            if "*" in current:
-                renew_trie(current, towels)
-            if char in current:
-                current = current[char]
-            else:
-                found_pattern = False
-                break
-
-        if "*" in current and found_pattern:
-            found_patterns += 1
-
-    return found_patterns
-
-
-@cache
-def count_patterns(pattern, towels) -> int:
-    if pattern == "":
-        return 1
-    count = 0
-    for towel in towels:
-        if pattern.startswith(towel):
-            count += count_patterns(pattern[len(towel) :], towels)
-
-    return count
+    return mapreduce.map_reduce(
+        partial(is_possible, towels=towels), patterns, cost=len, label="patterns"
+    )
 
 
 def part_two(towels, patterns) -> int:
-    count = 0
-    for pattern in tqdm(patterns):
-        count += count_patterns(pattern, towels)
-
-    return count
+    return mapreduce.map_reduce(
+        partial(count_patterns, towels=towels),
+        patterns,
+        cost=len,
+        label="patterns",
+    )
 
 
 def main():
     towels, patterns = read_towels_and_patterns()
-    towels = tuple(towels)
     print(part_one(towels, patterns))
     print(part_two(towels, patterns))
 
@@ -1,59 +1,41 @@
 # https://adventofcode.com/2024/day/20
 
+from array import array
+from functools import partial
 from pathlib import Path
 from itertools import combinations
-from collections import Counter
-from dataclasses import dataclass
 
+from aoc import mapreduce, shared
+from aoc.grid import Grid
+from aoc.inputs import Source, read_lines
+from aoc.shared import SharedArray
 
-@dataclass(frozen=True)
-class Position:
-    x: int
-    y: int
+TRACK = frozenset(b".SE")
+VISITED = ord("~")
 
+MIN_CHEAT = 100
+MAX_CHEAT = 20
+# Cells of the track whose cheats are counted together, decoding the shared
+# track once for all of them
+CHEAT_STARTS = 64
 
-def read_maze():
-    with open(Path(__file__).parent / "key.txt") as f:
-        maze = [[*line] for line in f.read().strip().split("\n")]
 
-    return maze
+def read_maze(source: Source = Path(__file__).parent / "key.txt") -> Grid:
+    return Grid.from_lines(read_lines(source), border="#")
 
 
-def find_neighbors(position: Position, maze):
-    N = len(maze)
-    LL = len(maze[0])
+def find_neighbors(position: int, maze: Grid) -> list[int]:
+    return [
+        position + step
+        for step in maze.neighbors
+        if maze.cells[position + step] in TRACK
+    ]
 
-    neighbors = []
-    if position.x > 0 and maze[position.y][position.x - 1] in [".", "S", "E"]:
-        neighbors.append(Position(position.x - 1, position.y))
-    if position.x < LL - 1 and maze[position.y][position.x + 1] in [".", "S", "E"]:
-        neighbors.append(Position(position.x + 1, position.y))
-    if position.y > 0 and maze[position.y - 1][position.x] in [".", "S", "E"]:
-        neighbors.append(Position(position.x, position.y - 1))
-    if position.y < N - 1 and maze[position.y + 1][position.x] in [".", "S", "E"]:
-        neighbors.append(Position(position.x, position.y + 1))
 
-    return neighbors
-
-
-def part_one(maze) -> int:
-    N = len(maze)
-    LL = len(maze[0])
-
-    start = Position(0, 0)
-    end = Position(0, 0)
-    neighbors = {}
-    for y in range(N):
-        for x in range(LL):
-            match maze[y][x]:
-                case "#":
-                    neighbors[Position(x, y)] = find_neighbors(Position(x, y), maze)
-
-                case "S":
-                    start = Position(x, y)
-
-                case "E":
-                    end = Position(x, y)
+def part_one(maze: Grid) -> int:
+    start = maze.find("S")
+    end = maze.find("E")
+    neighbors = {wall: find_neighbors(wall, maze) for wall in maze.find_all("#")}
 
     positions = {}
     idx = 0
@@ -61,7 +43,7 @@ def part_one(maze) -> int:
     while current != end:
         positions[current] = idx
         idx += 1
-        maze[current.y][current.x] = "~"
+        maze.cells[current] = VISITED
         current = find_neighbors(current, maze)[0]
 
     positions[end] = idx
@@ -86,41 +68,44 @@ def part_one(maze) -> int:
     return total
 
 
-def part_two(maze) -> int:
-    N = len(maze)
-    LL = len(maze[0])
-    MIN_CHEAT = 100
+def count_cheats(shared_track: SharedArray, first: int) -> int:
+    # Cheats from the cells of the track from first on to any cell further along
+    track = shared_track.attach()
+    positions = list(zip(track[0::2].tolist(), track[1::2].tolist()))
 
-    start = Position(0, 0)
-    end = Position(0, 0)
-    for y in range(N):
-        for x in range(LL):
-            match maze[y][x]:
-                case "S":
-                    start = Position(x, y)
+    n_cheats = 0
+    for i in range(first, min(first + CHEAT_STARTS, len(positions))):
+        x, y = positions[i]
+        for j, (x2, y2) in enumerate(positions[i + MIN_CHEAT :], i + MIN_CHEAT):
+            delta = abs(x - x2) + abs(y - y2)
+            shortcut_size = j - i - delta
+            if delta <= MAX_CHEAT and shortcut_size >= MIN_CHEAT:
+                n_cheats += 1
 
-                case "E":
-                    end = Position(x, y)
+    return n_cheats
 
-    positions = []
+
+def part_two(maze: Grid) -> int:
+    start = maze.find("S")
+    end = maze.find("E")
+
+    # The x and y of every cell in the order they are raced through
+    track = array("q")
     current = start
     while current != end:
-        positions.append(current)
-        maze[current.y][current.x] = "~"
+        track.extend(maze.position(current))
+        maze.cells[current] = VISITED
         current = find_neighbors(current, maze)[0]
 
-    positions.append(end)
-
-    shortcuts = []
-
-    for i, pos in enumerate(positions):
-        for j, pos2 in enumerate(positions[i + MIN_CHEAT :], i + MIN_CHEAT):
-            delta = abs(pos.x - pos2.x) + abs(pos.y - pos2.y)
-            shortcut_size = j - i - delta
-            if delta <= 20 and shortcut_size >= MIN_CHEAT:
-                shortcuts.append(shortcut_size)
+    track.extend(maze.position(end))
 
-    return len(shortcuts)
+    length = len(track) // 2
+    with shared.share_array(track) as shared_track:
+        return mapreduce.map_reduce(
+            partial(count_cheats, shared_track),
+            range(0, length, CHEAT_STARTS),
+            cost=lambda first: length - first,
+        )
 
 
 def main():
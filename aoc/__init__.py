@@ -0,0 +1 @@
+# Shared tooling for running, timing and inspecting the daily solutions
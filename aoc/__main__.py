@@ -0,0 +1,643 @@
+# Usage, from the repository root:
+#
+#   python -m aoc run               every day, one JSON report per line
+#   python -m aoc run 2024 2023/12  only the selected years / days
+#   python -m aoc run --jobs 0      over a process pool, one worker per core
+#   python -m aoc run --no-cache    solve again instead of using stored answers
+#   python -m aoc run --parse-cache  load parsed inputs stored by earlier runs
+#   python -m aoc run 2024/6 --profile  cProfile every phase into aoc/profiles
+#   python -m aoc run 2024/6 --sample   sampled, flamegraph-ready stacks instead
+#   python -m aoc run 2024/9 --memory   peak memory and top allocating lines
+#   python -m aoc run --metrics     solver work counters, also as Prometheus text
+#   python -m aoc run --trace       nested spans for chrome://tracing or Perfetto
+#   python -m aoc run --progress    progress of long loops in the JSON reports
+#   python -m aoc run 2024/7 --workers 0  records split over a process pool,
+#                                   with the speedup in the JSON reports
+#   python -m aoc run 2024/11 --memo-disk  memo cache statistics, pure caches
+#                                   kept in aoc/memo for the next run
+#   python -m aoc run 2024/16 --render  pictures days draw of their state, on
+#                                   stderr, see aoc/render.py
+#   python -m aoc importtime        import time of every day, against a budget
+#   python -m aoc bench             repeated timings checked against baselines
+#   python -m aoc generate 2024/15 --scale 4 --preset pyramids -o big.txt
+#   python -m aoc run 2024/15 --input big.txt
+#   python -m aoc complexity 2023/11  scaling exponent of every phase
+#   python -m aoc batch 2024/1 inputs/ -j 0  every file in inputs/, inputs/sec
+#   python -m aoc stream 2023/7 < huge.txt  line by line in bounded memory,
+#                                   sorts spill to disk, see aoc/streaming.py
+#
+# AOC_PROGRESS=tqdm draws progress bars instead of --progress, tqdm has to be
+# installed. AOC_WORKERS=0 splits records like --workers when running a day on
+# its own, AOC_MEMO=disk keeps pure memo caches like --memo-disk, and
+# AOC_RENDER=1 draws pictures like --render
+#
+# Days read their input through aoc.inputs, so a single day is run the same way:
+#
+#   python -m 2024.dec05.main
+
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import ExitStack, redirect_stdout
+from pathlib import Path
+from typing import Iterator
+
+from aoc import streaming
+from aoc.batch import find_inputs, run_batch, summarize_batch
+from aoc.bench import (
+    BASELINES_PATH,
+    benchmark_solver,
+    find_regressions,
+    load_baselines,
+    save_baselines,
+)
+from aoc.cache import DEFAULT_MAX_BYTES, AnswerCache, ParseCache
+from aoc.complexity import DEFAULT_SCALES, describe_fit, measure_scaling
+from aoc.days import PART_NAMES, discover_days, load_solver, select_days
+from aoc.generators import GENERATORS, PRESETS, generate
+from aoc.mapreduce import MapReduceRecorder
+from aoc.memo import MemoRecorder
+from aoc.memory import MemoryTracer
+from aoc.metrics import METRICS_PATH, MetricsCollector, write_prometheus
+from aoc.parallel import load_timings, run_parallel, save_timings
+from aoc.profiling import PROFILES_PATH, Profiler
+from aoc.probes import Probe
+from aoc.progress import ProgressRecorder
+from aoc.render import RenderRecorder
+from aoc.runner import run_day
+from aoc.sampling import DEFAULT_RATE, SAMPLES_PATH, Sampler
+from aoc.startup import BUDGETS, DEFAULT_BUDGET, fastest_imports
+from aoc.tracing import TRACE_PATH, TraceRecorder, write_trace
+
+
+def print_report(report: dict) -> None:
+    print(json.dumps(report, default=str), flush=True)
+
+
+def command_run(args: argparse.Namespace) -> int:
+    days = select_days(discover_days(), args.days)
+    if args.input is not None and len(days) != 1:
+        print("--input needs exactly one day", file=sys.stderr)
+        return 1
+
+    probes: list[Probe] = []
+    if args.profile is not None:
+        probes.append(Profiler(args.profile, args.profile_top))
+    if args.sample is not None:
+        probes.append(Sampler(args.sample, args.sample_rate))
+    if args.memory:
+        probes.append(MemoryTracer(args.memory_top))
+    if args.metrics is not None:
+        probes.append(MetricsCollector())
+    if args.trace is not None:
+        probes.append(TraceRecorder())
+    if args.progress:
+        probes.append(ProgressRecorder(args.progress_interval))
+    if args.workers is not None:
+        probes.append(MapReduceRecorder(args.workers))
+    if args.memo or args.memo_disk:
+        probes.append(MemoRecorder(persist=args.memo_disk))
+    if args.render:
+        probes.append(RenderRecorder())
+
+    # Recorded timings and profiles must come from actually solving
+    cache = None
+    if not args.no_cache and not args.record_timings and not probes:
+        cache = AnswerCache(max_bytes=int(args.cache_size * 1024 * 1024))
+    parse_cache = ParseCache() if args.parse_cache else None
+
+    if args.jobs == 1:
+        reports = []
+        for day in days:
+            reports.append(
+                run_day(day, args.parts, args.input, cache, parse_cache, probes)
+            )
+            print_report(reports[-1])
+    else:
+        timings = load_timings()
+        reports, summary, measured = run_parallel(
+            days,
+            args.parts or list(PART_NAMES),
+            args.jobs or os.cpu_count() or 1,
+            timings,
+            args.input,
+            cache,
+            parse_cache,
+            probes,
+        )
+        for report in reports:
+            print_report(report)
+        print_report({"summary": summary})
+
+        if args.record_timings:
+            save_timings({**timings, **measured})
+
+    if args.metrics is not None:
+        write_prometheus(reports, args.metrics)
+    if args.trace is not None:
+        write_trace(reports, args.trace)
+
+    if parse_cache is not None:
+        loaded = [
+            report["parse"]
+            for report in reports
+            if "saved_seconds" in report.get("parse", {})
+        ]
+        print(
+            f"Parse cache: {len(loaded)} of {len(reports)} days loaded, "
+            f"{sum(parse['saved_seconds'] for parse in loaded):.3f}s saved",
+            file=sys.stderr,
+        )
+
+    failed = any(
+        "error" in report
+        or any("error" in part for part in report.get("parts", {}).values())
+        for report in reports
+    )
+    return 1 if failed else 0
+
+
+def command_bench(args: argparse.Namespace) -> int:
+    baselines = load_baselines(args.baselines)
+
+    measured = {}
+    regressions = []
+    for day in select_days(discover_days(), args.days):
+        try:
+            solver = load_solver(day)
+        except Exception as error:
+            print(f"{day.name}: skipped, {error}", file=sys.stderr)
+            continue
+
+        measurements = benchmark_solver(solver, args.repeat)
+        day_regressions = find_regressions(
+            measurements, baselines, args.threshold / 100, args.noise_floor
+        )
+        regressions += day_regressions
+
+        print_report(
+            {
+                "year": day.year,
+                "day": day.day,
+                "phases": {
+                    key.split(":")[1]: {
+                        **measurement._asdict(),
+                        "baseline": baselines.get(key),
+                    }
+                    for key, measurement in measurements.items()
+                },
+                "regressions": [regression.key for regression in day_regressions],
+            }
+        )
+        measured.update(
+            {key: measurement.best for key, measurement in measurements.items()}
+        )
+
+    for regression in regressions:
+        print(
+            f"{regression.key} regressed {regression.slowdown:.0%}: "
+            f"{regression.baseline:.6f}s -> {regression.measured:.6f}s",
+            file=sys.stderr,
+        )
+
+    if args.update:
+        save_baselines({**baselines, **measured}, args.baselines)
+        return 0
+
+    return 1 if regressions else 0
+
+
+def command_complexity(args: argparse.Namespace) -> int:
+    over_budget = False
+    for day in select_days(discover_days(), args.days):
+        try:
+            solver = load_solver(day)
+        except Exception as error:
+            print(f"{day.name}: skipped, {error}", file=sys.stderr)
+            continue
+
+        fits = measure_scaling(solver, args.scales, args.repeat, args.max_seconds)
+        print_report(
+            {
+                "year": day.year,
+                "day": day.day,
+                "phases": {fit.key.split(":")[1]: describe_fit(fit) for fit in fits},
+            }
+        )
+
+        for fit in fits:
+            if fit.over_budget:
+                over_budget = True
+                print(
+                    f"{fit.key} scales as n^{fit.exponent:.2f}, "
+                    f"over its budget of n^{fit.budget:.2f}",
+                    file=sys.stderr,
+                )
+
+    return 1 if over_budget else 0
+
+
+def command_importtime(args: argparse.Namespace) -> int:
+    over_budget = False
+    for day in select_days(discover_days(), args.days):
+        try:
+            import_time = fastest_imports(day, args.repeat)
+        except ImportError as error:
+            print(f"{day.name}: skipped, {error}", file=sys.stderr)
+            continue
+
+        budget = BUDGETS.get(day.name, DEFAULT_BUDGET)
+        if args.budget is not None:
+            budget = args.budget / 1000
+        print_report(
+            {
+                "year": day.year,
+                "day": day.day,
+                "seconds": import_time.seconds,
+                "budget": budget,
+                "slowest": [
+                    module._asdict() for module in import_time.imports[: args.top]
+                ],
+            }
+        )
+
+        if import_time.seconds > budget:
+            over_budget = True
+            slowest = ", ".join(
+                f"{module.module} {module.own_seconds * 1000:.1f}ms"
+                for module in import_time.imports[:3]
+            )
+            print(
+                f"{day.name} takes {import_time.seconds * 1000:.1f}ms to import, "
+                f"over its budget of {budget * 1000:.0f}ms. Slowest: {slowest}",
+                file=sys.stderr,
+            )
+
+    return 1 if over_budget else 0
+
+
+def command_batch(args: argparse.Namespace) -> int:
+    days = select_days(discover_days(), [args.day])
+    if len(days) != 1:
+        print(f"{args.day} does not select exactly one day", file=sys.stderr)
+        return 1
+    paths = find_inputs(args.directory, args.pattern)
+    if not paths:
+        print(f"No {args.pattern} inputs in {args.directory}", file=sys.stderr)
+        return 1
+
+    cache = None if args.no_cache else AnswerCache()
+    workers = args.jobs or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    results = []
+    for result in run_batch(days[0], paths, args.parts, workers, cache):
+        results.append(result)
+        print_report({"input": str(result.path), **result.report})
+    summary = summarize_batch(results, time.perf_counter() - start, workers)
+    print_report({"summary": summary})
+
+    print(
+        f"{summary['inputs']} inputs in {summary['wall_seconds']:.3f}s, "
+        f"{summary['inputs_per_second']:.1f} inputs/sec",
+        file=sys.stderr,
+    )
+    return 1 if summary["failed"] else 0
+
+
+def command_stream(args: argparse.Namespace) -> int:
+    days = select_days(discover_days(), [args.day])
+    if len(days) != 1:
+        print(f"{args.day} does not select exactly one day", file=sys.stderr)
+        return 1
+    day = days[0]
+    solver = load_solver(day)
+    if not hasattr(solver.module, "stream"):
+        print(f"{day.name} can't be solved from a stream", file=sys.stderr)
+        return 1
+
+    streaming.RUN_SIZE = args.run_size
+    streaming.SPILL_DIRECTORY = args.spill_directory
+
+    n_lines = 0
+
+    def counted(lines: Iterator[str]) -> Iterator[str]:
+        nonlocal n_lines
+        for line in lines:
+            n_lines += 1
+            yield line
+
+    start = time.perf_counter()
+    with ExitStack() as stack:
+        file = None
+        if args.input is not None:
+            file = stack.enter_context(open(args.input, "rb"))
+        stack.enter_context(redirect_stdout(sys.stderr))
+        answers = solver.module.stream(counted(streaming.read_stream(file)))
+    seconds = time.perf_counter() - start
+
+    print_report(
+        {
+            "year": day.year,
+            "day": day.day,
+            "lines": n_lines,
+            "seconds": seconds,
+            "lines_per_second": n_lines / seconds if seconds else 0.0,
+            "parts": {part: {"answer": answer} for part, answer in answers.items()},
+        }
+    )
+    return 0
+
+
+def command_generate(args: argparse.Namespace) -> int:
+    year, _, number = args.day.partition("/")
+    key = (int(year), int(number))
+    if key not in GENERATORS:
+        print(f"No generator for {args.day}", file=sys.stderr)
+        return 1
+    if args.preset is not None and args.preset not in PRESETS.get(key, {}):
+        presets = ", ".join(PRESETS.get(key, {})) or "none"
+        print(f"Unknown preset {args.preset}, available: {presets}", file=sys.stderr)
+        return 1
+
+    text = generate(*key, scale=args.scale, seed=args.seed, preset=args.preset)
+    if args.output is None:
+        sys.stdout.write(text)
+    else:
+        args.output.write_text(text)
+
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="aoc")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run and time every selected day")
+    run.add_argument("days", nargs="*", help="years or days, e.g. 2024 or 2024/6")
+    run.add_argument(
+        "--parts",
+        nargs="+",
+        choices=["part_one", "part_two"],
+        help="only run these parts",
+    )
+    run.add_argument(
+        "--input", type=Path, help="solve this file instead of the day's key.txt"
+    )
+    run.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes, 0 for one per core (default: 1, run serially)",
+    )
+    run.add_argument(
+        "--record-timings",
+        action="store_true",
+        help="store the measured job durations used to schedule slow jobs first",
+    )
+    run.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="solve every part, ignoring and not storing cached answers",
+    )
+    run.add_argument(
+        "--cache-size",
+        type=float,
+        default=DEFAULT_MAX_BYTES / 1024 / 1024,
+        help="cached answers kept, in MiB, least recently used go first "
+        "(default: %(default)g)",
+    )
+    run.add_argument(
+        "--parse-cache",
+        action="store_true",
+        help="store parsed inputs and load them back instead of parsing again",
+    )
+    run.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=PROFILES_PATH,
+        metavar="DIRECTORY",
+        help="cProfile every phase and save a .pstats file per phase "
+        "(default directory: aoc/profiles)",
+    )
+    run.add_argument(
+        "--profile-top",
+        type=int,
+        default=15,
+        help="functions listed per profile, by cumulative time (default: 15)",
+    )
+    run.add_argument(
+        "--sample",
+        type=Path,
+        nargs="?",
+        const=SAMPLES_PATH,
+        metavar="DIRECTORY",
+        help="sample every phase's stack and save collapsed stacks per phase "
+        "(default directory: aoc/samples)",
+    )
+    run.add_argument(
+        "--sample-rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help="samples per second (default: %(default)g)",
+    )
+    run.add_argument(
+        "--memory",
+        action="store_true",
+        help="trace allocations, reporting every phase's peak and top lines",
+    )
+    run.add_argument(
+        "--memory-top",
+        type=int,
+        default=10,
+        help="allocating lines listed per phase (default: 10)",
+    )
+    run.add_argument(
+        "--metrics",
+        type=Path,
+        nargs="?",
+        const=METRICS_PATH,
+        metavar="FILE",
+        help="count solver work per phase, also written in Prometheus text format "
+        "(default file: aoc/metrics.prom)",
+    )
+    run.add_argument(
+        "--trace",
+        type=Path,
+        nargs="?",
+        const=TRACE_PATH,
+        metavar="FILE",
+        help="record every phase and solver step as a Chrome trace-event file "
+        "(default file: aoc/trace.json)",
+    )
+    run.add_argument(
+        "--progress",
+        action="store_true",
+        help="record the progress of long loops in every phase's report",
+    )
+    run.add_argument(
+        "--progress-interval",
+        type=float,
+        default=0.5,
+        help="seconds between progress events of a loop (default: 0.5)",
+    )
+    run.add_argument(
+        "--workers",
+        type=int,
+        help="split parts made of independent records over this many processes, "
+        "0 for one per core, and report their speedup",
+    )
+    run.add_argument(
+        "--memo",
+        action="store_true",
+        help="record hits, misses and sizes of the memo caches every phase used",
+    )
+    run.add_argument(
+        "--memo-disk",
+        action="store_true",
+        help="like --memo, and keep pure memo caches in aoc/memo between runs",
+    )
+    run.add_argument(
+        "--render",
+        action="store_true",
+        help="draw the pictures days make of their state to stderr, after every "
+        "phase, and count them in its report",
+    )
+    run.set_defaults(handler=command_run)
+
+    bench = commands.add_parser("bench", help="benchmark against stored baselines")
+    bench.add_argument("days", nargs="*", help="years or days, e.g. 2024 or 2024/6")
+    bench.add_argument("--repeat", type=int, default=5, help="runs per phase")
+    bench.add_argument(
+        "--threshold",
+        type=float,
+        default=20,
+        help="allowed slowdown over the baseline, in percent (default: 20)",
+    )
+    bench.add_argument(
+        "--noise-floor",
+        type=float,
+        default=1e-3,
+        help="slowdowns under this many seconds are ignored (default: 0.001)",
+    )
+    bench.add_argument("--baselines", type=Path, default=BASELINES_PATH)
+    bench.add_argument(
+        "--update", action="store_true", help="store the results as the new baselines"
+    )
+    bench.set_defaults(handler=command_bench)
+
+    complexity = commands.add_parser(
+        "complexity", help="fit how each phase scales with its input size"
+    )
+    complexity.add_argument(
+        "days", nargs="*", help="years or days, e.g. 2024 or 2024/6"
+    )
+    complexity.add_argument(
+        "--scales",
+        type=float,
+        nargs="+",
+        default=list(DEFAULT_SCALES),
+        help="input sizes to measure, relative to key.txt",
+    )
+    complexity.add_argument("--repeat", type=int, default=3, help="runs per size")
+    complexity.add_argument(
+        "--max-seconds",
+        type=float,
+        default=10,
+        help="stop growing a phase's input once it takes longer than this",
+    )
+    complexity.set_defaults(handler=command_complexity)
+
+    importtime = commands.add_parser(
+        "importtime", help="check how long every day module takes to import"
+    )
+    importtime.add_argument(
+        "days", nargs="*", help="years or days, e.g. 2024 or 2024/6"
+    )
+    importtime.add_argument(
+        "--budget",
+        type=float,
+        help=f"allowed import time in milliseconds "
+        f"(default: {DEFAULT_BUDGET * 1000:.0f}, unless the day has its own)",
+    )
+    importtime.add_argument(
+        "--repeat", type=int, default=3, help="imports per day, the fastest counts"
+    )
+    importtime.add_argument(
+        "--top", type=int, default=5, help="slowest imports listed per day"
+    )
+    importtime.set_defaults(handler=command_importtime)
+
+    batch = commands.add_parser(
+        "batch", help="solve one day for every input file in a directory"
+    )
+    batch.add_argument("day", help="the day to solve, e.g. 2024/15")
+    batch.add_argument("directory", type=Path, help="directory holding the inputs")
+    batch.add_argument(
+        "--pattern", default="*.txt", help="input file names (default: %(default)s)"
+    )
+    batch.add_argument(
+        "--parts",
+        nargs="+",
+        choices=["part_one", "part_two"],
+        help="only run these parts",
+    )
+    batch.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        help="worker processes (default: 0, one per core)",
+    )
+    batch.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="solve every input, ignoring and not storing cached answers",
+    )
+    batch.set_defaults(handler=command_batch)
+
+    stream = commands.add_parser(
+        "stream", help="solve a line-oriented day from stdin in bounded memory"
+    )
+    stream.add_argument("day", help="the day to solve, e.g. 2023/7")
+    stream.add_argument(
+        "input", type=Path, nargs="?", help="read this file instead of stdin"
+    )
+    stream.add_argument(
+        "--run-size",
+        type=int,
+        default=streaming.RUN_SIZE,
+        help="items sorted in memory before a run spills to disk "
+        "(default: %(default)d)",
+    )
+    stream.add_argument(
+        "--spill-directory",
+        type=Path,
+        help="where spilled runs go (default: the system's temporary directory)",
+    )
+    stream.set_defaults(handler=command_stream)
+
+    generate = commands.add_parser("generate", help="write a synthetic input")
+    generate.add_argument("day", help="the day to generate for, e.g. 2024/15")
+    generate.add_argument(
+        "--scale", type=float, default=1, help="input size relative to key.txt"
+    )
+    generate.add_argument("--seed", type=int, default=0)
+    generate.add_argument("--preset", help="a worst-case input instead")
+    generate.add_argument("-o", "--output", type=Path)
+    generate.set_defaults(handler=command_generate)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
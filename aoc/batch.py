@@ -0,0 +1,76 @@
+# Solves one day for a whole directory of inputs over a process pool.
+#
+# Every worker imports the day once and then solves one file after the other,
+# so the cost of starting a process is shared by all the inputs it gets. The
+# summary gives the throughput of the whole batch, in inputs per second
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple
+
+from aoc.cache import AnswerCache
+from aoc.days import Day
+from aoc.runner import describe_error, run_day
+
+
+class BatchResult(NamedTuple):
+    path: Path
+    report: dict[str, Any]
+    pid: int
+    wall_seconds: float
+
+
+def find_inputs(directory: Path, pattern: str = "*.txt") -> list[Path]:
+    return sorted(path for path in directory.glob(pattern) if path.is_file())
+
+
+def solve_input(
+    day: Day,
+    path: Path,
+    parts: list[str] | None = None,
+    cache: AnswerCache | None = None,
+) -> BatchResult:
+    start = time.perf_counter()
+    try:
+        report = run_day(day, parts, path, cache)
+    except Exception as error:
+        # A malformed input fails while parsing, it must not end the batch
+        report = {"year": day.year, "day": day.day, "error": describe_error(error)}
+    return BatchResult(path, report, os.getpid(), time.perf_counter() - start)
+
+
+def run_batch(
+    day: Day,
+    paths: list[Path],
+    parts: list[str] | None,
+    workers: int,
+    cache: AnswerCache | None = None,
+) -> Iterator[BatchResult]:
+    # Results come back as soon as they are done, not in the order of paths
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(solve_input, day, path, parts, cache) for path in paths
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def summarize_batch(
+    results: list[BatchResult], wall_seconds: float, workers: int
+) -> dict[str, Any]:
+    failed = sum(
+        "error" in result.report
+        or any("error" in part for part in result.report["parts"].values())
+        for result in results
+    )
+    return {
+        "inputs": len(results),
+        "failed": failed,
+        "workers": workers,
+        "processes": len({result.pid for result in results}),
+        "wall_seconds": wall_seconds,
+        "serial_seconds": sum(result.wall_seconds for result in results),
+        "inputs_per_second": len(results) / wall_seconds if wall_seconds else 0.0,
+    }
@@ -0,0 +1,114 @@
+# Repeated timings of every phase, compared against stored baselines
+
+import copy
+import json
+import statistics
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, NamedTuple
+
+from aoc import render
+from aoc.days import Solver
+from aoc.runner import as_args, timed
+
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+
+
+class Measurement(NamedTuple):
+    best: float
+    median: float
+    runs: int
+
+
+class Regression(NamedTuple):
+    key: str
+    baseline: float
+    measured: float
+
+    @property
+    def slowdown(self) -> float:
+        return self.measured / self.baseline - 1
+
+
+def reset_caches(module: ModuleType) -> None:
+    # Memoized solvers would only be measured cold on the first run otherwise
+    for value in vars(module).values():
+        if callable(getattr(value, "cache_clear", None)):
+            value.cache_clear()
+
+
+def measure(
+    function: Callable[..., Any],
+    make_args: Callable[[], tuple],
+    module: ModuleType,
+    repeat: int,
+) -> Measurement:
+    samples = []
+    # Pictures a day draws when rendering is on would be timed with it
+    with render.paused():
+        for _ in range(repeat):
+            args = make_args()
+            reset_caches(module)
+            _, seconds = timed(function, *args)
+            samples.append(seconds)
+
+    return Measurement(min(samples), statistics.median(samples), repeat)
+
+
+def benchmark_solver(solver: Solver, repeat: int) -> dict[str, Measurement]:
+    with redirect_stdout(sys.stderr):
+        measurements = {"parse": measure(solver.parse, tuple, solver.module, repeat)}
+
+        parsed = solver.parse()
+        for part, function in solver.parts.items():
+            measurements[part] = measure(
+                function,
+                lambda: as_args(copy.deepcopy(parsed)),
+                solver.module,
+                repeat,
+            )
+
+    return {
+        f"{solver.day.name}:{phase}": measurement
+        for phase, measurement in measurements.items()
+    }
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> dict[str, float]:
+    if not path.exists():
+        return {}
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_baselines(baselines: dict[str, float], path: Path = BASELINES_PATH) -> None:
+    with open(path, "w") as file:
+        json.dump(dict(sorted(baselines.items())), file, indent=2)
+        file.write("\n")
+
+
+def find_regressions(
+    measurements: dict[str, Measurement],
+    baselines: dict[str, float],
+    threshold: float,
+    noise_floor: float,
+) -> list[Regression]:
+    # The best run is compared, it is the least sensitive to machine noise.
+    # Differences under the noise floor are never reported, since microsecond
+    # phases easily swing by more than any reasonable threshold
+    regressions = []
+    for key, measurement in measurements.items():
+        if key not in baselines:
+            continue
+
+        baseline = baselines[key]
+        if (
+            measurement.best > baseline * (1 + threshold)
+            and measurement.best - baseline > noise_floor
+        ):
+            regressions.append(Regression(key, baseline, measurement.best))
+
+    return regressions
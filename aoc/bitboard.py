@@ -0,0 +1,92 @@
+# Sets of grid cells as the bits of a Python int: bit i is cell i of an
+# aoc.grid.Grid.
+#
+# Union, intersection and difference are |, & and & ~ over whole sets at once,
+# counting is int.bit_count, all of it done in C a machine word at a time.
+# Moving every cell of a set one step is a single shift, because a step is an
+# index offset. Steps off the map land on the grid's border bits, which masks
+# of the map's cells never include:
+#
+#   board = BitGrid(grid)
+#   reachable = board.spread(reachable) & board.mask("9")
+#
+# Setting or testing a single bit costs as much as copying the whole int, so
+# per-cell work belongs in a set or a bytearray, not here
+
+from typing import Iterable
+
+from aoc.grid import Grid
+
+
+def bit(index: int) -> int:
+    return 1 << index
+
+
+def of(indices: Iterable[int]) -> int:
+    bits = 0
+    for index in indices:
+        bits |= 1 << index
+    return bits
+
+
+def count(bits: int) -> int:
+    return bits.bit_count()
+
+
+def first(bits: int) -> int:
+    # The lowest cell, -1 for an empty set
+    return (bits & -bits).bit_length() - 1
+
+
+def cells(bits: int) -> list[int]:
+    # bin() runs in C, searching its digits beats peeling off bits one at a time
+    digits = bin(bits)[:1:-1]
+    found = []
+    index = digits.find("1")
+    while index != -1:
+        found.append(index)
+        index = digits.find("1", index + 1)
+    return found
+
+
+class BitGrid:
+    def __init__(self, grid: Grid):
+        self.grid = grid
+        self.neighbors = grid.neighbors
+
+        # Symmetric, so it reads the same with the lowest bit first
+        blank = "0" * grid.stride * grid.padding
+        row = "0" * grid.padding + "1" * grid.width + "0" * grid.padding
+        self.inside = int(blank + row * grid.height + blank, 2)
+
+    def mask(self, chars: str) -> int:
+        # Every cell holding one of chars. The border is excluded, even when it
+        # is one of them
+        table = bytearray(b"0" * 256)
+        for char in chars:
+            table[ord(char)] = ord("1")
+        digits = self.grid.cells.translate(table)
+        return int(digits[::-1], 2) & self.inside
+
+    @staticmethod
+    def shift(bits: int, step: int) -> int:
+        # Every cell moved by step, the index offset of a neighbor
+        return bits << step if step >= 0 else bits >> -step
+
+    def spread(self, bits: int) -> int:
+        # The neighbours of every cell, which may include the border
+        up, right, down, left = self.neighbors
+        return bits >> -up | bits << right | bits << down | bits >> -left
+
+    def fill(self, bits: int, within: int) -> int:
+        # Everything connected to bits without leaving within, one ring of
+        # neighbours per round
+        while True:
+            grown = (bits | self.spread(bits)) & within
+            if grown == bits:
+                return bits
+            bits = grown
+
+    def edges(self, bits: int, step: int) -> int:
+        # The cells whose neighbour at step is not in the set
+        return bits & ~self.shift(bits, -step)
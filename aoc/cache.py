@@ -0,0 +1,185 @@
+# Results stored on disk, keyed by everything that can change them: the day,
+# the input bytes, the solver's source and the source of the aoc package, whose
+# grids, searches and caches solvers build on. Editing a solution, the package
+# or the input changes the key, so stale entries are never returned, they just
+# age out.
+#
+# Two caches share the layout: final answers, and parsed inputs for the parts
+# that still have to run
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from functools import cache
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from aoc.days import Solver
+
+CACHE_PATH = Path(__file__).parent / "answers"
+PARSED_PATH = Path(__file__).parent / "parsed"
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_PARSED_MAX_BYTES = 256 * 1024 * 1024
+# Bumped when the layout of the entries changes
+FORMAT_VERSION = 1
+
+
+class CachedAnswer(NamedTuple):
+    answer: Any
+    seconds: float
+
+
+class CachedParse(NamedTuple):
+    parsed: Any
+    seconds: float
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_fields(*fields: str) -> str:
+    return hashlib.sha256("\0".join(fields).encode()).hexdigest()
+
+
+@cache
+def hash_package() -> str:
+    # Every module, not just those a day imports: they import each other
+    package = Path(__file__).parent
+    return hash_fields(
+        *(f"{path.name}:{hash_file(path)}" for path in sorted(package.glob("*.py")))
+    )
+
+
+def fingerprint(solver: Solver, input_path: Path) -> str:
+    return hash_fields(
+        str(FORMAT_VERSION),
+        str(solver.day.year),
+        str(solver.day.day),
+        hash_file(input_path),
+        hash_file(Path(solver.module.__file__)),
+        hash_package(),
+    )
+
+
+class DiskCache:
+    suffix = ""
+
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+
+    def entry_path(self, key: str) -> Path:
+        return self.path / f"{key}{self.suffix}"
+
+    def read(self, key: str) -> bytes | None:
+        path = self.entry_path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+
+        # Eviction drops the least recently used entries, so a hit counts as a use
+        os.utime(path)
+        return data
+
+    def write(self, key: str, data: bytes) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Written aside and renamed into place, parallel workers may race on a key
+        handle, temporary = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(handle, "wb") as file:
+            file.write(data)
+        os.replace(temporary, self.entry_path(key))
+
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for path in self.path.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        for path in self.path.glob(f"*{self.suffix}"):
+            path.unlink(missing_ok=True)
+
+
+class AnswerCache(DiskCache):
+    suffix = ".json"
+
+    def __init__(self, path: Path = CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__(path, max_bytes)
+
+    def keys(self, fingerprint: str, parts: list[str]) -> dict[str, str]:
+        return {part: hash_fields(fingerprint, part) for part in parts}
+
+    def get(self, key: str) -> CachedAnswer | None:
+        data = self.read(key)
+        if data is None:
+            return None
+
+        try:
+            entry = json.loads(data)
+        except ValueError:
+            return None
+        return CachedAnswer(entry["answer"], entry["seconds"])
+
+    def put(self, key: str, answer: Any, seconds: float) -> None:
+        # Only answers that survive a JSON round trip unchanged are worth keeping
+        if not isinstance(answer, (int, str)) or isinstance(answer, bool):
+            return
+
+        self.write(key, json.dumps({"answer": answer, "seconds": seconds}).encode())
+
+
+class ParseCache(DiskCache):
+    suffix = ".pickle"
+
+    def __init__(
+        self, path: Path = PARSED_PATH, max_bytes: int = DEFAULT_PARSED_MAX_BYTES
+    ):
+        super().__init__(path, max_bytes)
+
+    def get(self, key: str) -> CachedParse | None:
+        data = self.read(key)
+        if data is None:
+            return None
+
+        try:
+            seconds, parsed = pickle.loads(data)
+        except Exception:
+            # Written by an older layout of the day's classes, or truncated
+            return None
+        return CachedParse(parsed, seconds)
+
+    def put(self, key: str, parsed: Any, seconds: float) -> None:
+        try:
+            data = pickle.dumps((seconds, parsed), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Not every parsed structure can be stored, those days just parse
+            return
+
+        # Rebuilding many small objects can cost more than parsing them did
+        start = time.perf_counter()
+        pickle.loads(data)
+        if time.perf_counter() - start >= seconds:
+            return
+
+        self.write(key, data)
@@ -0,0 +1,128 @@
+# Empirical scaling exponents: every phase timed on growing synthetic inputs,
+# with a least-squares line fitted through log(time) against log(input size)
+
+import copy
+import math
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from aoc.bench import measure
+from aoc.days import Solver
+from aoc.generators import generate
+from aoc.runner import as_args
+
+DEFAULT_SCALES = (0.125, 0.25, 0.5, 1.0)
+
+# Anything above linear, give or take measurement noise and n log n sorts, is
+# worth a look. Phases that can't do any better declare their own budget here,
+# keyed like "2023/dec11:part_one"
+DEFAULT_BUDGET = 1.3
+BUDGETS: dict[str, float] = {}
+
+# Below this, timer resolution and noise dominate the fit
+MIN_SECONDS = 1e-3
+
+
+class Point(NamedTuple):
+    size: int
+    seconds: float
+
+
+class Fit(NamedTuple):
+    key: str
+    points: list[Point]
+    exponent: float | None
+    budget: float
+
+    @property
+    def over_budget(self) -> bool:
+        return self.exponent is not None and self.exponent > self.budget
+
+
+def fit_exponent(points: list[Point]) -> float | None:
+    if len(points) < 2 or max(point.seconds for point in points) < MIN_SECONDS:
+        return None
+
+    xs = [math.log(point.size) for point in points]
+    ys = [math.log(max(point.seconds, 1e-9)) for point in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if variance == 0:
+        return None
+
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+
+def measure_scaling(
+    solver: Solver,
+    scales: list[float],
+    repeat: int,
+    max_seconds: float,
+    seed: int = 0,
+) -> list[Fit]:
+    day = solver.day
+    phases = ["parse", *solver.parts]
+    points: dict[str, list[Point]] = {phase: [] for phase in phases}
+    # A phase stops growing once it gets too slow, the larger inputs would
+    # only be slower still
+    stopped: set[str] = set()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in sorted(scales):
+            if len(stopped) == len(phases):
+                break
+
+            path = Path(directory) / f"scale-{scale}.txt"
+            path.write_text(generate(day.year, day.day, scale, seed))
+            size = path.stat().st_size
+
+            with redirect_stdout(sys.stderr):
+                if "parse" not in stopped:
+                    measurement = measure(
+                        solver.parse, lambda: (path,), solver.module, repeat
+                    )
+                    points["parse"].append(Point(size, measurement.best))
+
+                parsed = solver.parse(path)
+                for part, function in solver.parts.items():
+                    if part in stopped:
+                        continue
+                    measurement = measure(
+                        function,
+                        lambda: as_args(copy.deepcopy(parsed)),
+                        solver.module,
+                        repeat,
+                    )
+                    points[part].append(Point(size, measurement.best))
+
+            for phase in phases:
+                if points[phase] and points[phase][-1].seconds > max_seconds:
+                    stopped.add(phase)
+
+    fits = []
+    for phase in phases:
+        key = f"{day.name}:{phase}"
+        fits.append(
+            Fit(
+                key,
+                points[phase],
+                fit_exponent(points[phase]),
+                BUDGETS.get(key, DEFAULT_BUDGET),
+            )
+        )
+
+    return fits
+
+
+def describe_fit(fit: Fit) -> dict[str, Any]:
+    return {
+        "exponent": fit.exponent,
+        "budget": fit.budget if math.isfinite(fit.budget) else None,
+        "over_budget": fit.over_budget,
+        "points": [list(point) for point in fit.points],
+    }
@@ -0,0 +1,73 @@
+# Interned, immutable points on a plane.
+#
+# There is only ever one Point for a given x and y: building it again returns
+# the existing object. Walking the same cells over and over allocates nothing
+# after the first visit, and points compare and hash by identity, the fastest
+# there is. Every point also keeps its neighbours once they were asked for, so
+# a step is an attribute lookup. Points are never freed, which suits the
+# bounded maps of puzzles.
+#
+# Maps that fit in bytes are better served by aoc.grid, whose cells are plain
+# ints. Points are for everything else, like maps drawn with box characters
+
+from typing import Any, Iterator
+
+POINTS: dict[tuple[int, int], "Point"] = {}
+
+
+class Point:
+    __slots__ = ("x", "y", "_neighbors")
+
+    x: int
+    y: int
+    _neighbors: tuple["Point", "Point", "Point", "Point"] | None
+
+    def __new__(cls, x: int, y: int) -> "Point":
+        point = POINTS.get((x, y))
+        if point is None:
+            point = POINTS[x, y] = super().__new__(cls)
+            object.__setattr__(point, "x", x)
+            object.__setattr__(point, "y", y)
+            object.__setattr__(point, "_neighbors", None)
+        return point
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Points are immutable, build a new one instead")
+
+    @property
+    def neighbors(self) -> tuple["Point", "Point", "Point", "Point"]:
+        # Clockwise, starting from up, like aoc.grid
+        if self._neighbors is None:
+            x, y = self.x, self.y
+            neighbors = (
+                Point(x, y - 1),
+                Point(x + 1, y),
+                Point(x, y + 1),
+                Point(x - 1, y),
+            )
+            object.__setattr__(self, "_neighbors", neighbors)
+        return self._neighbors  # type: ignore[return-value]
+
+    def __add__(self, other: "Point") -> "Point":
+        return Point(self.x + other.x, self.y + other.y)
+
+    def __sub__(self, other: "Point") -> "Point":
+        return Point(self.x - other.x, self.y - other.y)
+
+    def __iter__(self) -> Iterator[int]:
+        yield self.x
+        yield self.y
+
+    def __repr__(self) -> str:
+        return f"Point({self.x}, {self.y})"
+
+    # Copies and unpickled points have to be the interned ones, or they would
+    # not be equal to anything
+    def __reduce__(self) -> tuple[type, tuple[int, int]]:
+        return Point, (self.x, self.y)
+
+    def __copy__(self) -> "Point":
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "Point":
+        return self
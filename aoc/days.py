@@ -0,0 +1,106 @@
+# Discovery and loading of the `YYYY/decDD/main.py` solutions
+
+import importlib
+import inspect
+import re
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, NamedTuple
+
+
+ROOT = Path(__file__).parent.parent
+
+PARSE_PREFIXES = ("read_", "load_", "get_", "decode_")
+PART_NAMES = {
+    "part_one": ("part_one", "part_1"),
+    "part_two": ("part_two", "part_2"),
+}
+
+
+class Day(NamedTuple):
+    year: int
+    day: int
+    path: Path
+
+    @property
+    def name(self) -> str:
+        return f"{self.year}/dec{self.day:02d}"
+
+    @property
+    def module_name(self) -> str:
+        return f"{self.year}.dec{self.day:02d}.main"
+
+    @property
+    def key_path(self) -> Path:
+        return self.path.parent / "key.txt"
+
+
+class Solver(NamedTuple):
+    day: Day
+    module: ModuleType
+    parse: Callable[..., Any]
+    parts: dict[str, Callable[..., Any]]
+
+
+def discover_days(root: Path = ROOT) -> list[Day]:
+    day_re = re.compile(r"^(\d{4})/dec(\d{2})/main\.py$")
+
+    days = []
+    for path in root.glob("*/dec*/main.py"):
+        match = day_re.match(path.relative_to(root).as_posix())
+        if match is None:
+            continue
+        days.append(Day(int(match.group(1)), int(match.group(2)), path))
+
+    return sorted(days)
+
+
+def select_days(days: list[Day], selectors: list[str]) -> list[Day]:
+    # Selectors look like "2024" or "2024/6"
+    if not selectors:
+        return days
+
+    selected = []
+    for day in days:
+        for selector in selectors:
+            year, _, number = selector.partition("/")
+            if int(year) == day.year and (not number or int(number) == day.day):
+                selected.append(day)
+                break
+
+    return selected
+
+
+def find_parse(module: ModuleType) -> Callable[..., Any]:
+    candidates = [
+        function
+        for name, function in inspect.getmembers(module, inspect.isfunction)
+        if name.startswith(PARSE_PREFIXES) and function.__module__ == module.__name__
+    ]
+    if not candidates:
+        raise LookupError(f"No parse function found in {module.__name__}")
+
+    return min(candidates, key=lambda function: function.__code__.co_firstlineno)
+
+
+def find_parts(module: ModuleType) -> dict[str, Callable[..., Any]]:
+    parts = {}
+    for part, names in PART_NAMES.items():
+        for name in names:
+            if hasattr(module, name):
+                parts[part] = getattr(module, name)
+                break
+
+    if not parts:
+        raise LookupError(f"No part functions found in {module.__name__}")
+
+    return parts
+
+
+def load_solver(day: Day) -> Solver:
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+
+    module = importlib.import_module(day.module_name)
+    return Solver(day, module, find_parse(module), find_parts(module))
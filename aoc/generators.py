@@ -0,0 +1,949 @@
+# Synthetic inputs for every day, at any scale and with a fixed seed
+#
+# The scale multiplies the size of the input roughly as it is measured in
+# records or bytes: line-based days get `scale` times more lines, grid days get
+# sides `sqrt(scale)` times longer. Scale 1 is about the size of `key.txt`.
+
+import itertools
+import math
+import random
+import string
+from typing import Callable
+
+Generator = Callable[[float, random.Random], str]
+
+GENERATORS: dict[tuple[int, int], Generator] = {}
+PRESETS: dict[tuple[int, int], dict[str, Generator]] = {}
+
+
+def generator(year: int, day: int):
+    def register(function: Generator) -> Generator:
+        GENERATORS[(year, day)] = function
+        return function
+
+    return register
+
+
+def preset(year: int, day: int, name: str):
+    def register(function: Generator) -> Generator:
+        PRESETS.setdefault((year, day), {})[name] = function
+        return function
+
+    return register
+
+
+def generate(
+    year: int, day: int, scale: float = 1, seed: int = 0, preset: str | None = None
+) -> str:
+    rng = random.Random(seed)
+    if preset is None:
+        return GENERATORS[(year, day)](scale, rng)
+
+    return PRESETS[(year, day)][preset](scale, rng)
+
+
+def count(base: int, scale: float) -> int:
+    return max(1, round(base * scale))
+
+
+def side(base: int, scale: float) -> int:
+    return max(4, round(base * math.sqrt(scale)))
+
+
+def render(grid: list[list[str]]) -> str:
+    return "\n".join("".join(line) for line in grid) + "\n"
+
+
+def tree_loop(width: int, height: int, rng: random.Random) -> list[tuple[int, int]]:
+    # A random spanning tree over a coarse grid, walked around on a doubled grid,
+    # is a closed loop visiting every fine cell. Spreading it out once more
+    # leaves a one cell gap between corridors, so cells of the loop are only
+    # ever adjacent to the cells right before and after them.
+    coarse_width, coarse_height = max(1, width // 4), max(1, height // 4)
+
+    tree = {(0, 0): set()}
+    stack = [(0, 0)]
+    while stack:
+        x, y = stack[-1]
+        options = [
+            (x + dx, y + dy)
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+            if 0 <= x + dx < coarse_width
+            and 0 <= y + dy < coarse_height
+            and (x + dx, y + dy) not in tree
+        ]
+        if not options:
+            stack.pop()
+            continue
+        child = rng.choice(options)
+        tree[child] = {(x, y)}
+        tree[(x, y)].add(child)
+        stack.append(child)
+
+    # Each coarse node is a 2x2 block, connected along its sides unless a tree
+    # edge leaves through that side, in which case it connects to the neighbor
+    links: dict[tuple[int, int], list[tuple[int, int]]] = {}
+
+    def link(a: tuple[int, int], b: tuple[int, int]) -> None:
+        links.setdefault(a, []).append(b)
+        links.setdefault(b, []).append(a)
+
+    for (x, y), children in tree.items():
+        fx, fy = 2 * x, 2 * y
+        if (x, y - 1) not in children:
+            link((fx, fy), (fx + 1, fy))
+        if (x, y + 1) not in children:
+            link((fx, fy + 1), (fx + 1, fy + 1))
+        else:
+            link((fx, fy + 1), (fx, fy + 2))
+            link((fx + 1, fy + 1), (fx + 1, fy + 2))
+        if (x - 1, y) not in children:
+            link((fx, fy), (fx, fy + 1))
+        if (x + 1, y) not in children:
+            link((fx + 1, fy), (fx + 1, fy + 1))
+        else:
+            link((fx + 1, fy), (fx + 2, fy))
+            link((fx + 1, fy + 1), (fx + 2, fy + 1))
+
+    loop = [(0, 0)]
+    previous = None
+    while True:
+        current = loop[-1]
+        following = [cell for cell in links[current] if cell != previous][0]
+        if following == loop[0]:
+            break
+        previous = current
+        loop.append(following)
+
+    spread = []
+    for (x1, y1), (x2, y2) in zip(loop, loop[1:] + loop[:1]):
+        spread.append((2 * x1 + 1, 2 * y1 + 1))
+        spread.append((x1 + x2 + 1, y1 + y2 + 1))
+
+    return spread
+
+
+def maze(width: int, height: int, rng: random.Random) -> list[list[str]]:
+    # Depth-first maze on odd coordinates, surrounded by walls
+    width, height = width | 1, height | 1
+    grid = [["#"] * width for _ in range(height)]
+    grid[1][1] = "."
+    stack = [(1, 1)]
+    while stack:
+        x, y = stack[-1]
+        options = [
+            (x + dx, y + dy)
+            for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+            if 0 < x + dx < width - 1
+            and 0 < y + dy < height - 1
+            and grid[y + dy][x + dx] == "#"
+        ]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny = rng.choice(options)
+        grid[(y + ny) // 2][(x + nx) // 2] = "."
+        grid[ny][nx] = "."
+        stack.append((nx, ny))
+
+    return grid
+
+
+# 2023
+
+
+@generator(2023, 1)
+def calibration_document(scale: float, rng: random.Random) -> str:
+    words = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+    lines = []
+    for _ in range(count(1000, scale)):
+        chunks = [str(rng.randint(1, 9))]
+        for _ in range(rng.randint(1, 6)):
+            chunks.append(
+                rng.choice(
+                    [
+                        str(rng.randint(1, 9)),
+                        rng.choice(words),
+                        "".join(
+                            rng.choices(string.ascii_lowercase, k=rng.randint(1, 5))
+                        ),
+                    ]
+                )
+            )
+        rng.shuffle(chunks)
+        lines.append("".join(chunks))
+
+    return "\n".join(lines) + "\n"
+
+
+@generator(2023, 2)
+def cube_games(scale: float, rng: random.Random) -> str:
+    lines = []
+    for game in range(1, count(100, scale) + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            draws.append(", ".join(f"{rng.randint(1, 20)} {color}" for color in colors))
+        lines.append(f"Game {game}: " + "; ".join(draws))
+
+    return "\n".join(lines) + "\n"
+
+
+@generator(2023, 3)
+def engine_schematic(scale: float, rng: random.Random) -> str:
+    size = side(140, scale)
+    grid = [["."] * size for _ in range(size)]
+    for y in range(size):
+        x = rng.randint(0, 3)
+        while x < size - 3:
+            if rng.random() < 0.5:
+                number = str(rng.randint(1, 999))
+                grid[y][x : x + len(number)] = number
+                x += len(number)
+            elif rng.random() < 0.2:
+                grid[y][x] = rng.choice("*#+$/@=%&-")
+                x += 1
+            x += rng.randint(1, 4)
+
+    return render(grid)
+
+
+@generator(2023, 4)
+def scratchcards(scale: float, rng: random.Random) -> str:
+    n_cards = count(200, scale)
+    lines = []
+    for card in range(1, n_cards + 1):
+        sampled = rng.sample(range(1, 100), 10)
+        # A card can't win copies of cards past the end of the table
+        n_common = rng.randint(0, min(10, n_cards - card))
+        mine = rng.sample(sampled, n_common)
+        mine += rng.sample(
+            [val for val in range(1, 100) if val not in sampled], 25 - n_common
+        )
+        rng.shuffle(mine)
+        lines.append(
+            f"Card {card:>3}: "
+            + " ".join(f"{val:>2}" for val in sampled)
+            + " | "
+            + " ".join(f"{val:>2}" for val in mine)
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+@generator(2023, 5)
+def almanac(scale: float, rng: random.Random) -> str:
+    limit = 2**32
+    seeds = []
+    for _ in range(count(10, scale)):
+        start = rng.randrange(limit // 2)
+        seeds += [start, rng.randrange(1, limit // 64)]
+
+    names = [
+        "seed",
+        "soil",
+        "fertilizer",
+        "water",
+        "light",
+        "temperature",
+        "humidity",
+        "location",
+    ]
+    blocks = ["seeds: " + " ".join(str(seed) for seed in seeds)]
+    for source, destination in zip(names[:-1], names[1:]):
+        # Source ranges never overlap within a map, destinations are shuffled
+        n_ranges = count(30, scale)
+        cuts = sorted(rng.sample(range(1, limit), 2 * n_ranges))
+        lengths = [end - start for start, end in zip(cuts[::2], cuts[1::2])]
+        destinations = sorted(rng.sample(range(1, limit), 2 * n_ranges))[::2]
+        rng.shuffle(destinations)
+        lines = [
+            f"{dest} {start} {min(length, limit - dest)}"
+            for dest, start, length in zip(destinations, cuts[::2], lengths)
+        ]
+        blocks.append(f"{source}-to-{destination} map:\n" + "\n".join(lines))
+
+    return "\n\n".join(blocks) + "\n"
+
+
+@generator(2023, 6)
+def boat_races(scale: float, rng: random.Random) -> str:
+    # Part two concatenates every number, so the race count has to stay small
+    # enough for the corrected race to fit in a float
+    races = []
+    for _ in range(min(count(4, scale), 40)):
+        time = rng.randint(7, 99)
+        races.append((time, rng.randint(0, time * time // 4 - 1)))
+
+    return (
+        "Time:      " + " ".join(f"{time:>4}" for time, _ in races) + "\n"
+        "Distance:  " + " ".join(f"{distance:>4}" for _, distance in races) + "\n"
+    )
+
+
+@generator(2023, 7)
+def camel_cards(scale: float, rng: random.Random) -> str:
+    lines = []
+    for _ in range(count(1000, scale)):
+        cards = "".join(rng.choices("AKQJT98765432", k=5))
+        lines.append(f"{cards} {rng.randint(1, 1000)}")
+
+    return "\n".join(lines) + "\n"
+
+
+@generator(2023, 8)
+def haunted_wasteland(scale: float, rng: random.Random) -> str:
+    # Every ghost walks a chain whose length is a multiple of the instruction
+    # count, ending on a Z node that loops back, which is what part two relies on.
+    # Node names only have three characters, which caps how far this scales
+    n_instructions = min(count(20, scale), 300)
+    cycles = [3, 5, 7, 11, 13, 17]
+    alphabet = string.digits + string.ascii_uppercase
+
+    names = [
+        a + b + c
+        for a in alphabet
+        for b in alphabet
+        for c in alphabet[:-1]
+        if c not in "AZ"
+    ]
+    rng.shuffle(names)
+
+    nodes = []
+    for ghost, n_cycles in enumerate(cycles):
+        if ghost == 0:
+            start, end = "AAA", "ZZZ"
+        else:
+            prefix = alphabet[ghost] + alphabet[ghost]
+            start, end = prefix + "A", prefix + "Z"
+
+        chain = [start] + [names.pop() for _ in range(n_cycles * n_instructions - 1)]
+        chain.append(end)
+        for node, following in zip(chain, chain[1:]):
+            nodes.append(f"{node} = ({following}, {following})")
+        nodes.append(f"{end} = ({chain[1]}, {chain[1]})")
+
+    rng.shuffle(nodes)
+    instructions = "".join(rng.choices("LR", k=n_instructions))
+    return instructions + "\n\n" + "\n".join(nodes) + "\n"
+
+
+@generator(2023, 9)
+def oasis_report(scale: float, rng: random.Random) -> str:
+    lines = []
+    for _ in range(count(200, scale)):
+        coefficients = [rng.randint(-9, 9) for _ in range(rng.randint(1, 6))]
+        values = [
+            sum(
+                coefficient * x**power for power, coefficient in enumerate(coefficients)
+            )
+            for x in range(21)
+        ]
+        lines.append(" ".join(str(val) for val in values))
+
+    return "\n".join(lines) + "\n"
+
+
+@preset(2023, 9, "noise")
+def oasis_noise(scale: float, rng: random.Random) -> str:
+    # Random sequences never settle into constant differences, so the
+    # extrapolation recurses once per element of each sequence
+    length = count(21, scale)
+    lines = []
+    for _ in range(200):
+        lines.append(" ".join(str(rng.randint(-9, 9)) for _ in range(length)))
+
+    return "\n".join(lines) + "\n"
+
+
+@generator(2023, 10)
+def pipe_maze(scale: float, rng: random.Random) -> str:
+    size = side(140, scale)
+    loop = tree_loop(size - 2, size - 2, rng)
+
+    grid = [["."] * size for _ in range(size)]
+    for (px, py), (x, y), (nx, ny) in zip(
+        loop[-1:] + loop[:-1], loop, loop[1:] + loop[:1]
+    ):
+        ends = {(px - x, py - y), (nx - x, ny - y)}
+        grid[y][x] = {
+            frozenset({(0, -1), (0, 1)}): "|",
+            frozenset({(-1, 0), (1, 0)}): "-",
+            frozenset({(0, -1), (1, 0)}): "L",
+            frozenset({(0, -1), (-1, 0)}): "J",
+            frozenset({(0, 1), (-1, 0)}): "7",
+            frozenset({(0, 1), (1, 0)}): "F",
+        }[frozenset(ends)]
+
+    start_x, start_y = rng.choice(loop)
+    grid[start_y][start_x] = "S"
+
+    # Junk pipes off the loop, but never next to the animal, where they would
+    # look like additional connections
+    on_loop = set(loop)
+    for y in range(1, size - 1):
+        for x in range(1, size - 1):
+            if (
+                (x, y) not in on_loop
+                and abs(x - start_x) + abs(y - start_y) > 1
+                and rng.random() < 0.3
+            ):
+                grid[y][x] = rng.choice("|-LJ7F")
+
+    return render(grid)
+
+
+@generator(2023, 11)
+def galaxy_image(scale: float, rng: random.Random) -> str:
+    size = side(140, scale)
+    empty_rows = set(rng.sample(range(size), size // 15))
+    empty_cols = set(rng.sample(range(size), size // 15))
+    grid = [
+        [
+            (
+                "#"
+                if y not in empty_rows and x not in empty_cols and rng.random() < 0.022
+                else "."
+            )
+            for x in range(size)
+        ]
+        for y in range(size)
+    ]
+
+    return render(grid)
+
+
+def damaged_record(length: int, unknown: float, rng: random.Random) -> str:
+    springs = [rng.choice("#.") for _ in range(length)]
+    if "#" not in springs:
+        springs[rng.randrange(length)] = "#"
+
+    key = [len(group) for group in "".join(springs).split(".") if group]
+    shown = "".join("?" if rng.random() < unknown else char for char in springs)
+    return f"{shown} {','.join(str(val) for val in key)}"
+
+
+@generator(2023, 12)
+def spring_records(scale: float, rng: random.Random) -> str:
+    lines = [
+        damaged_record(rng.randint(4, 20), 0.4, rng) for _ in range(count(1000, scale))
+    ]
+    return "\n".join(lines) + "\n"
+
+
+@preset(2023, 12, "all-unknown")
+def spring_records_unknown(scale: float, rng: random.Random) -> str:
+    # Every spring is a ?, the most arrangements a row of this length can have
+    lines = [damaged_record(20, 1, rng) for _ in range(count(1000, scale))]
+    return "\n".join(lines) + "\n"
+
+
+def mirrored_pattern(rng: random.Random) -> str:
+    # Columns mirror perfectly around a vertical line, and rows mirror around
+    # a horizontal line except for a single smudge. Odd sides ensure some
+    # column is outside the vertical reflection, where the smudge can go
+    # without breaking it.
+    width = rng.choice(range(5, 18, 2))
+    height = rng.choice(range(5, 18, 2))
+    vertical = rng.randrange(width - 1)
+    horizontal = rng.randrange(height - 1)
+
+    parents = {(x, y): (x, y) for x in range(width) for y in range(height)}
+
+    def find(cell):
+        while parents[cell] != cell:
+            cell = parents[cell]
+        return cell
+
+    for y in range(height):
+        for x in range(width):
+            mirror_x = 2 * vertical + 1 - x
+            if 0 <= mirror_x < width:
+                parents[find((x, y))] = find((mirror_x, y))
+            mirror_y = 2 * horizontal + 1 - y
+            if 0 <= mirror_y < height:
+                parents[find((x, y))] = find((x, mirror_y))
+
+    chars = {}
+    grid = [
+        [chars.setdefault(find((x, y)), rng.choice("#.")) for x in range(width)]
+        for y in range(height)
+    ]
+
+    reach = min(vertical + 1, width - vertical - 1)
+    smudge_x = rng.choice(
+        [x for x in range(width) if not vertical - reach < x <= vertical + reach]
+    )
+    smudge_y = rng.randint(
+        max(0, horizontal - min(horizontal + 1, height - horizontal - 1) + 1),
+        horizontal,
+    )
+    grid[smudge_y][smudge_x] = "#" if grid[smudge_y][smudge_x] == "." else "."
+
+    return "\n".join("".join(line) for line in grid)
+
+
+@generator(2023, 13)
+def mirror_valley(scale: float, rng: random.Random) -> str:
+    return "\n\n".join(mirrored_pattern(rng) for _ in range(count(100, scale))) + "\n"
+
+
+# 2024
+
+
+@generator(2024, 1)
+def location_lists(scale: float, rng: random.Random) -> str:
+    lines = [
+        f"{rng.randint(10000, 99999)}   {rng.randint(10000, 99999)}"
+        for _ in range(count(1000, scale))
+    ]
+    return "\n".join(lines) + "\n"
+
+
+@generator(2024, 2)
+def reactor_reports(scale: float, rng: random.Random) -> str:
+    lines = []
+    for _ in range(count(1000, scale)):
+        level = rng.randint(1, 90)
+        sign = rng.choice([-1, 1])
+        report = [level]
+        for _ in range(rng.randint(4, 7)):
+            report.append(report[-1] + sign * rng.choice([1, 2, 3, 3, 4, 0, -1]))
+        lines.append(" ".join(str(val) for val in report))
+
+    return "\n".join(lines) + "\n"
+
+
+@generator(2024, 3)
+def corrupted_memory(scale: float, rng: random.Random) -> str:
+    junk = "mul(,)don't()do%*&[]!@^ select where from who what how 1234567890"
+    chunks = []
+    length = 0
+    while length < count(19600, scale):
+        match rng.randrange(6):
+            case 0 | 1:
+                chunk = f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})"
+            case 2:
+                chunk = rng.choice(["do()", "don't()"])
+            case _:
+                chunk = "".join(rng.choices(junk, k=rng.randint(1, 12)))
+        chunks.append(chunk)
+        length += len(chunk)
+
+    text = "".join(chunks)
+    return "\n".join(text[i : i + 3000] for i in range(0, len(text), 3000)) + "\n"
+
+
+@generator(2024, 4)
+def word_search(scale: float, rng: random.Random) -> str:
+    size = side(140, scale)
+    grid = [rng.choices("XMAS", k=size) for _ in range(size)]
+    return render(grid)
+
+
+@generator(2024, 5)
+def print_queue(scale: float, rng: random.Random) -> str:
+    # The rules cover every pair of pages, so they define a total order
+    pages = rng.sample(range(10, 100), 49)
+    rules = [
+        f"{before}|{after}"
+        for i, before in enumerate(pages)
+        for after in pages[i + 1 :]
+    ]
+    rng.shuffle(rules)
+
+    manuals = []
+    for _ in range(count(200, scale)):
+        manual = rng.sample(pages, rng.choice(range(5, 24, 2)))
+        if rng.random() < 0.5:
+            manual.sort(key=pages.index)
+        manuals.append(",".join(str(page) for page in manual))
+
+    return "\n".join(rules) + "\n\n" + "\n".join(manuals) + "\n"
+
+
+@generator(2024, 6)
+def guard_lab(scale: float, rng: random.Random) -> str:
+    size = side(130, scale)
+    while True:
+        grid = [
+            ["#" if rng.random() < 0.045 else "." for _ in range(size)]
+            for _ in range(size)
+        ]
+        guard = (rng.randrange(size), rng.randrange(size))
+        grid[guard[1]][guard[0]] = "^"
+
+        # The guard has to walk out of the map, otherwise part one never ends,
+        # and a guard leaving straight away makes for a pointless input
+        (x, y), (dx, dy) = guard, (0, -1)
+        seen = set()
+        while 0 <= x < size and 0 <= y < size and (x, y, dx, dy) not in seen:
+            seen.add((x, y, dx, dy))
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < size and 0 <= ny < size and grid[ny][nx] == "#":
+                dx, dy = -dy, dx
+            else:
+                x, y = nx, ny
+        if not (0 <= x < size and 0 <= y < size) and len(seen) > size:
+            return render(grid)
+
+
+@generator(2024, 7)
+def bridge_calibrations(scale: float, rng: random.Random) -> str:
+    operators = [
+        lambda x, y: x + y,
+        lambda x, y: x * y,
+        lambda x, y: int(f"{x}{y}"),
+    ]
+    lines = []
+    for _ in range(count(850, scale)):
+        operands = [
+            rng.randint(1, 999 if i == 0 else 99) for i in range(rng.randint(2, 12))
+        ]
+        result = operands[0]
+        for operand in operands[1:]:
+            result = rng.choice(operators)(result, operand)
+        if rng.random() < 0.3:
+            result += rng.randint(1, 9)
+        lines.append(f"{result}: " + " ".join(str(val) for val in operands))
+
+    return "\n".join(lines) + "\n"
+
+
+@generator(2024, 8)
+def antenna_map(scale: float, rng: random.Random) -> str:
+    size = side(50, scale)
+    grid = [["."] * size for _ in range(size)]
+    frequencies = string.digits + string.ascii_letters
+    for _ in range(count(200, scale)):
+        x, y = rng.randrange(size), rng.randrange(size)
+        grid[y][x] = rng.choice(frequencies)
+
+    return render(grid)
+
+
+@generator(2024, 9)
+def disk_map(scale: float, rng: random.Random) -> str:
+    # Files alternate with free space, and the map starts and ends with a file
+    length = count(20000, scale) | 1
+    return (
+        "".join(
+            str(rng.randint(1, 9)) if i % 2 == 0 else str(rng.randint(0, 9))
+            for i in range(length)
+        )
+        + "\n"
+    )
+
+
+@generator(2024, 10)
+def topographic_map(scale: float, rng: random.Random) -> str:
+    size = side(55, scale)
+    grid = [[str(rng.randint(0, 9)) for _ in range(size)] for _ in range(size)]
+
+    # Random heights barely form trails, so some are planted as climbing walks
+    for _ in range(count(300, scale)):
+        x, y = rng.randrange(size), rng.randrange(size)
+        for height in range(10):
+            grid[y][x] = str(height)
+            dx, dy = rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1)])
+            x = min(max(x + dx, 0), size - 1)
+            y = min(max(y + dy, 0), size - 1)
+
+    return render(grid)
+
+
+@generator(2024, 11)
+def plutonian_stones(scale: float, rng: random.Random) -> str:
+    stones = [rng.choice([0, rng.randint(1, 9999999)]) for _ in range(count(8, scale))]
+    return " ".join(str(stone) for stone in stones) + "\n"
+
+
+@generator(2024, 12)
+def garden_plots(scale: float, rng: random.Random) -> str:
+    size = side(140, scale)
+    seeds = [
+        (rng.randrange(size), rng.randrange(size), rng.choice(string.ascii_uppercase))
+        for _ in range(count(600, scale))
+    ]
+
+    # Nearest seed wins, looked up in buckets so large maps stay cheap
+    bucket = max(1, size // int(math.sqrt(len(seeds)) + 1))
+    buckets: dict[tuple[int, int], list[tuple[int, int, str]]] = {}
+    for seed in seeds:
+        buckets.setdefault((seed[0] // bucket, seed[1] // bucket), []).append(seed)
+
+    grid = []
+    for y in range(size):
+        line = []
+        for x in range(size):
+            radius = 1
+            while True:
+                candidates = [
+                    seed
+                    for bx in range(x // bucket - radius, x // bucket + radius + 1)
+                    for by in range(y // bucket - radius, y // bucket + radius + 1)
+                    for seed in buckets.get((bx, by), [])
+                ]
+                if candidates:
+                    break
+                radius += 1
+            line.append(
+                min(
+                    candidates, key=lambda seed: (seed[0] - x) ** 2 + (seed[1] - y) ** 2
+                )[2]
+            )
+        grid.append(line)
+
+    return render(grid)
+
+
+@generator(2024, 13)
+def claw_machines(scale: float, rng: random.Random) -> str:
+    machines = []
+    for _ in range(count(320, scale)):
+        ax, ay, bx, by = (rng.randint(10, 99) for _ in range(4))
+        if rng.random() < 0.5:
+            a, b = rng.randint(0, 100), rng.randint(0, 100)
+            rx, ry = a * ax + b * bx, a * ay + b * by
+        else:
+            rx, ry = rng.randint(1000, 20000), rng.randint(1000, 20000)
+        machines.append(
+            f"Button A: X+{ax}, Y+{ay}\nButton B: X+{bx}, Y+{by}\nPrize: X={rx}, Y={ry}"
+        )
+
+    return "\n\n".join(machines) + "\n"
+
+
+@generator(2024, 14)
+def restroom_robots(scale: float, rng: random.Random) -> str:
+    # Most robots gather in a small picture after some number of seconds, which
+    # is what part two looks for. Their starting points are that picture run
+    # backwards in time.
+    width, height = 101, 103
+    picture_time = rng.randint(1000, 10000)
+    center_x, center_y = rng.randint(20, width - 20), rng.randint(20, height - 20)
+
+    lines = []
+    for _ in range(count(500, scale)):
+        vx, vy = rng.randint(-99, 99), rng.randint(-99, 99)
+        if rng.random() < 0.7:
+            x = center_x + rng.randint(-8, 8)
+            y = center_y + rng.randint(-8, 8)
+            px, py = (x - picture_time * vx) % width, (y - picture_time * vy) % height
+        else:
+            px, py = rng.randrange(width), rng.randrange(height)
+        lines.append(f"p={px},{py} v={vx},{vy}")
+
+    return "\n".join(lines) + "\n"
+
+
+def warehouse_instructions(
+    n_instructions: int, weights: list[int], rng: random.Random
+) -> str:
+    instructions = "".join(rng.choices("^v<>", weights=weights, k=n_instructions))
+    return "\n".join(
+        instructions[i : i + 1000] for i in range(0, len(instructions), 1000)
+    )
+
+
+@generator(2024, 15)
+def warehouse(scale: float, rng: random.Random) -> str:
+    size = side(50, scale)
+    grid = [["#"] * size for _ in range(size)]
+    for y in range(1, size - 1):
+        for x in range(1, size - 1):
+            grid[y][x] = rng.choices(".O#", weights=[60, 30, 10])[0]
+    grid[rng.randint(1, size - 2)][rng.randint(1, size - 2)] = "@"
+
+    return (
+        render(grid)
+        + "\n"
+        + warehouse_instructions(count(20000, scale), [1, 1, 1, 1], rng)
+        + "\n"
+    )
+
+
+@preset(2024, 15, "pyramids")
+def warehouse_pyramids(scale: float, rng: random.Random) -> str:
+    # Box pyramids right above the robot, pushed up over and over. On the wide
+    # map every box rests squarely on the one below, and checking whether a
+    # stack can move visits each box once from each of its halves, so the work
+    # per push doubles with every level of the pyramid.
+    size = side(50, scale)
+    height = min(size - 5, count(8, scale))
+    grid = [["#"] * size for _ in range(size)]
+    for y in range(1, size - 1):
+        grid[y][1 : size - 1] = "." * (size - 2)
+
+    for apex in range(4, size - 4, 8):
+        for level in range(height):
+            for x in range(apex - level // 2, apex + level // 2 + 1):
+                if 0 < x < size - 1:
+                    grid[2 + level][x] = "O"
+    grid[height + 3][4] = "@"
+
+    return (
+        render(grid)
+        + "\n"
+        + warehouse_instructions(count(20000, scale), [8, 1, 1, 1], rng)
+        + "\n"
+    )
+
+
+@generator(2024, 16)
+def reindeer_maze(scale: float, rng: random.Random) -> str:
+    size = side(141, scale)
+    grid = maze(size, size, rng)
+    size = len(grid)
+
+    # Knock down some walls so several paths can tie for the best score
+    for _ in range(size * size // 50):
+        x, y = rng.randint(1, size - 2), rng.randint(1, size - 2)
+        if (x + y) % 2 == 1:
+            grid[y][x] = "."
+
+    grid[size - 2][1] = "S"
+    grid[1][size - 2] = "E"
+    return render(grid)
+
+
+def printed_digit(register_a: int, first_xor: int, second_xor: int) -> int:
+    # One round of the puzzle's loop: bst A, bxl, cdv B, bxl, bxc, out B
+    b = register_a % 8 ^ first_xor
+    return (b ^ second_xor ^ register_a >> b) % 8
+
+
+def prints_itself(program: list[int], first_xor: int, second_xor: int) -> bool:
+    # Three more bits of A for every digit, from the last one printed, like the
+    # solver searches for them. A digit depends on the lowest ten bits of A, so
+    # the bits found so far only matter by their lowest seven
+    candidates = {0}
+    for digit in reversed(program):
+        candidates = {
+            a & 127
+            for candidate in candidates
+            for a in range(candidate * 8, candidate * 8 + 8)
+            if a and printed_digit(a, first_xor, second_xor) == digit
+        }
+    return bool(candidates)
+
+
+@generator(2024, 17)
+def chronospatial_computer(scale: float, rng: random.Random) -> str:
+    # Part two only works for programs shaped like the puzzle's: print a function
+    # of the lowest bits of A, shift A by three, repeat until A is zero. Pairs of
+    # equal xors cancel out but lengthen the program, and part two looks for one
+    # more digit of A per instruction. Constants are drawn until the program can
+    # print itself
+    while True:
+        first_xor, second_xor = rng.randrange(8), rng.randrange(8)
+        padding = []
+        for _ in range(round(4 * scale)):
+            xor = rng.randrange(8)
+            padding += [1, xor, 1, xor]
+        program = [2, 4, 1, first_xor, 7, 5, 1, second_xor, *padding]
+        program += [0, 3, 4, rng.randrange(8), 5, 5, 3, 0]
+        if prints_itself(program, first_xor, second_xor):
+            break
+
+    register_a = rng.getrandbits(count(48, scale))
+    return (
+        f"Register A: {register_a}\nRegister B: 0\nRegister C: 0\n\n"
+        f"Program: {','.join(map(str, program))}\n"
+    )
+
+
+MEMORY_SIZE = 71
+# Bytes part one lets fall, the solver's STREAM_SIZE
+FIRST_BYTES = 1024
+
+
+def reaches_exit(corrupted: set[tuple[int, int]]) -> bool:
+    seen = {(0, 0)}
+    queue = [(0, 0)]
+    for x, y in queue:
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (
+                0 <= nx < MEMORY_SIZE
+                and 0 <= ny < MEMORY_SIZE
+                and (nx, ny) not in seen
+                and (nx, ny) not in corrupted
+            ):
+                seen.add((nx, ny))
+                queue.append((nx, ny))
+    return (MEMORY_SIZE - 1, MEMORY_SIZE - 1) in seen
+
+
+@generator(2024, 18)
+def falling_bytes(scale: float, rng: random.Random) -> str:
+    # The memory space is fixed by the solver at 71x71. The first 1024 bytes
+    # must leave a way out for part one, and some later byte must cut it for
+    # part two: the later bytes include a whole column, which always does
+    wall = rng.randrange(1, MEMORY_SIZE - 1)
+    cells = [
+        (x, y)
+        for x in range(MEMORY_SIZE)
+        for y in range(MEMORY_SIZE)
+        if x != wall and (x, y) not in [(0, 0), (MEMORY_SIZE - 1, MEMORY_SIZE - 1)]
+    ]
+    while True:
+        rng.shuffle(cells)
+        if reaches_exit(set(cells[:FIRST_BYTES])):
+            break
+
+    later = cells[FIRST_BYTES:][: max(0, count(2426, scale) - MEMORY_SIZE)]
+    later += [(wall, y) for y in range(MEMORY_SIZE)]
+    rng.shuffle(later)
+    return "\n".join(f"{x},{y}" for x, y in cells[:FIRST_BYTES] + later) + "\n"
+
+
+def towel_patterns(towels: list[str], n_patterns: int, rng: random.Random) -> str:
+    patterns = []
+    for _ in range(n_patterns):
+        if rng.random() < 0.7:
+            pattern = ""
+            while len(pattern) < 40:
+                pattern += rng.choice(towels)
+        else:
+            pattern = "".join(rng.choices("wubrg", k=rng.randint(40, 60)))
+        patterns.append(pattern)
+
+    return ", ".join(towels) + "\n\n" + "\n".join(patterns) + "\n"
+
+
+@generator(2024, 19)
+def linen_layout(scale: float, rng: random.Random) -> str:
+    towels = set()
+    while len(towels) < 450:
+        towels.add("".join(rng.choices("wubrg", k=rng.randint(1, 8))))
+
+    return towel_patterns(sorted(towels), count(400, scale), rng)
+
+
+@preset(2024, 19, "ambiguous")
+def linen_ambiguous(scale: float, rng: random.Random) -> str:
+    # Every combination of up to three stripes is a towel, so each pattern can
+    # be split in a huge number of ways
+    towels = [
+        "".join(stripes)
+        for length in range(1, 4)
+        for stripes in itertools.product("wubrg", repeat=length)
+    ]
+    return towel_patterns(towels, count(400, scale), rng)
+
+
+@generator(2024, 20)
+def race_track(scale: float, rng: random.Random) -> str:
+    # A closed loop with one cell walled off is a single track with no forks
+    size = side(141, scale)
+    loop = tree_loop(size - 2, size - 2, rng)
+    cut = rng.randrange(len(loop))
+    track = loop[cut + 1 :] + loop[:cut]
+
+    grid = [["#"] * size for _ in range(size)]
+    for x, y in track:
+        grid[y][x] = "."
+    grid[track[0][1]][track[0][0]] = "S"
+    grid[track[-1][1]][track[-1][0]] = "E"
+
+    return render(grid)
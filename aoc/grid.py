@@ -0,0 +1,126 @@
+# Character grids stored as a single flat bytearray, one row after the other.
+#
+# Every row is surrounded by `padding` cells of `border`, so any step off the
+# map lands on a border cell instead of wrapping around or raising IndexError.
+# With a border the puzzle never uses, loops compare bytes and never check
+# bounds. Cells are addressed by their index in the bytearray, and neighbours
+# are that index plus one of the precomputed offsets:
+#
+#   maze = Grid.from_lines(read_lines(source), border="#")
+#   for step in maze.neighbors:
+#       if maze.cells[index + step] == WALL:
+#           ...
+#
+# A cell takes one byte, where a list of strings pays for a whole object
+
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+if TYPE_CHECKING:
+    import numpy
+
+
+class Grid:
+    __slots__ = (
+        "width",
+        "height",
+        "padding",
+        "stride",
+        "cells",
+        "neighbors",
+        "diagonals",
+    )
+
+    def __init__(self, width: int, height: int, cells: bytearray, padding: int = 1):
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self.stride = width + 2 * padding
+        self.cells = cells
+
+        # Clockwise, starting from up
+        self.neighbors = (-self.stride, 1, self.stride, -1)
+        self.diagonals = (
+            -self.stride + 1,
+            self.stride + 1,
+            self.stride - 1,
+            -self.stride - 1,
+        )
+
+    @classmethod
+    def from_lines(
+        cls, lines: Iterable[str], padding: int = 1, border: str = " "
+    ) -> "Grid":
+        rows = [line.encode() for line in lines]
+        width = len(rows[0]) if rows else 0
+        for row in rows:
+            if len(row) != width:
+                raise ValueError(f"Row of {len(row)} cells in a grid {width} wide")
+
+        fill = border.encode()
+        side = fill * padding
+        blank = fill * (width + 2 * padding) * padding
+        cells = bytearray(blank + b"".join(side + row + side for row in rows) + blank)
+        return cls(width, len(rows), cells, padding)
+
+    def index(self, x: int, y: int) -> int:
+        return (y + self.padding) * self.stride + x + self.padding
+
+    def position(self, index: int) -> tuple[int, int]:
+        y, x = divmod(index, self.stride)
+        return x - self.padding, y - self.padding
+
+    def row_starts(self) -> range:
+        first = self.index(0, 0)
+        return range(first, first + self.height * self.stride, self.stride)
+
+    def indices(self) -> Iterator[int]:
+        # Every cell of the map, none of the border
+        for start in self.row_starts():
+            yield from range(start, start + self.width)
+
+    def find(self, char: str) -> int:
+        for start in self.row_starts():
+            index = self.cells.find(ord(char), start, start + self.width)
+            if index != -1:
+                return index
+        raise ValueError(f"{char!r} is not in the grid")
+
+    def find_all(self, char: str) -> list[int]:
+        target = ord(char)
+        found = []
+        for start in self.row_starts():
+            end = start + self.width
+            index = self.cells.find(target, start, end)
+            while index != -1:
+                found.append(index)
+                index = self.cells.find(target, index + 1, end)
+        return found
+
+    def lines(self) -> list[str]:
+        return [
+            self.cells[start : start + self.width].decode()
+            for start in self.row_starts()
+        ]
+
+    def __str__(self) -> str:
+        return "\n".join(self.lines())
+
+    def copy(self) -> "Grid":
+        # Writable, even when cells are a view, like those of aoc.shared
+        return Grid(self.width, self.height, bytearray(self.cells), self.padding)
+
+    def array(self, padded: bool = False) -> "numpy.ndarray":
+        # numpy is optional and only needed here. The array shares the grid's
+        # memory, writing to one changes the other
+        import numpy
+
+        rows = self.height + 2 * self.padding
+        array = numpy.frombuffer(self.cells, dtype=numpy.uint8).reshape(
+            rows, self.stride
+        )
+        if padded:
+            return array
+        return array[
+            self.padding : self.padding + self.height,
+            self.padding : self.padding + self.width,
+        ]
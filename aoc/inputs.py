@@ -0,0 +1,119 @@
+# Memory-mapped puzzle inputs
+#
+# Reading a whole input with `file.read().strip().split("\n")` holds three
+# copies of it at once: the text, the stripped text and the lines. Here the
+# file is mapped instead, and lines or blank-line separated blocks are decoded
+# one at a time, straight from the mapping.
+#
+# Inputs that are already in memory, bytes or an open file such as stdin, go
+# through the same code: bytes support every operation used on the mapping
+
+import mmap
+from pathlib import Path
+from typing import IO, Iterator
+
+WHITESPACE = b" \t\r\n"
+
+# A path to an input file, or the input itself
+Source = Path | str | bytes | bytearray | memoryview | IO[bytes] | IO[str]
+
+
+class Input:
+    def __init__(self, source: Source):
+        self.file: IO[bytes] | None = None
+        self.map: mmap.mmap | bytes | None
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.map = bytes(source)
+        elif hasattr(source, "read"):
+            data = source.read()
+            self.map = data.encode() if isinstance(data, str) else data
+        else:
+            self.file = open(source, "rb")
+            try:
+                self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped
+                self.map = None
+
+        # Leading and trailing whitespace is never part of the puzzle
+        data = self.map if self.map is not None else b""
+        self.start = 0
+        self.end = len(data)
+        while self.start < self.end and data[self.start] in WHITESPACE:
+            self.start += 1
+        while self.end > self.start and data[self.end - 1] in WHITESPACE:
+            self.end -= 1
+
+    @property
+    def view(self) -> memoryview:
+        # Zero-copy, but it must be released before the input is closed
+        if self.map is None:
+            return memoryview(b"")
+        return memoryview(self.map)[self.start : self.end]
+
+    def text(self) -> str:
+        if self.map is None:
+            return ""
+        return self.map[self.start : self.end].decode()
+
+    def split(self, separator: bytes) -> Iterator[str]:
+        if self.map is None or self.start == self.end:
+            return
+
+        position = self.start
+        while True:
+            found = self.map.find(separator, position, self.end)
+            if found == -1:
+                yield self.map[position : self.end].decode()
+                return
+            yield self.map[position:found].decode()
+            position = found + len(separator)
+
+    def lines(self) -> Iterator[str]:
+        for line in self.split(b"\n"):
+            yield line.removesuffix("\r")
+
+    def blocks(self) -> Iterator[str]:
+        # Blocks are separated by one or more blank lines
+        if self.map is None or self.start == self.end:
+            return
+
+        position = self.start
+        while position < self.end:
+            found = self.map.find(b"\n\n", position, self.end)
+            if found == -1:
+                yield self.map[position : self.end].decode().replace("\r", "")
+                return
+            yield self.map[position:found].decode().replace("\r", "")
+
+            position = found + 2
+            while position < self.end and self.map[position] in b"\r\n":
+                position += 1
+
+    def close(self) -> None:
+        if isinstance(self.map, mmap.mmap):
+            self.map.close()
+        if self.file is not None:
+            self.file.close()
+
+    def __enter__(self) -> "Input":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_text(source: Source) -> str:
+    with Input(source) as puzzle_input:
+        return puzzle_input.text()
+
+
+def read_lines(source: Source) -> Iterator[str]:
+    with Input(source) as puzzle_input:
+        yield from puzzle_input.lines()
+
+
+def read_blocks(source: Source) -> Iterator[str]:
+    with Input(source) as puzzle_input:
+        yield from puzzle_input.blocks()
@@ -0,0 +1,160 @@
+# Solves a part made of independent records over a process pool.
+#
+#   return mapreduce.map_reduce(predict_next, sequences, cost=len)
+#
+# The records are cut into chunks of about the same estimated cost, a few per
+# worker so a slow chunk does not leave the others idle, and the costliest
+# chunks start first. Every chunk is reduced where it was solved, only one
+# partial result per chunk comes back. The work has to be picklable: a module
+# level function, or a functools.partial of one, never a lambda.
+#
+# With one worker, the default, records are solved in the calling process with
+# no pool at all. Set AOC_WORKERS to a number of workers, 0 for one per core,
+# when running a day on its own, or pass --workers to the runner. Every pooled
+# run is summarized with its speedup over solving the chunks one after the
+# other. Metrics and memo caches of the workers stay in the workers
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Sequence, TypeVar
+
+from aoc.probes import Probe
+
+if TYPE_CHECKING:
+    from aoc.days import Day
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+CHUNKS_PER_WORKER = 4
+
+
+def workers_from_environment() -> int:
+    workers = int(os.environ.get("AOC_WORKERS", "1"))
+    return workers or os.cpu_count() or 1
+
+
+WORKERS = workers_from_environment()
+# Summaries of the pooled runs of the current phase, None to print them instead
+REPORTS: list[dict[str, Any]] | None = None
+
+
+def split(
+    records: Sequence[T], costs: list[float], n_chunks: int
+) -> list[tuple[list[T], float]]:
+    # In order, closing a chunk as soon as it reaches its share of the cost
+    target = sum(costs) / n_chunks
+    chunks = []
+    chunk: list[T] = []
+    load = 0.0
+    for record, cost in zip(records, costs):
+        chunk.append(record)
+        load += cost
+        if load >= target:
+            chunks.append((chunk, load))
+            chunk = []
+            load = 0.0
+    if chunk:
+        chunks.append((chunk, load))
+    return chunks
+
+
+def solve_chunk(
+    work: Callable[[T], R], combine: Callable[[Iterable[R]], R], chunk: list[T]
+) -> tuple[R, float]:
+    # CPU time: the wall time of a chunk also counts the other workers sharing
+    # its core
+    start = time.process_time()
+    partial = combine(map(work, chunk))
+    return partial, time.process_time() - start
+
+
+def map_reduce(
+    work: Callable[[T], R],
+    records: Sequence[T],
+    combine: Callable[[Iterable[R]], Any] = sum,
+    cost: Callable[[T], float] | None = None,
+    label: str | None = None,
+) -> Any:
+    # Imported when a part runs, not when its day is imported
+    from aoc import progress
+
+    # combine reduces the results of a chunk, then the partials of all chunks
+    workers = min(WORKERS, len(records))
+    if workers <= 1:
+        return combine(map(work, progress.track(records, label=label)))
+
+    # Pulls in multiprocessing, which days solved serially never pay for
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    start = time.perf_counter()
+    if cost is None:
+        costs = [1.0] * len(records)
+    else:
+        costs = [cost(record) for record in records]
+    chunks = split(records, costs, workers * CHUNKS_PER_WORKER)
+
+    order = sorted(range(len(chunks)), key=lambda index: -chunks[index][1])
+    partials: list[Any] = [None] * len(chunks)
+    busy_seconds = 0.0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(solve_chunk, work, combine, chunks[index][0]): index
+            for index in order
+        }
+        for future in progress.track(
+            as_completed(futures), total=len(futures), label=label
+        ):
+            partials[futures[future]], seconds = future.result()
+            busy_seconds += seconds
+    result = combine(partials)
+
+    wall_seconds = time.perf_counter() - start
+    report_run(
+        {
+            "label": label,
+            "records": len(records),
+            "chunks": len(chunks),
+            "workers": workers,
+            "wall_seconds": wall_seconds,
+            "serial_seconds": busy_seconds,
+            "speedup": busy_seconds / wall_seconds,
+        }
+    )
+    return result
+
+
+def report_run(summary: dict[str, Any]) -> None:
+    if REPORTS is not None:
+        REPORTS.append(summary)
+        return
+
+    print(
+        f"{summary['label'] or 'map_reduce'}: {summary['records']} records in "
+        f"{summary['chunks']} chunks on {summary['workers']} workers, "
+        f"{summary['wall_seconds']:.3f}s, {summary['speedup']:.2f}x serial",
+        file=sys.stderr,
+    )
+
+
+class MapReduceRecorder(Probe):
+    # Sets the module's workers in whichever process runs the phase, like
+    # aoc.progress.ProgressRecorder, and keeps the summaries of its pooled runs
+    def __init__(self, workers: int):
+        self.workers = workers or os.cpu_count() or 1
+
+    @contextmanager
+    def phase(self, day: "Day", phase: str) -> Iterator[dict[str, Any]]:
+        global WORKERS, REPORTS
+
+        details: dict[str, Any] = {}
+        previous = WORKERS, REPORTS
+        WORKERS, REPORTS = self.workers, []
+        try:
+            yield details
+        finally:
+            if REPORTS:
+                details["map_reduce"] = REPORTS
+            WORKERS, REPORTS = previous
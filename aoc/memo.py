@@ -0,0 +1,219 @@
+# Memo caches for solvers, bounded and counted, instead of functools.cache.
+#
+#   @memo.cache(maxsize=100_000, pure=True)
+#   def apply_5_steps(stone: str) -> dict[str, int]:
+#       ...
+#
+# A cache drops its least recently used entries beyond maxsize, so a batch of
+# inputs can't grow it forever. It counts hits, misses and evictions, and its
+# cache_info() reads like functools', which metrics.cache_counters watches.
+# Every cache is in CACHES, by the name of its function.
+#
+# Results that depend on more than the arguments, like on the towels of the
+# input being solved, must not outlive that input. Those caches are cleared
+# when a scope() ends, and the runner solves every day inside one:
+#
+#   with memo.scope():
+#       ...
+#
+# Pure caches, whose results only depend on their arguments, survive scopes
+# and can be kept on disk between runs, in aoc/memo. Set AOC_MEMO=disk when
+# running a day on its own, or pass --memo-disk to the runner. A file is keyed
+# by the source of the solver's module, editing the solver starts afresh
+
+import atexit
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import update_wrapper
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator, NamedTuple
+
+from aoc.probes import Probe
+
+if TYPE_CHECKING:
+    from aoc.days import Day
+
+MEMO_PATH = Path(__file__).parent / "memo"
+DEFAULT_MAXSIZE = 1_000_000
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+class Memo:
+    def __init__(self, function: Callable[..., Any], maxsize: int | None, pure: bool):
+        update_wrapper(self, function)
+        self.function = function
+        self.maxsize = maxsize
+        self.pure = pure
+        self.name = f"{function.__module__}.{function.__qualname__}"
+        self.entries: OrderedDict[Any, Any] = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+        # Whether entries were read from disk, and changed since
+        self.loaded = False
+        self.dirty = False
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if PERSIST and self.pure and not self.loaded:
+            self.load()
+
+        key = (args, tuple(kwargs.items())) if kwargs else args
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            value = self.function(*args, **kwargs)
+            self.entries[key] = value
+            self.dirty = True
+            if self.maxsize is not None and len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+            return value
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def __reduce__(self) -> str:
+        # Pickled by name, like the function, never with its entries
+        return self.__qualname__
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.entries))
+
+    def cache_clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+        }
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.evictions = 0
+
+    # hashlib, pickle and tempfile are only needed by the few runs that keep
+    # caches on disk, days don't pay for importing them
+    def path(self) -> Path:
+        import hashlib
+        import sys
+
+        source = Path(sys.modules[self.function.__module__].__file__ or "")
+        digest = hashlib.sha256(source.read_bytes()).hexdigest()[:16]
+        return MEMO_PATH / f"{self.name}-{digest}.pickle"
+
+    def load(self) -> None:
+        import pickle
+
+        self.loaded = True
+        try:
+            with open(self.path(), "rb") as file:
+                entries = pickle.load(file)
+        except Exception:
+            # Missing, truncated, or written by an older layout of the results
+            return
+
+        entries.update(self.entries)
+        self.entries = entries
+        while self.maxsize is not None and len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+
+        import pickle
+        import tempfile
+
+        path = self.path()
+        MEMO_PATH.mkdir(parents=True, exist_ok=True)
+        # Written aside and renamed into place, parallel workers may race on it
+        handle, temporary = tempfile.mkstemp(dir=MEMO_PATH, suffix=".tmp")
+        with os.fdopen(handle, "wb") as file:
+            pickle.dump(self.entries, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+        self.dirty = False
+
+        # Caches of earlier versions of the solver are never read again
+        for stale in MEMO_PATH.glob(f"{self.name}-*.pickle"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+
+
+CACHES: dict[str, Memo] = {}
+PERSIST = os.environ.get("AOC_MEMO", "") == "disk"
+
+
+def cache(
+    maxsize: int | None = DEFAULT_MAXSIZE, pure: bool = False
+) -> Callable[[Callable[..., Any]], Memo]:
+    def decorate(function: Callable[..., Any]) -> Memo:
+        memo = Memo(function, maxsize, pure)
+        CACHES[memo.name] = memo
+        return memo
+
+    return decorate
+
+
+@contextmanager
+def scope() -> Iterator[None]:
+    # Entries made for one input are dropped when it is solved
+    try:
+        yield
+    finally:
+        for memo in CACHES.values():
+            if not memo.pure:
+                memo.cache_clear()
+
+
+def stats() -> dict[str, dict[str, Any]]:
+    return {name: memo.stats() for name, memo in sorted(CACHES.items())}
+
+
+def save() -> None:
+    for memo in CACHES.values():
+        if memo.pure and memo.loaded:
+            memo.save()
+
+
+if PERSIST:
+    atexit.register(save)
+
+
+class MemoRecorder(Probe):
+    # Statistics of the caches a phase used, and with persist, pure caches read
+    # from and written back to disk in whichever process runs the phase
+    def __init__(self, persist: bool = False):
+        self.persist = persist
+
+    @contextmanager
+    def phase(self, day: "Day", phase: str) -> Iterator[dict[str, Any]]:
+        global PERSIST
+
+        details: dict[str, Any] = {}
+        for memo in CACHES.values():
+            memo.reset_stats()
+        previous = PERSIST
+        PERSIST = previous or self.persist
+        try:
+            yield details
+        finally:
+            if self.persist:
+                save()
+            PERSIST = previous
+            used = {
+                name: values
+                for name, values in stats().items()
+                if values["hits"] or values["misses"]
+            }
+            if used:
+                details["memo"] = used
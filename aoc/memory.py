@@ -0,0 +1,88 @@
+# Peak traced memory of every phase and the source lines holding most of it.
+#
+# By the time a part returns, its intermediate structures are gone, so a
+# snapshot taken at the end would show next to nothing. Instead a watcher
+# thread polls the traced total and takes a new snapshot whenever it clearly
+# exceeds the largest one so far, which leaves a snapshot close to the peak.
+# Tracing slows allocations down a lot, so timings taken with it are not
+# comparable with regular runs
+
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+from aoc.days import ROOT, Day
+from aoc.probes import Probe
+
+# A new snapshot is only worth its cost once memory grew by this much
+GROWTH = 1.1
+
+
+def describe_line(statistic: tracemalloc.Statistic) -> str:
+    frame = statistic.traceback[0]
+    path = Path(frame.filename)
+    if path.is_relative_to(ROOT):
+        path = path.relative_to(ROOT)
+    return f"{path}:{frame.lineno}"
+
+
+class MemoryTracer(Probe):
+    def __init__(self, top: int = 10, interval: float = 0.01):
+        self.top = top
+        self.interval = interval
+
+    def top_lines(self, snapshot: tracemalloc.Snapshot) -> list[dict[str, Any]]:
+        snapshot = snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, threading.__file__),
+                tracemalloc.Filter(False, __file__),
+            ]
+        )
+        return [
+            {
+                "line": describe_line(statistic),
+                "bytes": statistic.size,
+                "blocks": statistic.count,
+            }
+            for statistic in snapshot.statistics("lineno")[: self.top]
+        ]
+
+    @contextmanager
+    def phase(self, day: Day, phase: str) -> Iterator[dict[str, Any]]:
+        details: dict[str, Any] = {}
+        stop = threading.Event()
+        largest: list[Any] = [None, 0]
+
+        def snapshot_if_larger() -> None:
+            current, _ = tracemalloc.get_traced_memory()
+            if current > largest[1] * GROWTH:
+                largest[:] = [tracemalloc.take_snapshot(), current]
+
+        def watch() -> None:
+            while not stop.wait(self.interval):
+                snapshot_if_larger()
+
+        tracemalloc.start()
+        thread = threading.Thread(target=watch, name="aoc-memory", daemon=True)
+        thread.start()
+        try:
+            yield details
+        finally:
+            stop.set()
+            thread.join()
+            # Phases faster than the polling interval only get this one
+            snapshot_if_larger()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            # Nothing traced, nothing allocated, never a snapshot
+            snapshot = largest[0]
+            details["memory"] = {
+                "peak_bytes": peak,
+                "retained_bytes": current,
+                "snapshot_bytes": largest[1],
+                "top": [] if snapshot is None else self.top_lines(snapshot),
+            }
@@ -0,0 +1,245 @@
+# Counts of the work solvers do, next to how long it takes.
+#
+# Day modules declare their metrics at import time and update them as they go:
+#
+#   STATES_POPPED = metrics.counter("aoc_states_popped_total", "Queue entries")
+#   ...
+#   STATES_POPPED.inc(popped)
+#
+# Updates are no-ops unless a run asked for metrics, and solvers update once
+# per call with totals they already have, never from inside their hot loops.
+# Values are collected per phase into the JSON report, which is also what the
+# Prometheus text file is built from, so it works the same over a process pool
+
+import math
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator
+
+from aoc.probes import Probe, report_phases
+
+if TYPE_CHECKING:
+    from aoc.days import Day
+
+METRICS_PATH = Path(__file__).parent / "metrics.prom"
+DEFAULT_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000, math.inf)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, registry: "Registry", name: str, help: str):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        if self.registry.enabled:
+            self.value += amount
+
+    def reset(self) -> None:
+        self.value = 0
+
+    def collect(self) -> dict[str, Any] | None:
+        if not self.value:
+            return None
+        return {"type": self.kind, "help": self.help, "value": self.value}
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        registry: "Registry",
+        name: str,
+        help: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        # Everything lands in some bucket, the last one is unbounded
+        self.buckets = buckets if math.isinf(buckets[-1]) else (*buckets, math.inf)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        if not self.registry.enabled:
+            return
+
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def reset(self) -> None:
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+
+    def collect(self) -> dict[str, Any] | None:
+        if not any(self.counts):
+            return None
+
+        # Prometheus buckets are cumulative
+        cumulative = []
+        total = 0
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+
+        return {
+            "type": self.kind,
+            "help": self.help,
+            "buckets": {
+                format_bound(bound): count
+                for bound, count in zip(self.buckets, cumulative)
+            },
+            "sum": self.sum,
+            "count": total,
+        }
+
+
+class CacheCounters:
+    # Hits and misses of a functools.cache memo, over a block of code
+    def __init__(self, registry: "Registry", name: str, help: str):
+        self.registry = registry
+        self.hits = registry.counter(f"{name}_hits_total", f"{help}, hits")
+        self.misses = registry.counter(f"{name}_misses_total", f"{help}, misses")
+
+    @contextmanager
+    def watch(self, function: Any) -> Iterator[None]:
+        if not self.registry.enabled:
+            yield
+            return
+
+        before = function.cache_info()
+        try:
+            yield
+        finally:
+            after = function.cache_info()
+            self.hits.inc(after.hits - before.hits)
+            self.misses.inc(after.misses - before.misses)
+
+
+class Registry:
+    def __init__(self):
+        self.enabled = False
+        self.metrics: dict[str, Counter | Histogram] = {}
+
+    def register(self, metric: Counter | Histogram) -> Any:
+        # Days sharing a metric name share the metric, values are kept per phase
+        existing = self.metrics.setdefault(metric.name, metric)
+        if existing.kind != metric.kind:
+            raise ValueError(f"{metric.name} is already a {existing.kind}")
+        return existing
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self.register(Counter(self, name, help))
+
+    def histogram(
+        self, name: str, help: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(self, name, help, buckets))
+
+    def cache_counters(self, name: str, help: str) -> CacheCounters:
+        return CacheCounters(self, name, help)
+
+    def reset(self) -> None:
+        for metric in self.metrics.values():
+            metric.reset()
+
+    def collect(self) -> dict[str, dict[str, Any]]:
+        collected = {}
+        for name, metric in sorted(self.metrics.items()):
+            values = metric.collect()
+            if values is not None:
+                collected[name] = values
+        return collected
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+histogram = REGISTRY.histogram
+cache_counters = REGISTRY.cache_counters
+
+
+class MetricsCollector(Probe):
+    # Always the module's registry, the one day modules use, even after the
+    # probe was pickled over to a worker process
+    @contextmanager
+    def phase(self, day: "Day", phase: str) -> Iterator[dict[str, Any]]:
+        details: dict[str, Any] = {}
+        REGISTRY.reset()
+        REGISTRY.enabled = True
+        try:
+            yield details
+        finally:
+            REGISTRY.enabled = False
+            details["metrics"] = REGISTRY.collect()
+
+
+def format_bound(bound: float) -> str:
+    return "+Inf" if math.isinf(bound) else f"{bound:g}"
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    return (
+        "{"
+        + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels.items())
+        + "}"
+    )
+
+
+def prometheus_text(reports: list[dict[str, Any]]) -> str:
+    samples: dict[str, list[str]] = {}
+    headers: dict[str, tuple[str, str]] = {
+        "aoc_phase_seconds": ("gauge", "Wall time of the phase"),
+    }
+
+    for report in reports:
+        day = f"{report['year']}/dec{report['day']:02}"
+        for phase, phase_report in report_phases(report):
+            labels = {"day": day, "phase": phase}
+            if "seconds" in phase_report:
+                samples.setdefault("aoc_phase_seconds", []).append(
+                    f"aoc_phase_seconds{format_labels(labels)} "
+                    f"{phase_report['seconds']}"
+                )
+
+            for name, values in phase_report.get("metrics", {}).items():
+                headers.setdefault(name, (values["type"], values["help"]))
+                lines = samples.setdefault(name, [])
+                if values["type"] == "counter":
+                    lines.append(f"{name}{format_labels(labels)} {values['value']}")
+                    continue
+
+                for bound, count in values["buckets"].items():
+                    bucket_labels = format_labels({**labels, "le": bound})
+                    lines.append(f"{name}_bucket{bucket_labels} {count}")
+                lines.append(f"{name}_sum{format_labels(labels)} {values['sum']}")
+                lines.append(f"{name}_count{format_labels(labels)} {values['count']}")
+
+    text = []
+    for name, lines in samples.items():
+        kind, help = headers[name]
+        text.append(f"# HELP {name} {help}")
+        text.append(f"# TYPE {name} {kind}")
+        text += lines
+
+    return "\n".join(text) + "\n"
+
+
+def write_prometheus(reports: list[dict[str, Any]], path: Path = METRICS_PATH):
+    # Renamed into place, a scraper never reads a half-written file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f"{path.name}.tmp")
+    temporary.write_text(prometheus_text(reports))
+    os.replace(temporary, path)
@@ -0,0 +1,160 @@
+# Runs every (day, part) job over a process pool, slowest jobs first
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, NamedTuple, Sequence
+
+from aoc.cache import AnswerCache, ParseCache
+from aoc.days import Day
+from aoc.probes import Probe
+from aoc.runner import run_day
+
+
+TIMINGS_PATH = Path(__file__).parent / "timings.json"
+
+
+class Job(NamedTuple):
+    day: Day
+    part: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.day.name}:{self.part}"
+
+
+class JobResult(NamedTuple):
+    job: Job
+    report: dict[str, Any]
+    pid: int
+    wall_seconds: float
+    cpu_seconds: float
+
+
+def load_timings(path: Path = TIMINGS_PATH) -> dict[str, float]:
+    if not path.exists():
+        return {}
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_timings(timings: dict[str, float], path: Path = TIMINGS_PATH) -> None:
+    with open(path, "w") as file:
+        json.dump(dict(sorted(timings.items())), file, indent=2)
+        file.write("\n")
+
+
+def schedule(jobs: list[Job], timings: dict[str, float]) -> list[Job]:
+    # Longest job first: the pool hands jobs out in submission order, so the
+    # slow ones start straight away instead of being the tail of the run.
+    # Jobs without history are assumed slow, so they are not left for the end
+    return sorted(jobs, key=lambda job: -timings.get(job.key, float("inf")))
+
+
+def run_job(
+    job: Job,
+    input_path: Path | None = None,
+    cache: AnswerCache | None = None,
+    parse_cache: ParseCache | None = None,
+    probes: Sequence[Probe] = (),
+) -> JobResult:
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    report = run_day(job.day, [job.part], input_path, cache, parse_cache, probes)
+    return JobResult(
+        job,
+        report,
+        os.getpid(),
+        time.perf_counter() - start_wall,
+        time.process_time() - start_cpu,
+    )
+
+
+def merge_reports(results: list[JobResult]) -> list[dict[str, Any]]:
+    reports: dict[Day, dict[str, Any]] = {}
+    for result in results:
+        report = reports.setdefault(
+            result.job.day, {"year": result.job.day.year, "day": result.job.day.day}
+        )
+        if "error" in result.report:
+            report["error"] = result.report["error"]
+            continue
+
+        # Every job parses on its own, the fastest parse is the most representative
+        parse = result.report["parse"]
+        if "parse" not in report or parse["seconds"] < report["parse"]["seconds"]:
+            report["parse"] = parse
+        report.setdefault("parts", {}).update(result.report["parts"])
+
+    for report in reports.values():
+        if "parts" in report:
+            report["parts"] = dict(sorted(report["parts"].items()))
+
+    return [reports[day] for day in sorted(reports)]
+
+
+def summarize(
+    results: list[JobResult], wall_seconds: float, workers: int
+) -> dict[str, Any]:
+    per_worker: dict[int, dict[str, float]] = {}
+    for result in results:
+        worker = per_worker.setdefault(
+            result.pid, {"jobs": 0, "busy_seconds": 0.0, "cpu_seconds": 0.0}
+        )
+        worker["jobs"] += 1
+        worker["busy_seconds"] += result.wall_seconds
+        worker["cpu_seconds"] += result.cpu_seconds
+
+    for worker in per_worker.values():
+        worker["utilization"] = worker["cpu_seconds"] / wall_seconds
+
+    serial_seconds = sum(result.wall_seconds for result in results)
+    return {
+        "workers": workers,
+        "wall_seconds": wall_seconds,
+        "serial_seconds": serial_seconds,
+        "speedup": serial_seconds / wall_seconds,
+        "utilization": sum(worker["cpu_seconds"] for worker in per_worker.values())
+        / (wall_seconds * workers),
+        "per_worker": {str(pid): worker for pid, worker in per_worker.items()},
+    }
+
+
+def run_parallel(
+    days: list[Day],
+    parts: list[str],
+    workers: int,
+    timings: dict[str, float],
+    input_path: Path | None = None,
+    cache: AnswerCache | None = None,
+    parse_cache: ParseCache | None = None,
+    probes: Sequence[Probe] = (),
+) -> tuple[list[dict[str, Any]], dict[str, Any], dict[str, float]]:
+    jobs = schedule([Job(day, part) for day in days for part in parts], timings)
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(run_job, job, input_path, cache, parse_cache, probes)
+            for job in jobs
+        ]
+        for future in as_completed(futures):
+            results.append(future.result())
+    wall_seconds = time.perf_counter() - start
+
+    measured = {
+        result.job.key: result.wall_seconds
+        for result in results
+        if "error" not in result.report
+        and "seconds" in result.report["parts"].get(result.job.part, {})
+        and "cached" not in result.report["parts"][result.job.part]
+    }
+
+    return (
+        merge_reports(results),
+        summarize(results, wall_seconds, workers),
+        measured,
+    )
@@ -0,0 +1,25 @@
+# Hooks the runner wraps around every phase it times, parse or part.
+#
+# Day modules reach this through aoc.metrics and aoc.tracing, so it stays free
+# of heavy imports: whatever it pulls in is paid by every solution at startup
+
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    from aoc.days import Day
+
+
+class Probe:
+    # Whatever the probe puts in the yielded dict once the phase is over ends up
+    # in that phase's report. Seconds it spent on its own work inside the phase,
+    # under "untimed_seconds", are taken off the phase's time instead
+    @contextmanager
+    def phase(self, day: "Day", phase: str) -> Iterator[dict[str, Any]]:
+        yield {}
+
+
+def report_phases(report: dict[str, Any]) -> Iterator[tuple[str, dict[str, Any]]]:
+    if "parse" in report:
+        yield "parse", report["parse"]
+    yield from report.get("parts", {}).items()
@@ -0,0 +1,74 @@
+# Deterministic profiles of every phase, saved as .pstats files for snakeviz,
+# gprof2dot or `python -m pstats`, with the heaviest functions summarised
+
+import cProfile
+import pstats
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+from aoc.days import Day
+from aoc.probes import Probe
+
+PROFILES_PATH = Path(__file__).parent / "profiles"
+
+
+def describe_function(function: tuple[str, int, str]) -> str:
+    filename, line, name = function
+    if filename == "~":
+        # Built-ins have no source, pstats names them "<built-in method ...>"
+        return name
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+def top_functions(stats: pstats.Stats, count: int) -> list[dict[str, Any]]:
+    # Calls are (primitive calls, total calls, own time, cumulative time, callers)
+    rows = sorted(
+        stats.stats.items(),  # type: ignore[attr-defined]
+        key=lambda item: item[1][3],
+        reverse=True,
+    )
+    return [
+        {
+            "function": describe_function(function),
+            "calls": calls,
+            "own_seconds": own_seconds,
+            "cumulative_seconds": cumulative_seconds,
+        }
+        for function, (_, calls, own_seconds, cumulative_seconds, _) in rows[:count]
+    ]
+
+
+class Profiler(Probe):
+    def __init__(self, directory: Path = PROFILES_PATH, top: int = 15):
+        self.directory = directory
+        self.top = top
+
+    def profile_path(self, day: Day, phase: str) -> Path:
+        return self.directory / f"{day.year}-dec{day.day:02}-{phase}.pstats"
+
+    @contextmanager
+    def phase(self, day: Day, phase: str) -> Iterator[dict[str, Any]]:
+        details: dict[str, Any] = {}
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield details
+        finally:
+            profile.disable()
+
+            path = self.profile_path(day, phase)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(path)
+
+            stats = pstats.Stats(profile, stream=sys.stderr)
+            print(f"{day.name} {phase}, saved to {path}", file=sys.stderr)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+            # Where the time of the heaviest few goes, one level down the tree
+            stats.print_callees(min(self.top, 5))
+
+            details["profile"] = {
+                "path": str(path),
+                "top": top_functions(stats, self.top),
+            }
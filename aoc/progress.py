@@ -0,0 +1,118 @@
+# Progress of long loops, shown only when someone asked to see it.
+#
+#   for obstacle in progress.track(visited, label="obstacles"):
+#       ...
+#
+# With no reporter installed, track() hands the iterable straight back, so a
+# loop pays one function call and nothing per item. Reporters are pluggable:
+# tqdm bars, imported only once a bar is drawn, and events collected into the
+# runner's JSON report. Set AOC_PROGRESS=tqdm to get bars when running a day on
+# its own, or pass --progress to the runner to record events
+
+import os
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, TypeVar
+
+from aoc.probes import Probe
+
+if TYPE_CHECKING:
+    from aoc.days import Day
+
+T = TypeVar("T")
+
+
+class Reporter:
+    def track(
+        self, iterable: Iterable[T], total: int | None, label: str | None
+    ) -> Iterator[T]:
+        yield from iterable
+
+
+class TqdmReporter(Reporter):
+    def track(
+        self, iterable: Iterable[T], total: int | None, label: str | None
+    ) -> Iterator[T]:
+        # tqdm is optional and slow to import, it is only needed to draw a bar
+        from tqdm import tqdm
+
+        yield from tqdm(iterable, total=total, desc=label)
+
+
+class EventReporter(Reporter):
+    def __init__(self, interval: float = 0.5):
+        # At most one event per loop every interval seconds, plus the final one
+        self.interval = interval
+        self.events: list[dict[str, Any]] = []
+        self.start = time.perf_counter()
+
+    def record(self, label: str | None, done: int, total: int | None) -> float:
+        now = time.perf_counter()
+        self.events.append(
+            {
+                "label": label,
+                "done": done,
+                "total": total,
+                "seconds": now - self.start,
+            }
+        )
+        return now
+
+    def track(
+        self, iterable: Iterable[T], total: int | None, label: str | None
+    ) -> Iterator[T]:
+        done = recorded = 0
+        last = self.record(label, done, total)
+        for item in iterable:
+            yield item
+            done += 1
+            if time.perf_counter() - last >= self.interval:
+                last = self.record(label, done, total)
+                recorded = done
+        if recorded != done:
+            self.record(label, done, total)
+
+
+def reporter_from_environment() -> Reporter | None:
+    match os.environ.get("AOC_PROGRESS", ""):
+        case "tqdm":
+            return TqdmReporter()
+        case "":
+            return None
+        case other:
+            raise ValueError(f"Unknown AOC_PROGRESS reporter {other!r}")
+
+
+REPORTER = reporter_from_environment()
+
+
+def track(
+    iterable: Iterable[T], total: int | None = None, label: str | None = None
+) -> Iterable[T]:
+    if REPORTER is None:
+        return iterable
+
+    if total is None and hasattr(iterable, "__len__"):
+        total = len(iterable)  # type: ignore[arg-type]
+    return REPORTER.track(iterable, total, label)
+
+
+class ProgressRecorder(Probe):
+    # Installs its reporter in the module, where day modules look it up, even
+    # after the probe was pickled over to a worker process
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+
+    @contextmanager
+    def phase(self, day: "Day", phase: str) -> Iterator[dict[str, Any]]:
+        global REPORTER
+
+        details: dict[str, Any] = {}
+        previous = REPORTER
+        reporter = EventReporter(self.interval)
+        REPORTER = reporter
+        try:
+            yield details
+        finally:
+            REPORTER = previous
+            details["progress"] = reporter.events
@@ -0,0 +1,94 @@
+# Pictures of a day's state, drawn only when someone asked to see them.
+#
+#   render.frame("best seats", draw_seats, map, seats)
+#
+# Rendering is off by default: frame() returns before calling draw, so a part
+# pays one function call and never builds the picture. Turned on, draw returns
+# the picture as a string or as lines, and frames pile up in a buffer written
+# out in a single write by flush(), to stderr, away from the answers. The
+# runner flushes after every phase, a day run on its own when it exits.
+#
+# Set AOC_RENDER=1 to see frames when running a day on its own, or pass --render
+# to the runner, whose reports then count the frames and the time spent drawing
+# them, taken off the time of the phase that drew them. Benchmarks and scaling
+# measurements pause rendering, a picture never ends up in their timings.
+# Frames drawn by map_reduce workers stay in the workers
+
+import atexit
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, TextIO
+
+from aoc.probes import Probe
+
+if TYPE_CHECKING:
+    from aoc.days import Day
+
+ENABLED = os.environ.get("AOC_RENDER", "") not in ("", "0")
+FRAMES: list[str] = []
+# Frames drawn and seconds spent drawing them since the last reset
+DRAWN = 0
+DRAW_SECONDS = 0.0
+
+
+def frame(title: str, draw: Callable[..., str | Iterable[str]], *args: Any) -> None:
+    global DRAWN, DRAW_SECONDS
+
+    if not ENABLED:
+        return
+
+    start = time.perf_counter()
+    picture = draw(*args)
+    if not isinstance(picture, str):
+        picture = "\n".join(picture)
+    FRAMES.append(f"-- {title}\n{picture}\n")
+    DRAWN += 1
+    DRAW_SECONDS += time.perf_counter() - start
+
+
+def flush(stream: TextIO | None = None) -> None:
+    if not FRAMES:
+        return
+
+    stream = stream or sys.stderr
+    stream.write("".join(FRAMES))
+    stream.flush()
+    FRAMES.clear()
+
+
+@contextmanager
+def paused() -> Iterator[None]:
+    global ENABLED
+
+    previous = ENABLED
+    ENABLED = False
+    try:
+        yield
+    finally:
+        ENABLED = previous
+
+
+if ENABLED:
+    atexit.register(flush)
+
+
+class RenderRecorder(Probe):
+    # Turns rendering on in whichever process runs the phase, like
+    # aoc.progress.ProgressRecorder, and flushes its frames once it is timed
+    @contextmanager
+    def phase(self, day: "Day", phase: str) -> Iterator[dict[str, Any]]:
+        global ENABLED, DRAWN, DRAW_SECONDS
+
+        details: dict[str, Any] = {}
+        previous = ENABLED
+        ENABLED, DRAWN, DRAW_SECONDS = True, 0, 0.0
+        try:
+            yield details
+        finally:
+            ENABLED = previous
+            if DRAWN:
+                details["render"] = {"frames": DRAWN, "seconds": DRAW_SECONDS}
+                details["untimed_seconds"] = DRAW_SECONDS
+            flush()
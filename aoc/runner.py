@@ -0,0 +1,158 @@
+# Runs a day as separately timed phases: parse, then each part
+
+import copy
+import sys
+import time
+from contextlib import ExitStack, redirect_stdout
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from aoc import memo
+from aoc.cache import AnswerCache, CachedAnswer, ParseCache, fingerprint
+from aoc.days import Day, Solver, load_solver
+from aoc.probes import Probe
+
+
+def as_args(parsed: Any) -> tuple:
+    # Parse functions returning a tuple feed each element as a separate argument
+    return parsed if isinstance(parsed, tuple) else (parsed,)
+
+
+def timed(function: Callable[..., Any], *args: Any) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def describe_error(error: BaseException) -> str:
+    return f"{type(error).__name__}: {error}"
+
+
+def probed(
+    probes: Sequence[Probe],
+    day: Day,
+    phase: str,
+    function: Callable[..., Any],
+    *args: Any,
+) -> tuple[Any, float, dict[str, Any]]:
+    found = []
+    with ExitStack() as stack:
+        for probe in probes:
+            found.append(stack.enter_context(probe.phase(day, phase)))
+        result, seconds = timed(function, *args)
+
+    details: dict[str, Any] = {}
+    for probe_details in found:
+        seconds -= probe_details.pop("untimed_seconds", 0.0)
+        details.update(probe_details)
+    return result, seconds, details
+
+
+def run_solver(
+    solver: Solver,
+    parts: list[str] | None = None,
+    input_path: Path | None = None,
+    cache: AnswerCache | None = None,
+    parse_cache: ParseCache | None = None,
+    probes: Sequence[Probe] = (),
+) -> dict[str, Any]:
+    report: dict[str, Any] = {"year": solver.day.year, "day": solver.day.day}
+    parse_args = () if input_path is None else (input_path,)
+    selected = [part for part in solver.parts if parts is None or part in parts]
+
+    key = None
+    if cache is not None or parse_cache is not None:
+        try:
+            key = fingerprint(
+                solver, solver.day.key_path if input_path is None else input_path
+            )
+        except OSError as error:
+            report["error"] = describe_error(error)
+            return report
+
+    keys: dict[str, str] = {}
+    cached: dict[str, tuple[CachedAnswer, float]] = {}
+    if cache is not None:
+        start = time.perf_counter()
+        keys = cache.keys(key, selected)
+        for part, part_key in keys.items():
+            hit = cache.get(part_key)
+            if hit is not None:
+                cached[part] = (hit, time.perf_counter() - start)
+
+    # Solutions print their own debug output, which must not end up in the report.
+    # Memo entries made for this input are dropped once its day is done
+    with redirect_stdout(sys.stderr), memo.scope():
+        try:
+            # Nothing to solve, nothing to parse
+            if len(cached) == len(selected):
+                report["parse"] = {"seconds": 0.0, "cached": True}
+            elif parse_cache is not None:
+                hit, seconds = timed(parse_cache.get, key)
+                if hit is not None:
+                    parsed = hit.parsed
+                    report["parse"] = {
+                        "seconds": seconds,
+                        "parsed_seconds": hit.seconds,
+                        "saved_seconds": hit.seconds - seconds,
+                        "cached": True,
+                    }
+                else:
+                    parsed, seconds, details = probed(
+                        probes, solver.day, "parse", solver.parse, *parse_args
+                    )
+                    parse_cache.put(key, parsed, seconds)
+                    report["parse"] = {"seconds": seconds, **details}
+            else:
+                parsed, seconds, details = probed(
+                    probes, solver.day, "parse", solver.parse, *parse_args
+                )
+                report["parse"] = {"seconds": seconds, **details}
+        except Exception as error:
+            # Like a day that fails to load, no part can run without its input
+            report["error"] = describe_error(error)
+            return report
+
+        report["parts"] = {}
+        for part in selected:
+            if part in cached:
+                hit, seconds = cached[part]
+                report["parts"][part] = {
+                    "answer": hit.answer,
+                    "seconds": seconds,
+                    "solved_seconds": hit.seconds,
+                    "cached": True,
+                }
+                continue
+
+            # Several parts mutate their input, so each one gets its own copy
+            args = as_args(copy.deepcopy(parsed))
+            try:
+                answer, seconds, details = probed(
+                    probes, solver.day, part, solver.parts[part], *args
+                )
+            except Exception as error:
+                report["parts"][part] = {"error": describe_error(error)}
+                continue
+
+            report["parts"][part] = {"answer": answer, "seconds": seconds, **details}
+            if cache is not None:
+                cache.put(keys[part], answer, seconds)
+
+    return report
+
+
+def run_day(
+    day: Day,
+    parts: list[str] | None = None,
+    input_path: Path | None = None,
+    cache: AnswerCache | None = None,
+    parse_cache: ParseCache | None = None,
+    probes: Sequence[Probe] = (),
+) -> dict[str, Any]:
+    try:
+        solver = load_solver(day)
+    except Exception as error:
+        return {"year": day.year, "day": day.day, "error": describe_error(error)}
+
+    return run_solver(solver, parts, input_path, cache, parse_cache, probes)
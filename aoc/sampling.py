@@ -0,0 +1,106 @@
+# Statistical profiles: a background thread looks at the solving thread's
+# stack a fixed number of times per second. Unlike cProfile nothing hooks into
+# the calls themselves, so tight loops keep running at full speed and the
+# timings stay honest. Stacks are written collapsed, one "a;b;c count" line per
+# distinct stack, the format flamegraph.pl, inferno and speedscope all read
+
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, Iterator
+
+from aoc.days import ROOT, Day
+from aoc.probes import Probe
+from aoc.runner import timed
+
+SAMPLES_PATH = Path(__file__).parent / "samples"
+DEFAULT_RATE = 100
+
+Stack = tuple[CodeType, ...]
+
+
+def walk_stack(frame: FrameType | None) -> Stack | None:
+    # Innermost first, stopping at the runner so every stack starts at the phase.
+    # Samples taken outside of the phase itself have no runner frame at all
+    codes = []
+    while frame is not None:
+        if frame.f_code is timed.__code__:
+            return tuple(codes)
+        codes.append(frame.f_code)
+        frame = frame.f_back
+    return None
+
+
+def describe_code(code: CodeType) -> str:
+    path = Path(code.co_filename)
+    if path.is_relative_to(ROOT):
+        path = path.relative_to(ROOT)
+    # Semicolons separate the frames of a collapsed stack
+    return f"{code.co_name} ({path}:{code.co_firstlineno})".replace(";", ":")
+
+
+def collapse(stack: Stack) -> str:
+    return ";".join(describe_code(code) for code in reversed(stack))
+
+
+class Sampler(Probe):
+    def __init__(self, directory: Path = SAMPLES_PATH, rate: float = DEFAULT_RATE):
+        self.directory = directory
+        self.rate = rate
+
+    def samples_path(self, day: Day, phase: str) -> Path:
+        return self.directory / f"{day.year}-dec{day.day:02}-{phase}.collapsed"
+
+    @contextmanager
+    def phase(self, day: Day, phase: str) -> Iterator[dict[str, Any]]:
+        details: dict[str, Any] = {}
+        target = threading.get_ident()
+        interval = 1 / self.rate
+        stacks: Counter[Stack] = Counter()
+        stop = threading.Event()
+        # CPU time spent by the sampler itself, the profiler's overhead
+        sampler_seconds = [0.0]
+
+        def sample() -> None:
+            start = time.thread_time()
+            while not stop.wait(interval):
+                stack = walk_stack(sys._current_frames().get(target))
+                if stack:
+                    stacks[stack] += 1
+            sampler_seconds[0] = time.thread_time() - start
+
+        thread = threading.Thread(target=sample, name="aoc-sampler", daemon=True)
+        start = time.perf_counter()
+        thread.start()
+        try:
+            yield details
+        finally:
+            stop.set()
+            thread.join()
+            wall_seconds = time.perf_counter() - start
+
+            path = self.samples_path(day, phase)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w") as file:
+                for stack, count in stacks.most_common():
+                    file.write(f"{collapse(stack)} {count}\n")
+
+            own: Counter[CodeType] = Counter()
+            for stack, count in stacks.items():
+                own[stack[0]] += count
+
+            total = sum(stacks.values())
+            details["samples"] = {
+                "path": str(path),
+                "rate": self.rate,
+                "count": total,
+                "overhead": sampler_seconds[0] / wall_seconds if wall_seconds else 0,
+                "top": [
+                    {"function": describe_code(code), "samples": count}
+                    for code, count in own.most_common(10)
+                ],
+            }
@@ -0,0 +1,176 @@
+# Graph searches over integer node ids.
+#
+# Nodes are ints, like aoc.grid cell indices or `cell * 4 + direction` states.
+# Their edges come from a callback, `neighbors(node)` for breadth-first search
+# and `edges(node)` yielding (node, cost) pairs for Dijkstra and A*.
+#
+#   result = search.bfs([start], neighbors, goal=lambda node: node == end)
+#   result.distances[end], search.path(result, end)
+#
+# Every search keeps all the predecessors a node has on its shortest paths,
+# so counting or collecting every shortest path needs no second search. With a
+# goal, the search stops once the first goal node and all nodes tied with it
+# are settled. Each result counts the work done in its stats
+
+import heapq
+from collections import deque
+from typing import Callable, Iterable, NamedTuple
+
+Neighbors = Callable[[int], Iterable[int]]
+Edges = Callable[[int], Iterable[tuple[int, int]]]
+Goal = Callable[[int], bool]
+
+
+class SearchStats:
+    # Pushed onto the queue, taken off it, and settled with their final distance
+    __slots__ = ("pushed", "popped", "settled")
+
+    def __init__(self, pushed: int = 0, popped: int = 0, settled: int = 0):
+        self.pushed = pushed
+        self.popped = popped
+        self.settled = settled
+
+    def __repr__(self) -> str:
+        return (
+            f"SearchStats(pushed={self.pushed}, popped={self.popped}, "
+            f"settled={self.settled})"
+        )
+
+
+class SearchResult(NamedTuple):
+    distances: dict[int, int]
+    predecessors: dict[int, list[int]]
+    # Settled nodes, by increasing distance
+    order: list[int]
+    # The first goal node settled, None without a goal or when none was reached
+    found: int | None
+    stats: SearchStats
+
+
+def bfs(
+    starts: Iterable[int], neighbors: Neighbors, goal: Goal | None = None
+) -> SearchResult:
+    distances = dict.fromkeys(starts, 0)
+    predecessors: dict[int, list[int]] = {}
+    order = []
+    stats = SearchStats(pushed=len(distances))
+    found = None
+
+    queue = deque(distances)
+    while queue:
+        node = queue.popleft()
+        stats.popped += 1
+        distance = distances[node]
+        if found is not None and distance > distances[found]:
+            break
+
+        order.append(node)
+        if found is None and goal is not None and goal(node):
+            found = node
+
+        for neighbor in neighbors(node):
+            known = distances.get(neighbor)
+            if known is None:
+                distances[neighbor] = distance + 1
+                predecessors[neighbor] = [node]
+                queue.append(neighbor)
+                stats.pushed += 1
+            elif known == distance + 1:
+                predecessors[neighbor].append(node)
+
+    stats.settled = len(order)
+    return SearchResult(distances, predecessors, order, found, stats)
+
+
+def dijkstra(
+    starts: Iterable[int], edges: Edges, goal: Goal | None = None
+) -> SearchResult:
+    return astar(starts, edges, None, goal)
+
+
+def astar(
+    starts: Iterable[int],
+    edges: Edges,
+    heuristic: Callable[[int], int] | None,
+    goal: Goal | None = None,
+) -> SearchResult:
+    # Dijkstra without a heuristic. The heuristic must never overestimate and
+    # be consistent, or nodes would be settled before their shortest path
+    tentative = dict.fromkeys(starts, 0)
+    distances: dict[int, int] = {}
+    predecessors: dict[int, list[int]] = {}
+    order = []
+    stats = SearchStats(pushed=len(tentative))
+    found = None
+
+    if heuristic is None:
+        queue = [(0, 0, node) for node in tentative]
+    else:
+        queue = [(heuristic(node), 0, node) for node in tentative]
+    heapq.heapify(queue)
+
+    while queue:
+        priority, distance, node = heapq.heappop(queue)
+        stats.popped += 1
+        if node in distances:
+            # Already settled by a shorter path pushed later
+            continue
+        if found is not None and priority > distances[found]:
+            break
+
+        distances[node] = distance
+        order.append(node)
+        if found is None and goal is not None and goal(node):
+            found = node
+
+        for neighbor, cost in edges(node):
+            new_distance = distance + cost
+            known = tentative.get(neighbor)
+            if known is None or new_distance < known:
+                tentative[neighbor] = new_distance
+                predecessors[neighbor] = [node]
+                if heuristic is None:
+                    new_priority = new_distance
+                else:
+                    new_priority = new_distance + heuristic(neighbor)
+                heapq.heappush(queue, (new_priority, new_distance, neighbor))
+                stats.pushed += 1
+            elif new_distance == known and neighbor not in distances:
+                predecessors[neighbor].append(node)
+
+    stats.settled = len(order)
+    return SearchResult(distances, predecessors, order, found, stats)
+
+
+def path(result: SearchResult, node: int) -> list[int]:
+    # One shortest path from a start to node, both included
+    nodes = [node]
+    while node in result.predecessors:
+        node = result.predecessors[node][0]
+        nodes.append(node)
+    return nodes[::-1]
+
+
+def backtrack(result: SearchResult, nodes: Iterable[int]) -> set[int]:
+    # Every node on any shortest path to one of nodes
+    seen = set(nodes)
+    stack = list(seen)
+    while stack:
+        for predecessor in result.predecessors.get(stack.pop(), ()):
+            if predecessor not in seen:
+                seen.add(predecessor)
+                stack.append(predecessor)
+    return seen
+
+
+def count_paths(result: SearchResult) -> dict[int, int]:
+    # How many shortest paths lead to every settled node
+    counts: dict[int, int] = {}
+    for node in result.order:
+        predecessors = result.predecessors.get(node)
+        counts[node] = (
+            sum(counts[predecessor] for predecessor in predecessors)
+            if predecessors
+            else 1
+        )
+    return counts
@@ -0,0 +1,154 @@
+# Grids and arrays handed to worker processes through shared memory.
+#
+# Work sent to a pool is pickled once per chunk, grid and all. Sharing the
+# grid first leaves only a small handle to pickle, and every worker attaches
+# to the same memory instead of unpickling a copy of it:
+#
+#   with shared.share_grid(map) as shared_map:
+#       mapreduce.map_reduce(partial(creates_loop, shared_map), obstacles)
+#
+#   def creates_loop(shared_map: SharedGrid, obstacle: int) -> bool:
+#       map = shared_map.attach()
+#
+# Attaching returns a Grid whose cells are a read-only memoryview, indexed like
+# the bytearray it was copied from; writing to it raises TypeError. Work that
+# needs to change cells, search them or print them uses attach_copy(), a copy
+# made once per process, and puts back every cell it changed.
+# A process attaches to a block once and keeps it until the block is released.
+# The memory is freed when the sharing block exits, views still around after
+# that raise ValueError.
+#
+# With a single worker, map_reduce solves every record in this process. Nothing
+# is shared then, the handle carries the grid or array itself, and attaching
+# returns it as it is: it must not be changed either
+
+import atexit
+from array import array
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, NamedTuple
+
+from aoc import mapreduce
+from aoc.grid import Grid
+
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+# Blocks open in this process and their views, by block name. Forked workers
+# inherit the ones their parent shared and use them as they are
+BLOCKS: dict[str, "SharedMemory"] = {}
+VIEWS: dict[str, memoryview] = {}
+# Writable copies of attached grids, by handle
+COPIES: dict["SharedGrid", Grid] = {}
+
+
+def attach_view(name: str, size: int, format: str = "B") -> memoryview:
+    view = VIEWS.get(name)
+    if view is None:
+        block = BLOCKS.get(name)
+        if block is None:
+            from multiprocessing.shared_memory import SharedMemory
+
+            block = BLOCKS[name] = SharedMemory(name=name)
+            # Unmapped before interpreter shutdown collects the block under the
+            # view, which fails
+            atexit.register(release, name)
+        # Blocks are rounded up to whole pages
+        view = VIEWS[name] = block.buf[:size].toreadonly().cast(format)
+    return view
+
+
+def release(name: str) -> None:
+    for handle in [handle for handle in COPIES if handle.name == name]:
+        del COPIES[handle]
+    view = VIEWS.pop(name, None)
+    if view is not None:
+        view.release()
+    block = BLOCKS.pop(name, None)
+    if block is not None:
+        try:
+            block.close()
+        except BufferError:
+            # Slices of the view are still referenced, like from the traceback
+            # of a failed worker, the memory is unmapped once they are gone
+            pass
+
+
+@contextmanager
+def share_buffer(data: bytes | bytearray | memoryview) -> Iterator[str]:
+    # Multiprocessing is imported when a part is solved, not with the day
+    from multiprocessing.shared_memory import SharedMemory
+
+    with memoryview(data) as source:
+        # There are no empty blocks
+        block = SharedMemory(create=True, size=max(source.nbytes, 1))
+        block.buf[: source.nbytes] = source.cast("B")
+    BLOCKS[block.name] = block
+    try:
+        yield block.name
+    finally:
+        release(block.name)
+        block.unlink()
+
+
+class SharedGrid(NamedTuple):
+    name: str
+    width: int
+    height: int
+    padding: int
+    size: int
+    local: Grid | None = None
+
+    def attach(self) -> Grid:
+        if self.local is not None:
+            return self.local
+        view = attach_view(self.name, self.size)
+        return Grid(
+            self.width, self.height, view, self.padding  # type: ignore[arg-type]
+        )
+
+    def attach_copy(self) -> Grid:
+        copy = COPIES.get(self)
+        if copy is None:
+            copy = COPIES[self] = self.attach().copy()
+        return copy
+
+
+class SharedArray(NamedTuple):
+    name: str
+    typecode: str
+    length: int
+    itemsize: int
+    local: array | None = None
+
+    def attach(self) -> memoryview:
+        if self.local is not None:
+            return memoryview(self.local)
+        return attach_view(self.name, self.length * self.itemsize, self.typecode)
+
+
+@contextmanager
+def share_grid(grid: Grid) -> Iterator[SharedGrid]:
+    if mapreduce.WORKERS <= 1:
+        handle = SharedGrid(
+            "", grid.width, grid.height, grid.padding, len(grid.cells), grid
+        )
+        try:
+            yield handle
+        finally:
+            COPIES.pop(handle, None)
+        return
+
+    with share_buffer(grid.cells) as name:
+        yield SharedGrid(name, grid.width, grid.height, grid.padding, len(grid.cells))
+
+
+@contextmanager
+def share_array(values: array) -> Iterator[SharedArray]:
+    # Coordinates and other flat arrays of numbers, read back as a memoryview of
+    # the same typecode
+    if mapreduce.WORKERS <= 1:
+        yield SharedArray("", values.typecode, len(values), values.itemsize, values)
+        return
+
+    with share_buffer(values) as name:
+        yield SharedArray(name, values.typecode, len(values), values.itemsize)
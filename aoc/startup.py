@@ -0,0 +1,84 @@
+# Import time of every day module, from `python -X importtime` in a fresh
+# interpreter, so nothing the runner already loaded hides a slow import
+
+import subprocess
+import sys
+from typing import NamedTuple
+
+from aoc.days import ROOT, Day
+
+# Paid on every run of a day before any work is done. Most of it is the
+# standard library the day uses, pathlib alone is a third. Days that can't do
+# better declare their own budget here, keyed like "2024/dec14"
+DEFAULT_BUDGET = 0.075
+BUDGETS: dict[str, float] = {}
+
+MARKER = "-- aoc startup --"
+
+
+class Import(NamedTuple):
+    module: str
+    own_seconds: float
+    seconds: float
+
+
+class ImportTime(NamedTuple):
+    day: Day
+    seconds: float
+    imports: list[Import]
+
+
+def parse_importtime(output: str) -> list[tuple[int, Import]]:
+    # Lines look like "import time:  self [us] | cumulative | <indent>package",
+    # nested imports are indented by two spaces per level
+    imports = []
+    for line in output.split(MARKER, 1)[-1].splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        if not own.strip().isdigit():
+            # The header line
+            continue
+
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        imports.append(
+            (depth, Import(name.strip(), int(own) / 1e6, int(cumulative) / 1e6))
+        )
+    return imports
+
+
+def measure_imports(day: Day) -> ImportTime:
+    code = (
+        "import importlib, sys; "
+        f"sys.stderr.write({MARKER!r} + '\\n'); "
+        f"importlib.import_module({day.module_name!r})"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise ImportError(result.stderr.strip().splitlines()[-1])
+
+    imports = parse_importtime(result.stderr)
+    return ImportTime(
+        day,
+        # Top level entries include everything imported beneath them
+        sum(module.seconds for depth, module in imports if depth == 0),
+        sorted(
+            (module for _, module in imports),
+            key=lambda module: module.own_seconds,
+            reverse=True,
+        ),
+    )
+
+
+def fastest_imports(day: Day, repeat: int) -> ImportTime:
+    # Startup is noisy, the fastest run is the closest to the real cost
+    return min(
+        (measure_imports(day) for _ in range(repeat)),
+        key=lambda import_time: import_time.seconds,
+    )
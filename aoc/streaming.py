@@ -0,0 +1,125 @@
+# Solving line-oriented days from a stream, stdin or a pipe, in bounded memory.
+#
+#   python -m aoc stream 2023/7 < huge.txt
+#
+# Days that support it define `stream(lines)`, which folds the lines into both
+# answers in a single pass. Lines are parsed a block at a time, by the day's
+# own parse function, so only one block is ever held in memory.
+#
+# Parts whose answer is a sum over lines just add up their answers for every
+# block. Parts that need a global pass sort through an ExternalSorter: items
+# are buffered up to RUN_SIZE, then every full buffer is sorted and spilled to
+# a temporary file in SPILL_DIRECTORY (the system default when None). Iterating
+# the sorter merges the spilled runs back, holding one pickled chunk per run,
+# so memory is bounded by RUN_SIZE plus the number of runs, and the disk needs
+# room for the whole input once. Every iteration starts over from the smallest
+# item, one iteration at a time
+
+import heapq
+import sys
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Callable, Generic, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+BLOCK_LINES = 4096
+RUN_SIZE = 1_000_000
+SPILL_DIRECTORY: Path | None = None
+
+# Items pickled together when spilling, fewer and larger reads while merging
+CHUNK_ITEMS = 4096
+
+
+def read_stream(file: IO[bytes] | None = None) -> Iterator[str]:
+    # One line at a time, blank lines skipped like the surrounding whitespace
+    # of a key.txt
+    if file is None:
+        file = sys.stdin.buffer
+    for raw_line in file:
+        line = raw_line.rstrip(b"\r\n")
+        if line.strip():
+            yield line.decode()
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def parse_blocks(
+    lines: Iterable[str], parse: Callable[[bytes], T], size: int = BLOCK_LINES
+) -> Iterator[T]:
+    for block in batched(lines, size):
+        yield parse("\n".join(block).encode())
+
+
+def sum_parts(
+    blocks: Iterable[Any], parts: dict[str, Callable[[Any], int]]
+) -> dict[str, int]:
+    # Only for parts whose answer for the whole input is the sum of their
+    # answers for any split of it into blocks
+    totals = dict.fromkeys(parts, 0)
+    for block in blocks:
+        for name, part in parts.items():
+            totals[name] += part(block)
+    return totals
+
+
+def read_run(run: IO[bytes]) -> Iterator[Any]:
+    import pickle
+
+    while True:
+        try:
+            chunk = pickle.load(run)
+        except EOFError:
+            return
+        yield from chunk
+
+
+class ExternalSorter(Generic[T]):
+    def __init__(self, run_size: int | None = None, directory: Path | None = None):
+        self.run_size = run_size or RUN_SIZE
+        self.directory = directory or SPILL_DIRECTORY
+        self.buffer: list[T] = []
+        self.runs: list[IO[bytes]] = []
+
+    def add(self, item: T) -> None:
+        self.buffer.append(item)
+        if len(self.buffer) >= self.run_size:
+            self.spill()
+
+    def spill(self) -> None:
+        # Only needed once an input outgrows memory, and slow to import
+        import pickle
+        import tempfile
+
+        self.buffer.sort()
+        run = tempfile.TemporaryFile(dir=self.directory)
+        for chunk in batched(self.buffer, CHUNK_ITEMS):
+            pickle.dump(chunk, run, protocol=pickle.HIGHEST_PROTOCOL)
+        run.seek(0)
+        self.runs.append(run)
+        self.buffer = []
+
+    def __iter__(self) -> Iterator[T]:
+        self.buffer.sort()
+        if not self.runs:
+            return iter(self.buffer)
+        for run in self.runs:
+            run.seek(0)
+        return heapq.merge(self.buffer, *(read_run(run) for run in self.runs))
+
+    def close(self) -> None:
+        # Temporary files are deleted as soon as they are closed
+        for run in self.runs:
+            run.close()
+        self.runs = []
+        self.buffer = []
+
+    def __enter__(self) -> "ExternalSorter[T]":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,109 @@
+# Nested spans in the Chrome trace-event format, for chrome://tracing,
+# Perfetto or speedscope.
+#
+# Every phase is a top level span. Day modules can open child spans around
+# interesting steps, which cost nothing unless the run asked for a trace:
+#
+#   with tracing.span("probe", bytes=center):
+#       ...
+#
+# Like metrics, the events of a phase travel in its JSON report, and the trace
+# file is written from the reports once the run is over
+
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ContextManager, Iterator
+
+from aoc.probes import Probe, report_phases
+
+if TYPE_CHECKING:
+    from aoc.days import Day
+
+TRACE_PATH = Path(__file__).parent / "trace.json"
+
+DISABLED = nullcontext()
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.events: list[dict[str, Any]] = []
+
+    def span(self, name: str, **args: Any) -> ContextManager[None]:
+        if not self.enabled:
+            return DISABLED
+        return self.record(name, "step", args)
+
+    @contextmanager
+    def record(self, name: str, category: str, args: dict[str, Any]) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            # Complete events, timestamps and durations in microseconds
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": start / 1000,
+                    "dur": (end - start) / 1000,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                    "args": args,
+                }
+            )
+
+
+TRACER = Tracer()
+span = TRACER.span
+
+
+class TraceRecorder(Probe):
+    # Always the module's tracer, the one day modules use, even after the probe
+    # was pickled over to a worker process
+    @contextmanager
+    def phase(self, day: "Day", phase: str) -> Iterator[dict[str, Any]]:
+        details: dict[str, Any] = {}
+        TRACER.events = []
+        TRACER.enabled = True
+        try:
+            with TRACER.record(f"{day.name} {phase}", "phase", {}):
+                yield details
+        finally:
+            TRACER.enabled = False
+            details["trace"] = TRACER.events
+
+
+def trace_events(reports: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    events = []
+    for report in reports:
+        for _, phase_report in report_phases(report):
+            events += phase_report.get("trace", [])
+
+    if not events:
+        return []
+
+    # perf_counter is the same clock in every worker, start the trace at zero
+    start = min(event["ts"] for event in events)
+    events = [{**event, "ts": event["ts"] - start} for event in events]
+    events.sort(key=lambda event: (event["ts"], -event["dur"]))
+
+    names = [
+        {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"pid {pid}"}}
+        for pid in sorted({event["pid"] for event in events})
+    ]
+    return names + events
+
+
+def write_trace(reports: list[dict[str, Any]], path: Path = TRACE_PATH) -> None:
+    # Only the runner writes traces, days importing this module never need json
+    import json
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump({"traceEvents": trace_events(reports)}, file)
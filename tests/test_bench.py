@@ -0,0 +1,36 @@
+from aoc.bench import Measurement, Regression, find_regressions
+
+BASELINES = {"2024/dec01:part_one": 1.0, "2024/dec01:part_two": 0.001}
+
+
+def test_slower_than_the_threshold_is_a_regression():
+    measurements = {"2024/dec01:part_one": Measurement(1.5, 1.6, 5)}
+    assert find_regressions(measurements, BASELINES, 0.2, 0.01) == [
+        Regression("2024/dec01:part_one", 1.0, 1.5)
+    ]
+
+
+def test_within_the_threshold_is_not():
+    measurements = {"2024/dec01:part_one": Measurement(1.1, 1.6, 5)}
+    assert find_regressions(measurements, BASELINES, 0.2, 0.01) == []
+
+
+def test_the_best_run_is_compared():
+    # A noisy median alone is no regression
+    measurements = {"2024/dec01:part_one": Measurement(1.0, 3.0, 5)}
+    assert find_regressions(measurements, BASELINES, 0.2, 0.01) == []
+
+
+def test_differences_under_the_noise_floor_are_ignored():
+    measurements = {"2024/dec01:part_two": Measurement(0.005, 0.005, 5)}
+    assert find_regressions(measurements, BASELINES, 0.2, 0.01) == []
+    assert len(find_regressions(measurements, BASELINES, 0.2, 0.001)) == 1
+
+
+def test_phases_without_a_baseline_are_skipped():
+    measurements = {"2024/dec02:part_one": Measurement(9.0, 9.0, 5)}
+    assert find_regressions(measurements, BASELINES, 0.2, 0.01) == []
+
+
+def test_slowdown():
+    assert Regression("key", 2.0, 3.0).slowdown == 0.5
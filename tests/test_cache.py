@@ -0,0 +1,75 @@
+import os
+
+from aoc import cache
+from aoc.days import ROOT, Day, load_solver
+
+
+def test_answer_cache_round_trip(tmp_path):
+    answers = cache.AnswerCache(tmp_path)
+    answers.put("key", 42, 0.5)
+    assert answers.get("key") == cache.CachedAnswer(42, 0.5)
+    assert answers.get("missing") is None
+
+
+def test_answer_cache_skips_answers_json_would_change(tmp_path):
+    answers = cache.AnswerCache(tmp_path)
+    answers.put("bool", True, 0.5)
+    answers.put("tuple", (1, 2), 0.5)
+    assert answers.get("bool") is None
+    assert answers.get("tuple") is None
+
+
+def test_answer_cache_ignores_corrupt_entries(tmp_path):
+    answers = cache.AnswerCache(tmp_path)
+    answers.write("key", b"{not json")
+    assert answers.get("key") is None
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    disk = cache.DiskCache(tmp_path, max_bytes=20)
+    disk.write("old", b"x" * 10)
+    disk.write("used", b"x" * 10)
+    # Older on disk, but read since, so it outlives "old"
+    os.utime(disk.entry_path("old"), (1, 1))
+    os.utime(disk.entry_path("used"), (2, 2))
+    disk.read("used")
+
+    disk.write("new", b"x" * 10)
+    assert disk.read("old") is None
+    assert disk.read("used") == b"x" * 10
+    assert disk.read("new") == b"x" * 10
+
+
+def test_parse_cache_round_trip(tmp_path):
+    parsed = cache.ParseCache(tmp_path)
+    # Slow enough to parse that unpickling is always faster
+    parsed.put("key", {"lists": [[1, 2], [3]]}, seconds=60.0)
+    assert parsed.get("key") == cache.CachedParse({"lists": [[1, 2], [3]]}, 60.0)
+
+
+def test_parse_cache_skips_unpicklable(tmp_path):
+    parsed = cache.ParseCache(tmp_path)
+    parsed.put("key", lambda: None, seconds=60.0)
+    assert parsed.get("key") is None
+
+
+def test_parse_cache_skips_what_parses_faster(tmp_path):
+    parsed = cache.ParseCache(tmp_path)
+    parsed.put("key", [1, 2, 3], seconds=0.0)
+    assert parsed.get("key") is None
+
+
+def test_fingerprint_follows_the_input(tmp_path):
+    solver = load_solver(Day(2024, 1, ROOT / "2024" / "dec01" / "main.py"))
+    first = tmp_path / "first.txt"
+    second = tmp_path / "second.txt"
+    first.write_text("1   2\n")
+    second.write_text("1   3\n")
+
+    assert cache.fingerprint(solver, first) == cache.fingerprint(solver, first)
+    assert cache.fingerprint(solver, first) != cache.fingerprint(solver, second)
+
+
+def test_answer_keys_differ_per_part():
+    keys = cache.AnswerCache().keys("fingerprint", ["part_one", "part_two"])
+    assert keys["part_one"] != keys["part_two"]
@@ -0,0 +1,63 @@
+import pytest
+
+from aoc.grid import Grid
+
+LINES = ["#..", ".S.", "..#"]
+
+
+def test_index_and_position_round_trip():
+    grid = Grid.from_lines(LINES, padding=2)
+    for y in range(grid.height):
+        for x in range(grid.width):
+            assert grid.position(grid.index(x, y)) == (x, y)
+
+
+def test_steps_off_the_map_land_on_the_border():
+    grid = Grid.from_lines(LINES, border="@")
+    corner = grid.index(0, 0)
+    assert grid.cells[corner + grid.neighbors[0]] == ord("@")
+    assert grid.cells[corner + grid.neighbors[3]] == ord("@")
+    assert grid.cells[corner + grid.diagonals[3]] == ord("@")
+    assert grid.cells[corner + grid.neighbors[1]] == ord(".")
+
+
+def test_neighbors_are_clockwise_from_up():
+    grid = Grid.from_lines(LINES)
+    start = grid.find("S")
+    assert [grid.position(start + step) for step in grid.neighbors] == [
+        (1, 0),
+        (2, 1),
+        (1, 2),
+        (0, 1),
+    ]
+
+
+def test_find():
+    grid = Grid.from_lines(LINES)
+    assert grid.position(grid.find("S")) == (1, 1)
+    assert [grid.position(index) for index in grid.find_all("#")] == [(0, 0), (2, 2)]
+    with pytest.raises(ValueError):
+        grid.find("E")
+
+
+def test_find_skips_the_border():
+    grid = Grid.from_lines(LINES, border="#")
+    assert len(grid.find_all("#")) == 2
+
+
+def test_indices_cover_the_map_only():
+    grid = Grid.from_lines(LINES, border="#")
+    assert bytes(grid.cells[index] for index in grid.indices()) == b"#...S...#"
+
+
+def test_lines_and_copy():
+    grid = Grid.from_lines(LINES)
+    copy = grid.copy()
+    copy.cells[copy.find("S")] = ord("O")
+    assert grid.lines() == LINES
+    assert str(copy) == "#..\n.O.\n..#"
+
+
+def test_ragged_rows_are_rejected():
+    with pytest.raises(ValueError):
+        Grid.from_lines(["...", ".."])
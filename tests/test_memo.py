@@ -0,0 +1,80 @@
+import pytest
+
+from aoc import memo
+
+
+@pytest.fixture(autouse=True)
+def caches(monkeypatch):
+    # Caches made here stay out of the ones the days register
+    monkeypatch.setattr(memo, "CACHES", {})
+    monkeypatch.setattr(memo, "PERSIST", False)
+
+
+def test_hits_and_misses():
+    calls = []
+
+    @memo.cache()
+    def square(n):
+        calls.append(n)
+        return n * n
+
+    assert [square(2), square(2), square(3)] == [4, 4, 9]
+    assert calls == [2, 3]
+    assert square.cache_info() == memo.CacheInfo(1, 2, memo.DEFAULT_MAXSIZE, 2)
+
+
+def test_keyword_arguments_are_part_of_the_key():
+    @memo.cache()
+    def power(n, exponent=2):
+        return n**exponent
+
+    assert power(2) == 4
+    assert power(2, exponent=3) == 8
+    assert power.cache_info().misses == 2
+
+
+def test_least_recently_used_is_evicted():
+    @memo.cache(maxsize=2)
+    def identity(n):
+        return n
+
+    identity(1)
+    identity(2)
+    identity(1)
+    identity(3)
+    assert list(identity.entries) == [(1,), (3,)]
+    assert identity.stats()["evictions"] == 1
+
+
+def test_scope_clears_impure_caches_only():
+    @memo.cache()
+    def impure(n):
+        return n
+
+    @memo.cache(pure=True)
+    def pure(n):
+        return n
+
+    with memo.scope():
+        impure(1)
+        pure(1)
+
+    assert impure.cache_info().currsize == 0
+    assert pure.cache_info().currsize == 1
+
+
+def test_pure_caches_persist(tmp_path, monkeypatch):
+    monkeypatch.setattr(memo, "MEMO_PATH", tmp_path)
+    monkeypatch.setattr(memo, "PERSIST", True)
+    calls = []
+
+    def double(n):
+        calls.append(n)
+        return 2 * n
+
+    memo.cache(pure=True)(double)(21)
+    memo.save()
+
+    # A fresh cache for the same function, as in the next run
+    assert memo.cache(pure=True)(double)(21) == 42
+    assert calls == [21]
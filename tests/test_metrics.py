@@ -0,0 +1,89 @@
+import math
+from functools import cache
+
+import pytest
+
+from aoc import metrics
+
+
+@pytest.fixture
+def registry():
+    registry = metrics.Registry()
+    registry.enabled = True
+    return registry
+
+
+def test_updates_are_ignored_while_disabled(registry):
+    counter = registry.counter("aoc_test_total", "Test")
+    histogram = registry.histogram("aoc_test_sizes", "Test")
+    registry.enabled = False
+    counter.inc(5)
+    histogram.observe(5)
+    assert registry.collect() == {}
+
+
+def test_counter(registry):
+    counter = registry.counter("aoc_test_total", "Test")
+    counter.inc()
+    counter.inc(2)
+    assert registry.collect() == {
+        "aoc_test_total": {"type": "counter", "help": "Test", "value": 3}
+    }
+
+    registry.reset()
+    assert registry.collect() == {}
+
+
+def test_same_name_shares_the_metric(registry):
+    assert registry.counter("aoc_test_total", "Test") is registry.counter(
+        "aoc_test_total", "Test"
+    )
+    with pytest.raises(ValueError):
+        registry.histogram("aoc_test_total", "Test")
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = registry.histogram("aoc_test_sizes", "Test", buckets=(1, 10))
+    assert histogram.buckets == (1, 10, math.inf)
+    for value in (0, 1, 5, 10, 11, 1000):
+        histogram.observe(value)
+
+    assert registry.collect()["aoc_test_sizes"] == {
+        "type": "histogram",
+        "help": "Test",
+        "buckets": {"1": 2, "10": 4, "+Inf": 6},
+        "sum": 1027.0,
+        "count": 6,
+    }
+
+
+def test_cache_counters_watch_a_block(registry):
+    calls = registry.cache_counters("aoc_test_memo", "Test")
+    squared = cache(lambda n: n * n)
+    squared(2)
+    with calls.watch(squared):
+        squared(2)
+        squared(3)
+
+    collected = registry.collect()
+    assert collected["aoc_test_memo_hits_total"]["value"] == 1
+    assert collected["aoc_test_memo_misses_total"]["value"] == 1
+
+
+def test_prometheus_text():
+    report = {
+        "year": 2024,
+        "day": 1,
+        "parts": {
+            "part_one": {
+                "seconds": 0.5,
+                "metrics": {
+                    "aoc_test_total": {"type": "counter", "help": "Test", "value": 3}
+                },
+            }
+        },
+    }
+    text = metrics.prometheus_text([report])
+    assert "# TYPE aoc_test_total counter\n" in text
+    assert 'aoc_test_total{day="2024/dec01",phase="part_one"} 3\n' in text
+    assert 'aoc_phase_seconds{day="2024/dec01",phase="part_one"} 0.5\n' in text
@@ -0,0 +1,35 @@
+import io
+import random
+
+from aoc import streaming
+
+
+def test_read_stream_skips_blank_lines():
+    file = io.BytesIO(b"1   2\r\n\n3   4\n  \n")
+    assert list(streaming.read_stream(file)) == ["1   2", "3   4"]
+
+
+def test_parse_blocks():
+    lines = [str(n) for n in range(10)]
+    blocks = streaming.parse_blocks(lines, lambda data: data.split(), size=4)
+    assert [len(block) for block in blocks] == [4, 4, 2]
+
+
+def test_sorter_in_memory(tmp_path):
+    with streaming.ExternalSorter(directory=tmp_path) as sorter:
+        for item in [3, 1, 2]:
+            sorter.add(item)
+        assert list(sorter) == [1, 2, 3]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_sorter_merges_spilled_runs(tmp_path):
+    items = [random.randrange(1000) for _ in range(10_000)]
+    with streaming.ExternalSorter(run_size=999, directory=tmp_path) as sorter:
+        for item in items:
+            sorter.add(item)
+        assert len(sorter.runs) == 10
+        assert list(sorter) == sorted(items)
+        # Iterating again starts over
+        assert list(sorter) == sorted(items)
+    assert sorter.runs == []